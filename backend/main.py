@@ -1,6 +1,7 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import os
 import tempfile
@@ -9,13 +10,18 @@ import csv
 import io
 import json
 import shutil
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uvicorn
 
 from services.ai_service import AIService
 from services.ppt_service import PPTService
-from services.pdf_service import PDFService
+from services.pdf_service import PDFService, PDF_EXPORT_PROFILES
+from services.session_service import SessionService
+from services.upload_store import UploadStore, UploadTooLargeError
+from services.artifact_store import ArtifactStore
+from services.edit_plan import EditPlanError
 
 app = FastAPI(title="AI-Powered PPT Automation System", version="1.0.0")
 
@@ -34,6 +40,18 @@ FRONTEND_URL = os.getenv("FRONTEND_URL")
 if FRONTEND_URL and FRONTEND_URL not in ALLOWED_ORIGINS:
     ALLOWED_ORIGINS.append(FRONTEND_URL)
 
+# Registered before CORS so that rejections still carry CORS headers
+@app.middleware("http")
+async def reject_oversized_requests(request: Request, call_next):
+    """Refuse bodies over the upload cap before they are parsed or spooled to disk"""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > upload_store.max_upload_bytes:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": str(UploadTooLargeError(upload_store.max_upload_bytes))}
+        )
+    return await call_next(request)
+
 # CORS middleware for React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -41,15 +59,61 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Deck-Id", "X-Artifact-Id"],
 )
 
 # Ensure outputs directory exists
 os.makedirs("outputs", exist_ok=True)
 
 # Initialize services
+artifact_store = ArtifactStore()
 ai_service = AIService()
-ppt_service = PPTService()
-pdf_service = PDFService()
+ppt_service = PPTService(artifact_store)
+pdf_service = PDFService(artifact_store=artifact_store)
+session_service = SessionService()
+upload_store = UploadStore()
+
+@app.on_event("startup")
+async def start_artifact_janitor():
+    artifact_store.start_janitor()
+
+@app.on_event("shutdown")
+async def stop_artifact_janitor():
+    artifact_store.stop_janitor()
+
+def artifact_headers(path: str, headers: Optional[dict] = None) -> dict:
+    """Response headers for a generated file, with its artifact ID for later downloads"""
+    headers = dict(headers or {})
+    artifact_id = artifact_store.artifact_id(path)
+    if artifact_id:
+        headers["X-Artifact-Id"] = artifact_id
+    return headers
+
+def validate_pdf_profile(pdf_profile: str):
+    """Reject unknown PDF export profiles before any work is done"""
+    if pdf_profile not in PDF_EXPORT_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown pdf_profile '{pdf_profile}'. Available: {', '.join(PDF_EXPORT_PROFILES)}"
+        )
+
+async def stored_upload_path(upload: Optional[UploadFile], content_hash: Optional[str], field: str) -> Optional[str]:
+    """
+    Path of an upload in the upload store: the uploaded file, or a blob the client
+    uploaded before and now refers to by its SHA-256. Stored blobs are shared, so
+    callers must not modify or delete them.
+    """
+    if upload:
+        try:
+            return (await upload_store.save(upload))["path"]
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+    if content_hash:
+        path = upload_store.path(content_hash)
+        if path is None:
+            raise HTTPException(status_code=404, detail=f"No stored upload for {field} {content_hash}, please upload the file")
+        return path
+    return None
 
 class GenerateRequest(BaseModel):
     prompt: str
@@ -68,36 +132,76 @@ class PromptEditRequest(BaseModel):
 async def root():
     return {"message": "AI-Powered PPT Automation System API"}
 
+@app.get("/metrics")
+async def get_metrics():
+    """Conversion metrics per PDF export profile, deck sessions, the extraction and render caches, uploads and artifacts"""
+    return {
+        "pdf": pdf_service.get_metrics(),
+        "sessions": session_service.stats(),
+        "extraction_cache": ppt_service.extraction_cache_stats(),
+        "render_cache": ppt_service.render_cache_stats(),
+        "uploads": upload_store.stats(),
+        "artifacts": artifact_store.stats()
+    }
+
+@app.post("/uploads")
+async def create_upload(file: UploadFile = File(...)):
+    """Store a deck, template or logo once and return its SHA-256 for later requests"""
+    try:
+        stored = await upload_store.save(file)
+        return {
+            "success": True,
+            "hash": stored["hash"],
+            "size": stored["size"],
+            "deduplicated": stored["deduplicated"]
+        }
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        print(f"Error in create_upload: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.api_route("/uploads/{content_hash}", methods=["GET", "HEAD"])
+async def get_upload(content_hash: str):
+    """Tell a client whether the server already has a file, so it can skip the upload"""
+    stored = upload_store.describe(content_hash)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return {"exists": True, "hash": stored["hash"], "size": stored["size"]}
+
+@app.get("/artifacts/{artifact_id}")
+async def download_artifact(artifact_id: str):
+    """Download a generated deck, PDF or ZIP by the ID from its X-Artifact-Id header"""
+    path = artifact_store.path(artifact_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Artifact not found or expired")
+    return FileResponse(path, filename=os.path.basename(path))
+
 @app.post("/generate")
 async def generate_presentation(
     prompt: str = Form(...),
     output_format: str = Form("pptx"),
     template: UploadFile = File(None),
     logo: UploadFile = File(None),
+    template_hash: Optional[str] = Form(None),
+    logo_hash: Optional[str] = Form(None),
     logo_position: str = Form("top-right"),
-    logo_size: str = Form("medium")
+    logo_size: str = Form("medium"),
+    pdf_profile: str = Form("default")
 ):
     """Generate a PowerPoint presentation from a text prompt with optional template and logo"""
+    validate_pdf_profile(pdf_profile)
     try:
         print(f"Received request: {prompt[:100]}...")
         
-        # Handle template upload
-        template_path = None
+        # Handle template and logo, uploaded now or referenced by hash
         if template:
             print(f"Template uploaded: {template.filename}")
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-                content = await template.read()
-                temp_file.write(content)
-                template_path = temp_file.name
+        template_path = await stored_upload_path(template, template_hash, "template_hash")
         
-        # Handle logo upload
-        logo_path = None
         if logo:
             print(f"Logo uploaded: {logo.filename}")
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{logo.filename.split('.')[-1]}") as temp_file:
-                content = await logo.read()
-                temp_file.write(content)
-                logo_path = temp_file.name
+        logo_path = await stored_upload_path(logo, logo_hash, "logo_hash")
         
         # Get structured data from AI
         print("Calling AI service...")
@@ -115,21 +219,15 @@ async def generate_presentation(
         )
         print(f"Presentation created at: {pptx_path}")
         
-        # Clean up temporary files
-        if template_path:
-            os.unlink(template_path)
-        if logo_path:
-            os.unlink(logo_path)
-        
         if output_format == "pdf":
             # Convert to PDF
-            pdf_path = pdf_service.convert_to_pdf(pptx_path)
+            pdf_path = await pdf_service.convert_to_pdf_async(pptx_path, profile=pdf_profile)
             filename = f"{slide_data['meta']['deck_title'].replace(' ', '_')}.pdf"
             return FileResponse(
                 pdf_path, 
                 media_type="application/pdf",
                 filename=filename,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
+                headers=artifact_headers(pdf_path, {"Content-Disposition": f"attachment; filename={filename}"})
             )
         else:
             # Return PPTX
@@ -138,9 +236,11 @@ async def generate_presentation(
                 pptx_path, 
                 media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
                 filename=filename,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
+                headers=artifact_headers(pptx_path, {"Content-Disposition": f"attachment; filename={filename}"})
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in generate_presentation: {e}")
         import traceback
@@ -171,10 +271,14 @@ async def generate_from_structure(
     output_format: str = Form("pptx"),
     template: UploadFile = File(None),
     logo: UploadFile = File(None),
+    template_hash: Optional[str] = Form(None),
+    logo_hash: Optional[str] = Form(None),
     logo_position: str = Form("top-right"),
-    logo_size: str = Form("medium")
+    logo_size: str = Form("medium"),
+    pdf_profile: str = Form("default")
 ):
     """Generate presentation from edited slide structure"""
+    validate_pdf_profile(pdf_profile)
     try:
         print("Generating presentation from edited structure...")
         
@@ -182,33 +286,27 @@ async def generate_from_structure(
         slide_structure = json.loads(slide_data)
         print(f"Parsed structure with {len(slide_structure.get('slides', []))} slides")
         
-        # Handle template upload
-        template_path = None
+        # Handle template and logo, uploaded now or referenced by hash
         if template:
             print(f"Template uploaded: {template.filename}")
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-                content = await template.read()
-                temp_file.write(content)
-                template_path = temp_file.name
+        template_path = await stored_upload_path(template, template_hash, "template_hash")
         
-        # Handle logo upload
-        logo_path = None
         if logo:
             print(f"Logo uploaded: {logo.filename}")
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{logo.filename.split('.')[-1]}") as temp_file:
-                content = await logo.read()
-                temp_file.write(content)
-                logo_path = temp_file.name
+        logo_path = await stored_upload_path(logo, logo_hash, "logo_hash")
         
         # Check if slide structure has original template info
+        meta = slide_structure.get("meta", {})
         stored_template_path = None
-        if slide_structure.get("meta", {}).get("stored_template_path"):
-            stored_template_path = slide_structure["meta"]["stored_template_path"]
-            if os.path.exists(stored_template_path):
-                print(f"Using stored original template: {stored_template_path}")
-                template_path = stored_template_path
-            else:
-                print(f"Warning: Stored template not found: {stored_template_path}")
+        if meta.get("stored_template_hash"):
+            stored_template_path = upload_store.path(meta["stored_template_hash"])
+        elif meta.get("stored_template_path") and upload_store.contains(meta["stored_template_path"]):
+            stored_template_path = meta["stored_template_path"]
+        if stored_template_path and os.path.exists(stored_template_path):
+            print(f"Using stored original template: {stored_template_path}")
+            template_path = stored_template_path
+        elif meta.get("stored_template_hash") or meta.get("stored_template_path"):
+            print(f"Warning: Stored template not found: {meta.get('stored_template_hash') or meta.get('stored_template_path')}")
         
         # Generate PPTX file
         print("Creating presentation from structure...")
@@ -221,21 +319,15 @@ async def generate_from_structure(
         )
         print(f"Presentation created at: {pptx_path}")
         
-        # Clean up temporary files
-        if template_path:
-            os.unlink(template_path)
-        if logo_path:
-            os.unlink(logo_path)
-        
         if output_format == "pdf":
             # Convert to PDF
-            pdf_path = pdf_service.convert_to_pdf(pptx_path)
+            pdf_path = await pdf_service.convert_to_pdf_async(pptx_path, profile=pdf_profile)
             filename = f"{slide_structure['meta']['deck_title'].replace(' ', '_')}.pdf"
             return FileResponse(
                 pdf_path, 
                 media_type="application/pdf",
                 filename=filename,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
+                headers=artifact_headers(pdf_path, {"Content-Disposition": f"attachment; filename={filename}"})
             )
         else:
             # Return PPTX
@@ -244,9 +336,11 @@ async def generate_from_structure(
                 pptx_path, 
                 media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
                 filename=filename,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
+                headers=artifact_headers(pptx_path, {"Content-Disposition": f"attachment; filename={filename}"})
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in generate_from_structure: {e}")
         import traceback
@@ -267,7 +361,7 @@ async def preview_presentation(slide_data: dict):
             pptx_path, 
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
             filename=filename,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            headers=artifact_headers(pptx_path, {"Content-Disposition": f"attachment; filename={filename}"})
         )
             
     except Exception as e:
@@ -277,131 +371,164 @@ async def preview_presentation(slide_data: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/extract-from-ppt")
-async def extract_from_ppt(ppt_file: UploadFile = File(...)):
+async def extract_from_ppt(
+    ppt_file: UploadFile = File(None),
+    ppt_hash: Optional[str] = Form(None),
+    stream: bool = Form(False)
+):
     """
-    Extract slide data from an uploaded PowerPoint file for editing
+    Extract slide data from an uploaded PowerPoint file for editing.
+    Pass ppt_hash instead of a file to extract a deck the server already has.
+    With stream=true the response is NDJSON: a meta line, one line per slide as
+    soon as it has been read, then a done line.
     """
     try:
-        print(f"Received PPT file for extraction: {ppt_file.filename}")
-        
-        if not ppt_file.filename.lower().endswith(('.ppt', '.pptx')):
-            raise HTTPException(status_code=400, detail="File must be a PowerPoint presentation (.ppt or .pptx)")
+        if ppt_file:
+            print(f"Received PPT file for extraction: {ppt_file.filename}")
+            if not ppt_file.filename.lower().endswith(('.ppt', '.pptx')):
+                raise HTTPException(status_code=400, detail="File must be a PowerPoint presentation (.ppt or .pptx)")
+        elif not ppt_hash:
+            raise HTTPException(status_code=400, detail="Either ppt_file or ppt_hash is required")
+        
+        # The stored upload doubles as the original template for later generation
+        template_storage_path = await stored_upload_path(ppt_file, ppt_hash, "ppt_hash")
+        template_hash = os.path.splitext(os.path.basename(template_storage_path))[0]
+        original_filename = ppt_file.filename if ppt_file else os.path.basename(template_storage_path)
+        print(f"Saved original template to: {template_storage_path}")
+
+        if stream:
+            return StreamingResponse(
+                stream_extracted_slides(template_storage_path, template_hash, original_filename),
+                media_type="application/x-ndjson"
+            )
+
+        # Extract slide data from the uploaded presentation
+        slide_data = ppt_service.extract_slide_data_from_ppt(template_storage_path)
+        print(f"Successfully extracted {len(slide_data.get('slides', []))} slides from uploaded PPT")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            content = await ppt_file.read()
-            temp_file.write(content)
-            temp_ppt_path = temp_file.name
+        # Update the slide data with the stored template
+        slide_data["meta"]["stored_template_path"] = template_storage_path
+        slide_data["meta"]["stored_template_hash"] = template_hash
         
-        try:
-            # Extract slide data from the uploaded presentation
-            slide_data = ppt_service.extract_slide_data_from_ppt(temp_ppt_path)
-            print(f"Successfully extracted {len(slide_data.get('slides', []))} slides from uploaded PPT")
-            
-            # Save the original template file for later use
-            template_storage_path = os.path.join("outputs", f"template_{int(datetime.now().timestamp())}.pptx")
-            os.makedirs("outputs", exist_ok=True)
-            shutil.copy2(temp_ppt_path, template_storage_path)
-            
-            # Update the slide data with the stored template path
-            slide_data["meta"]["stored_template_path"] = template_storage_path
-            print(f"Saved original template to: {template_storage_path}")
-            
-            return {
-                "success": True,
-                "slide_data": slide_data,
-                "original_filename": ppt_file.filename,
-                "message": f"Successfully extracted {len(slide_data.get('slides', []))} slides for editing"
-            }
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_ppt_path)
-            except:
-                pass
+        return {
+            "success": True,
+            "slide_data": slide_data,
+            "original_filename": original_filename,
+            "message": f"Successfully extracted {len(slide_data.get('slides', []))} slides for editing"
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in extract_from_ppt: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"PPT extraction failed: {str(e)}")
 
+def stream_extracted_slides(ppt_path: str, template_hash: str, original_filename: str):
+    """
+    NDJSON lines for a streamed extraction of a stored upload
+    """
+    total = 0
+    try:
+        for event in ppt_service.stream_slide_data(ppt_path):
+            if event["type"] == "meta":
+                event["meta"]["stored_template_path"] = ppt_path
+                event["meta"]["stored_template_hash"] = template_hash
+            else:
+                total += 1
+            yield json.dumps(event, default=str) + "\n"
+
+        yield json.dumps({
+            "type": "done",
+            "success": True,
+            "original_filename": original_filename,
+            "message": f"Successfully extracted {total} slides for editing"
+        }) + "\n"
+    except Exception as e:
+        print(f"Error streaming slide extraction: {e}")
+        import traceback
+        traceback.print_exc()
+        yield json.dumps({"type": "error", "detail": f"PPT extraction failed: {str(e)}"}) + "\n"
+
 @app.post("/edit")
-async def edit_presentation(file: UploadFile = File(...), updates: str = ""):
+async def edit_presentation(file: UploadFile = File(None), updates: str = "", file_hash: Optional[str] = Form(None)):
     """Edit an existing PowerPoint presentation"""
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        # Store the upload, or pick up a deck the server already has
+        stored_path = await require_stored_upload(file, file_hash)
         
         # Parse updates JSON
         import json
         updates_dict = json.loads(updates) if updates else {}
         
         # Apply edits
-        edited_path = ppt_service.edit_presentation(temp_path, updates_dict)
+        edited_path = ppt_service.edit_presentation(stored_path, updates_dict)
         
         return FileResponse(
             edited_path,
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-            filename="edited_presentation.pptx"
+            filename="edited_presentation.pptx",
+            headers=artifact_headers(edited_path)
         )
         
+    except HTTPException:
+        raise
+    except EditPlanError as e:
+        raise HTTPException(status_code=422, detail={"message": str(e), "edits": e.outcomes})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Clean up temp file
-        if 'temp_path' in locals():
-            os.unlink(temp_path)
 
 @app.post("/edit-with-prompt")
 async def edit_presentation_with_prompt(
-    file: UploadFile = File(...),
+    file: UploadFile = File(None),
     edit_prompt: str = Form(...),
     slide_number: Optional[int] = Form(None),
-    output_format: str = Form("pptx")
+    output_format: str = Form("pptx"),
+    pdf_profile: str = Form("default"),
+    file_hash: Optional[str] = Form(None),
+    atomic: bool = Form(True)
 ):
     """Edit an existing PowerPoint presentation using natural language prompts"""
+    validate_pdf_profile(pdf_profile)
     try:
         print(f"🎯 Editing presentation with prompt: {edit_prompt}")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        # Store the upload, or pick up a deck the server already has
+        stored_path = await require_stored_upload(file, file_hash)
         
-        # Extract current slide data from the presentation
+        # Parse the presentation once; extraction and edits share it. Parsing, indexing
+        # and saving are blocking work, keep them off the event loop
         print("📋 Extracting current presentation structure...")
-        current_slide_data = ppt_service.extract_slide_data_from_ppt(temp_path)
+        pipeline = await run_in_threadpool(ppt_service.open_edit_pipeline, stored_path)
+        current_slide_data = await run_in_threadpool(pipeline.slide_data)
+        text_index = await run_in_threadpool(pipeline.text_index)
         
         # Use AI to generate edit instructions
         print("🤖 Generating AI edit instructions...")
-        edit_instructions = await ai_service.generate_slide_edits(
+        edit_instructions = await generate_located_edits(
             edit_prompt, 
             current_slide_data, 
-            slide_number
+            slide_number,
+            text_index
         )
         
         print(f"📝 Generated edit instructions: {edit_instructions}")
         
         # Apply the AI-generated edits
         print("🔧 Applying edits to presentation...")
-        edited_path = ppt_service.edit_presentation(temp_path, edit_instructions)
+        edited_path = await run_in_threadpool(pipeline.apply, edit_instructions, atomic)
         
         # Handle output format
         if output_format == "pdf":
-            # Convert to PDF
-            pdf_path = pdf_service.convert_to_pdf(edited_path)
+            # Convert to PDF, re-rendering only the slides the edit touched
+            pdf_path = await pdf_service.convert_to_pdf_incremental(edited_path, profile=pdf_profile)
             filename = f"edited_presentation.pdf"
             return FileResponse(
                 pdf_path, 
                 media_type="application/pdf",
                 filename=filename,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
+                headers=artifact_headers(pdf_path, {"Content-Disposition": f"attachment; filename={filename}"})
             )
         else:
             # Return PPTX
@@ -410,131 +537,247 @@ async def edit_presentation_with_prompt(
                 edited_path,
                 media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
                 filename=filename,
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
+                headers=artifact_headers(edited_path, {"Content-Disposition": f"attachment; filename={filename}"})
             )
         
+    except HTTPException:
+        raise
+    except EditPlanError as e:
+        raise HTTPException(status_code=422, detail={"message": str(e), "edits": e.outcomes})
     except Exception as e:
         print(f"Error in edit_presentation_with_prompt: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Clean up temp file
-        if 'temp_path' in locals():
-            os.unlink(temp_path)
+
+async def require_stored_upload(file: Optional[UploadFile], file_hash: Optional[str]) -> str:
+    """Stored path of a deck given either as an upload or by the hash of an earlier upload"""
+    if not file and not file_hash:
+        raise HTTPException(status_code=400, detail="Either a file or a file_hash is required")
+    return await stored_upload_path(file, file_hash, "file_hash")
+
+async def resolve_deck_session(file: Optional[UploadFile], deck_id: Optional[str], file_hash: Optional[str] = None):
+    """Return the session for deck_id, or open a new session from an uploaded or stored file"""
+    if deck_id:
+        session = session_service.get_session(deck_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Deck session not found or expired, please upload the file again")
+        return session
+    
+    if not file and not file_hash:
+        raise HTTPException(status_code=400, detail="Either a file, a file_hash or a deck_id is required")
+    
+    stored_path = await stored_upload_path(file, file_hash, "file_hash")
+    # Copying and parsing the deck is blocking work, keep it off the event loop
+    return await run_in_threadpool(session_service.create_session, stored_path,
+                                   file.filename if file else os.path.basename(stored_path))
+
+@asynccontextmanager
+async def locked_session(session):
+    """Hold a session's lock; a session dropped before the lock was acquired is gone"""
+    async with session.lock:
+        if session.presentation is None:
+            raise HTTPException(status_code=404, detail="Deck session not found or expired, please upload the file again")
+        yield session
+
+def session_text_index(session):
+    """The session's text index, built once from its parsed deck"""
+    if session.text_index is None:
+        session.text_index = ppt_service.build_text_index(session.presentation)
+    return session.text_index
+
+async def generate_located_edits(edit_prompt: str, slide_data: Dict[str, Any], slide_number: Optional[int], text_index) -> Dict[str, Any]:
+    """AI edit instructions with every find string located in the deck; only low-confidence matches go back to the model, once"""
+    edit_instructions = await ai_service.generate_slide_edits(edit_prompt, slide_data, slide_number)
+    unresolved = ppt_service.resolve_edit_targets(text_index, edit_instructions)
+    if not unresolved:
+        return edit_instructions
+    
+    print(f"🔁 {len(unresolved)} find strings not found in the deck, asking the model to correct them")
+    retried = await ai_service.generate_slide_edits(edit_prompt, slide_data, slide_number, unresolved_finds=unresolved)
+    if len(ppt_service.resolve_edit_targets(text_index, retried)) < len(unresolved):
+        return retried
+    return edit_instructions
+
+@app.post("/sessions")
+async def create_deck_session(file: UploadFile = File(None), file_hash: Optional[str] = Form(None)):
+    """Upload a deck once and keep it parsed on the server for previews and edits"""
+    try:
+        session = await resolve_deck_session(file, None, file_hash)
+        async with locked_session(session):
+            session.slide_content = await run_in_threadpool(ppt_service.extract_slide_content, session.path)
+        
+        return {
+            "success": True,
+            "deck_id": session.deck_id,
+            "original_filename": session.filename,
+            "slides": session.slide_content,
+            "expires_in": session_service.ttl_seconds
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in create_deck_session: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/sessions/{deck_id}/search")
+async def search_deck_session(deck_id: str, q: str):
+    """Which slides mention a phrase, with the matching spans"""
+    session = await resolve_deck_session(None, deck_id)
+    async with locked_session(session):
+        text_index = await run_in_threadpool(session_text_index, session)
+        matches = text_index.find(q)
+    return {
+        "query": q,
+        "slides": sorted({match.slide_index + 1 for match in matches}),
+        "matches": [match.to_dict() for match in matches]
+    }
+
+@app.delete("/sessions/{deck_id}")
+async def delete_deck_session(deck_id: str):
+    """Release a deck session"""
+    if not session_service.delete_session(deck_id):
+        raise HTTPException(status_code=404, detail="Deck session not found")
+    return {"success": True}
 
 @app.post("/preview-edit")
 async def preview_edit_with_prompt(
-    file: UploadFile = File(...),
+    file: UploadFile = File(None),
     edit_prompt: str = Form(...),
     slide_number: Optional[int] = Form(None),
-    output_format: str = Form("pptx")
+    output_format: str = Form("pptx"),
+    deck_id: Optional[str] = Form(None),
+    file_hash: Optional[str] = Form(None)
 ):
     """Preview presentation edits without downloading the file"""
     try:
-        # Save uploaded file temporarily
-        temp_path = f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Extract current slide content before editing
-        original_slides = ppt_service.extract_slide_content(temp_path)
-        
-        # Generate edit instructions using AI
-        print(f"🔍 Debug - About to call generate_slide_edits with:")
-        print(f"  edit_prompt: {edit_prompt}")
-        print(f"  original_slides type: {type(original_slides)}")
-        print(f"  slide_number: {slide_number}")
-        
-        edit_instructions = await ai_service.generate_slide_edits(
-            edit_prompt, 
-            original_slides,
-            slide_number
-        )
-        
-        print(f"✅ Edit instructions generated: {edit_instructions}")
-        
-        # Apply edits and get preview data
-        preview_data = ppt_service.preview_edits(
-            temp_path, 
-            edit_instructions, 
-            slide_number
-        )
+        # Reuse the parsed deck when a session exists, otherwise open one from the upload
+        session = await resolve_deck_session(file, deck_id, file_hash)
+        
+        # One request at a time reads or edits a session's deck and text index
+        async with locked_session(session):
+            # Extract current slide content before editing
+            if session.slide_content is None:
+                session.slide_content = await run_in_threadpool(ppt_service.extract_slide_content, session.path)
+            original_slides = session.slide_content
+            text_index = await run_in_threadpool(session_text_index, session)
+            
+            # Generate edit instructions using AI
+            print(f"🔍 Debug - About to call generate_slide_edits with:")
+            print(f"  edit_prompt: {edit_prompt}")
+            print(f"  original_slides type: {type(original_slides)}")
+            print(f"  slide_number: {slide_number}")
+            
+            edit_instructions = await generate_located_edits(
+                edit_prompt, 
+                original_slides,
+                slide_number,
+                text_index
+            )
+            
+            print(f"✅ Edit instructions generated: {edit_instructions}")
+            
+            # Apply edits and get preview data
+            preview_data = await run_in_threadpool(
+                ppt_service.preview_edits,
+                session.presentation, 
+                edit_instructions, 
+                slide_number
+            )
+            
+            # Validate the instructions the way applying them will
+            edit_plan = await run_in_threadpool(
+                ppt_service.compile_edit_plan,
+                session.presentation,
+                edit_instructions.get("edits", []),
+                text_index
+            )
         
         return {
             "success": True,
+            "deck_id": session.deck_id,
             "original_slides": original_slides,
             "edit_instructions": edit_instructions,
+            "edit_outcomes": edit_plan.outcomes(),
             "preview_data": preview_data,
             "message": "Preview generated successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error in preview_edit_with_prompt: {e}")
         print(f"❌ Error type: {type(e)}")
         import traceback
         traceback.print_exc()
-        
-        # Clean up temp file
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            os.unlink(temp_path)
-            
         raise HTTPException(status_code=500, detail=f"Error generating edit instructions: {str(e)}")
-    finally:
-        # Clean up temp file
-        if 'temp_path' in locals():
-            os.unlink(temp_path)
 
 @app.post("/apply-preview-edits")
 async def apply_preview_edits(
-    file: UploadFile = File(...),
+    file: UploadFile = File(None),
     edit_instructions: str = Form(...),
     slide_number: Optional[int] = Form(None),
-    output_format: str = Form("pptx")
+    output_format: str = Form("pptx"),
+    deck_id: Optional[str] = Form(None),
+    file_hash: Optional[str] = Form(None),
+    atomic: bool = Form(True)
 ):
     """Apply the previewed edits and download the file"""
     try:
-        # Save uploaded file temporarily
-        temp_path = f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
         # Parse edit instructions
         instructions = json.loads(edit_instructions)
         
-        # Apply edits
-        output_path = ppt_service.edit_presentation(
-            temp_path, 
-            instructions
-        )
+        # Apply edits to the session's parsed deck, which then holds the edited version
+        session = await resolve_deck_session(file, deck_id, file_hash)
+        async with locked_session(session):
+            text_index = await run_in_threadpool(session_text_index, session)
+            output_path = await run_in_threadpool(
+                ppt_service.edit_presentation,
+                session.presentation, 
+                instructions,
+                text_index=text_index,
+                atomic=atomic,
+                source_path=session.path
+            )
+            await run_in_threadpool(session_service.update_session, session, output_path)
         
         return FileResponse(
             output_path,
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation" if output_format == "pptx" else "application/pdf",
-            filename=os.path.basename(output_path)
+            filename=os.path.basename(output_path),
+            headers=artifact_headers(output_path, {"X-Deck-Id": session.deck_id})
         )
         
+    except HTTPException:
+        raise
+    except EditPlanError as e:
+        raise HTTPException(status_code=422, detail={"message": str(e), "edits": e.outcomes})
     except Exception as e:
         print(f"Error in apply_preview_edits: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Clean up temp file
-        if 'temp_path' in locals():
-            os.unlink(temp_path)
 
 @app.post("/bulk")
-async def bulk_generate(file: UploadFile = File(...)):
+async def bulk_generate(
+    file: UploadFile = File(...),
+    output_format: str = Form("pptx"),
+    pdf_profile: str = Form("default")
+):
     """Generate multiple presentations from CSV data"""
+    validate_pdf_profile(pdf_profile)
     try:
-        # Read CSV file
-        content = await file.read()
-        csv_data = csv.DictReader(io.StringIO(content.decode('utf-8')))
+        # Read the CSV row by row from the request's spooled upload. It is used once,
+        # so it stays out of the upload store and its budget for decks and templates
+        csv_file = io.TextIOWrapper(file.file, newline='', encoding='utf-8')
         
         # Create temporary directory for generated files
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory() as temp_dir, csv_file:
             generated_files = []
+            csv_data = csv.DictReader(csv_file)
             
             for i, row in enumerate(csv_data):
                 # Construct prompt from CSV row
@@ -547,18 +790,39 @@ async def bulk_generate(file: UploadFile = File(...)):
                 pptx_path = ppt_service.create_presentation_with_full_template(slide_data, output_dir=temp_dir)
                 generated_files.append(pptx_path)
             
+            conversion_errors = []
+            if output_format == "pdf":
+                # Convert the whole batch with as few LibreOffice runs as possible
+                results = await pdf_service.convert_many(generated_files, output_dir=temp_dir, profile=pdf_profile)
+                generated_files = []
+                for result in results:
+                    if result["pdf_path"]:
+                        generated_files.append(result["pdf_path"])
+                    else:
+                        # Ship the deck itself rather than dropping it from the ZIP
+                        generated_files.append(result["input"])
+                        conversion_errors.append({
+                            "file": os.path.basename(result["input"]),
+                            "error": result["error"]
+                        })
+            
             # Create ZIP file
-            zip_path = os.path.join("outputs", "bulk_presentations.zip")
+            zip_path = artifact_store.allocate("bulk_presentations.zip")
             with zipfile.ZipFile(zip_path, 'w') as zip_file:
                 for file_path in generated_files:
                     zip_file.write(file_path, os.path.basename(file_path))
+                if conversion_errors:
+                    zip_file.writestr("conversion_errors.json", json.dumps(conversion_errors, indent=2))
             
             return FileResponse(
                 zip_path,
                 media_type="application/zip",
-                filename="bulk_presentations.zip"
+                filename="bulk_presentations.zip",
+                headers=artifact_headers(zip_path)
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -3,7 +3,7 @@ import json
 import os
 import asyncio
 import concurrent.futures
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -181,9 +181,12 @@ Rules:
             ]
         }
     
-    async def generate_slide_edits(self, edit_prompt: str, current_slide_data: Dict[str, Any], slide_number: int = None) -> Dict[str, Any]:
+    async def generate_slide_edits(self, edit_prompt: str, current_slide_data: Dict[str, Any], slide_number: int = None,
+                                   unresolved_finds: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
-        Generate specific edits for a presentation based on natural language prompts
+        Generate specific edits for a presentation based on natural language prompts.
+        unresolved_finds lists find strings of an earlier attempt that could not be
+        located in the deck, with the closest text found, so the model can correct them.
         """
         system_prompt = """
 You are an expert presentation editor. Based on the user's edit request and the current slide data, generate precise editing instructions.
@@ -248,6 +251,18 @@ IMPORTANT:
 4. If the user mentions a specific slide number, use that slide number
 
 Generate the editing instructions to fulfill this request.
+"""
+        if unresolved_finds:
+            feedback = "\n".join(
+                f"- Slide {item['slide_index'] if item['slide_index'] is not None else '(invalid number)'}: "
+                f"\"{item['find']}\" (closest text in the deck: "
+                f"{json.dumps(item['closest_text']) if item['closest_text'] else 'none'})"
+                for item in unresolved_finds
+            )
+            user_prompt += f"""
+A previous attempt used find text that does not occur in the presentation:
+{feedback}
+Copy the find text EXACTLY from the slide content above.
 """
 
         try:
@@ -0,0 +1,159 @@
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+ARTIFACT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ArtifactStore:
+    """
+    Generated files (decks, PDFs, ZIPs) under outputs/artifacts. Every artifact gets
+    its own directory named by a random ID, so concurrent requests never overwrite
+    each other's files while the download keeps its readable filename. Artifacts
+    expire after a period without access and the least recently used ones are
+    removed when the store exceeds its disk quota.
+    """
+
+    def __init__(self, store_dir: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_bytes: Optional[int] = None, janitor_interval: Optional[int] = None):
+        self.store_dir = store_dir or os.path.join("outputs", "artifacts")
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        self.ttl_seconds = ttl_seconds or int(os.getenv("ARTIFACT_TTL_SECONDS", "3600"))
+        self.max_bytes = max_bytes or int(os.getenv("ARTIFACT_MAX_BYTES", str(1024 * 1024 * 1024)))
+        self.janitor_interval = janitor_interval or int(os.getenv("ARTIFACT_JANITOR_INTERVAL", "300"))
+
+        self._lock = threading.Lock()
+        self._janitor = None
+        self._janitor_stop = threading.Event()
+
+    def allocate(self, filename: str) -> str:
+        """
+        Reserve a new artifact and return the path to write it to
+        """
+        artifact_id = uuid.uuid4().hex
+        artifact_dir = os.path.join(self.store_dir, artifact_id)
+        os.makedirs(artifact_dir)
+        return os.path.join(artifact_dir, self._safe_filename(filename))
+
+    def artifact_id(self, path: str) -> Optional[str]:
+        """
+        ID of the artifact a path belongs to, or None for files outside the store
+        """
+        artifact_dir = os.path.dirname(os.path.abspath(path))
+        if os.path.dirname(artifact_dir) != os.path.abspath(self.store_dir):
+            return None
+        artifact_id = os.path.basename(artifact_dir)
+        return artifact_id if ARTIFACT_ID_PATTERN.match(artifact_id) else None
+
+    def path(self, artifact_id: str) -> Optional[str]:
+        """
+        Path of an artifact, marking it as recently used, or None if it is unknown or expired
+        """
+        if not ARTIFACT_ID_PATTERN.match(artifact_id or ""):
+            return None
+        artifact_dir = os.path.join(self.store_dir, artifact_id)
+        try:
+            names = os.listdir(artifact_dir)
+        except OSError:
+            return None
+        if not names:
+            return None
+
+        artifact_path = os.path.join(artifact_dir, names[0])
+        if time.time() - os.path.getmtime(artifact_path) > self.ttl_seconds:
+            self._remove(artifact_id)
+            return None
+        # mtime records the last access, for both expiry and LRU eviction
+        os.utime(artifact_path)
+        return artifact_path
+
+    def purge(self) -> int:
+        """
+        Remove expired artifacts, then least recently used ones until the store fits
+        its quota. Returns the number of artifacts removed.
+        """
+        with self._lock:
+            now = time.time()
+            removed = 0
+            live = []
+            for artifact in self._scan():
+                # Reserved directories that never received a file expire the same way
+                if now - artifact["last_access"] > self.ttl_seconds:
+                    self._remove(artifact["id"])
+                    removed += 1
+                else:
+                    live.append(artifact)
+
+            total = sum(artifact["size"] for artifact in live)
+            for artifact in sorted(live, key=lambda a: a["last_access"]):
+                if total <= self.max_bytes:
+                    break
+                self._remove(artifact["id"])
+                total -= artifact["size"]
+                removed += 1
+
+        if removed:
+            print(f"🧹 Removed {removed} artifacts")
+        return removed
+
+    def start_janitor(self):
+        """
+        Purge the store periodically from a background thread
+        """
+        if self._janitor is not None and self._janitor.is_alive():
+            return
+        self._janitor_stop.clear()
+        self._janitor = threading.Thread(target=self._run_janitor, name="artifact-janitor", daemon=True)
+        self._janitor.start()
+
+    def stop_janitor(self):
+        self._janitor_stop.set()
+        if self._janitor is not None:
+            self._janitor.join(timeout=5)
+            self._janitor = None
+
+    def stats(self) -> Dict[str, Any]:
+        artifacts = self._scan()
+        return {
+            "entries": len(artifacts),
+            "bytes": sum(artifact["size"] for artifact in artifacts),
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    def _run_janitor(self):
+        while not self._janitor_stop.wait(self.janitor_interval):
+            try:
+                self.purge()
+            except Exception as e:
+                print(f"⚠️ Artifact janitor failed: {e}")
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        artifacts = []
+        for artifact_id in os.listdir(self.store_dir):
+            if not ARTIFACT_ID_PATTERN.match(artifact_id):
+                continue
+            artifact_dir = os.path.join(self.store_dir, artifact_id)
+            try:
+                stats = [os.stat(os.path.join(artifact_dir, name)) for name in os.listdir(artifact_dir)]
+                last_access = max((stat.st_mtime for stat in stats), default=os.stat(artifact_dir).st_mtime)
+            except OSError:
+                continue
+            artifacts.append({
+                "id": artifact_id,
+                "size": sum(stat.st_size for stat in stats),
+                "last_access": last_access
+            })
+        return artifacts
+
+    def _remove(self, artifact_id: str):
+        shutil.rmtree(os.path.join(self.store_dir, artifact_id), ignore_errors=True)
+
+    def _safe_filename(self, filename: str) -> str:
+        filename = os.path.basename(filename or "").strip()
+        return re.sub(r"[^\w.\- ]", "_", filename) or "artifact"
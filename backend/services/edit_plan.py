@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+EDIT_ACTIONS = ("modify_content", "add_content", "replace_content", "delete_content", "change_layout")
+TARGET_ELEMENTS = ("title", "text", "bullets", "chart", "table")
+TEXT_ELEMENTS = ("title", "text", "bullets")
+# Actions the model may emit that no handler implements; rejected rather than reported as applied
+UNSUPPORTED_ACTIONS = ("change_layout",)
+
+
+class EditPlanError(Exception):
+    """Raised when an all-or-nothing edit plan could not be applied in full"""
+
+    def __init__(self, message: str, outcomes: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.outcomes = outcomes
+
+
+class PlannedEdit:
+    """
+    One validated and normalized edit instruction, with its outcome once applied
+    """
+    __slots__ = ("position", "slide_index", "action", "target_element", "changes", "status", "detail")
+
+    def __init__(self, position: int, slide_index: Optional[int], action: str, target_element: str,
+                 changes: Dict[str, Any], status: str = "pending", detail: Optional[str] = None):
+        self.position = position
+        self.slide_index = slide_index
+        self.action = action
+        self.target_element = target_element
+        self.changes = changes
+        self.status = status
+        self.detail = detail
+
+    @property
+    def is_text_replacement(self) -> bool:
+        return self.action == "modify_content" and "find" in self.changes and "replace" in self.changes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "edit": self.position,
+            "slide_number": self.slide_index + 1 if self.slide_index is not None else None,
+            "action": self.action,
+            "target_element": self.target_element,
+            "status": self.status,
+            "detail": self.detail
+        }
+
+
+class EditPlan:
+    """
+    Edit instructions compiled for a single pass over a deck. Every instruction is
+    validated and normalized before anything is changed, then the edits are grouped
+    by slide in instruction order, so each slide is visited once.
+
+    Outcomes: pending, applied, not_found, conflict, failed, invalid, and for
+    all-or-nothing plans skipped (never attempted) or rolled_back.
+    """
+
+    def __init__(self, edit_instructions: List[Any], slide_count: int):
+        if not isinstance(edit_instructions, list):
+            edit_instructions = [edit_instructions]
+        self.edits = [self._compile(position, instruction, slide_count)
+                      for position, instruction in enumerate(edit_instructions)]
+
+    @property
+    def pending(self) -> List[PlannedEdit]:
+        return [edit for edit in self.edits if edit.status == "pending"]
+
+    @property
+    def succeeded(self) -> bool:
+        return all(edit.status == "applied" for edit in self.edits)
+
+    def by_slide(self) -> "OrderedDict[int, List[PlannedEdit]]":
+        """
+        Pending edits grouped by slide, slides in deck order, edits in instruction order
+        """
+        slides = OrderedDict()
+        for edit in sorted(self.pending, key=lambda e: e.slide_index):
+            slides.setdefault(edit.slide_index, []).append(edit)
+        return slides
+
+    def settle(self, status: str, from_statuses=("pending",)):
+        """
+        Move every edit in one of from_statuses to status, e.g. when a plan is abandoned
+        """
+        for edit in self.edits:
+            if edit.status in from_statuses:
+                edit.status = status
+
+    def outcomes(self) -> List[Dict[str, Any]]:
+        return [edit.to_dict() for edit in self.edits]
+
+    def _compile(self, position: int, instruction: Any, slide_count: int) -> PlannedEdit:
+        if not isinstance(instruction, dict):
+            return PlannedEdit(position, None, "", "", {}, "invalid", "Edit is not an object")
+
+        action = str(instruction.get("action") or "").strip().lower()
+        target_element = str(instruction.get("target_element") or "").strip().lower()
+        changes = instruction.get("changes") or {}
+        edit = PlannedEdit(position, None, action, target_element, {})
+
+        try:
+            slide_index = int(instruction.get("slide_index", 1)) - 1
+        except (TypeError, ValueError):
+            return self._reject(edit, f"Invalid slide index: {instruction.get('slide_index')!r}")
+        if slide_index < 0 or slide_index >= slide_count:
+            return self._reject(edit, f"Slide {slide_index + 1} does not exist (total slides: {slide_count})")
+        edit.slide_index = slide_index
+
+        if action not in EDIT_ACTIONS:
+            return self._reject(edit, f"Unknown action: {action!r}")
+        if action in UNSUPPORTED_ACTIONS:
+            return self._reject(edit, f"{action} is not supported yet")
+        if not isinstance(changes, dict):
+            return self._reject(edit, "changes must be an object")
+
+        if action == "modify_content":
+            if target_element not in TEXT_ELEMENTS:
+                return self._reject(edit, f"modify_content cannot target {target_element!r}")
+            changes = dict(changes)
+            if "find" in changes:
+                if not isinstance(changes["find"], str) or not changes["find"].strip():
+                    return self._reject(edit, "find must be non-empty text")
+                replace = changes.get("replace")
+                if replace is None:
+                    return self._reject(edit, "find needs a replace value")
+                changes["replace"] = str(replace)
+            elif "new_content" not in changes and not (target_element == "bullets" and "add_bullet" in changes):
+                return self._reject(edit, "modify_content needs find/replace or new_content")
+        elif target_element not in TARGET_ELEMENTS:
+            return self._reject(edit, f"Unknown target element: {target_element!r}")
+
+        edit.changes = changes
+        return edit
+
+    def _reject(self, edit: PlannedEdit, detail: str) -> PlannedEdit:
+        edit.status = "invalid"
+        edit.detail = detail
+        return edit
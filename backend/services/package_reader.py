@@ -0,0 +1,165 @@
+import hashlib
+import posixpath
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional
+from lxml import etree
+
+NS = {
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "c": "http://schemas.openxmlformats.org/drawingml/2006/chart",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+RT_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+RT_SLIDE_LAYOUT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+
+# Relationships that never change how a slide renders
+NON_RENDERING_RELTYPES = {
+    RT_SLIDE,
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide",
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesMaster",
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/handoutMaster",
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/comments",
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/tags",
+}
+
+
+class PackageReader:
+    """
+    Read-only access to the parts of a .pptx package straight from the zip
+    """
+
+    def __init__(self, pptx_path: str):
+        self.pptx_path = pptx_path
+        self.zip = zipfile.ZipFile(pptx_path)
+        self._entries = {info.filename: info for info in self.zip.infolist()}
+        self._rels_cache = {}
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_part(self, partname: str) -> bool:
+        return partname in self._entries
+
+    def read(self, partname: str) -> bytes:
+        return self.zip.read(partname)
+
+    def open(self, partname: str):
+        """
+        File-like access that decompresses the part as it is read
+        """
+        return self.zip.open(partname)
+
+    def read_xml(self, partname: str):
+        return etree.fromstring(self.read(partname))
+
+    def rels(self, partname: str) -> List[Dict[str, str]]:
+        """
+        Relationships of a part with targets resolved to absolute part names
+        """
+        if partname in self._rels_cache:
+            return self._rels_cache[partname]
+
+        directory = posixpath.dirname(partname)
+        rels_partname = self._rels_partname(partname)
+        rels = []
+        if self.has_part(rels_partname):
+            for rel in self.read_xml(rels_partname).findall("rel:Relationship", NS):
+                external = rel.get("TargetMode") == "External"
+                target = rel.get("Target")
+                if not external:
+                    target = posixpath.normpath(posixpath.join(directory, target)).lstrip("/")
+                rels.append({
+                    "id": rel.get("Id"),
+                    "type": rel.get("Type"),
+                    "target": target,
+                    "external": external,
+                })
+        self._rels_cache[partname] = rels
+        return rels
+
+    def _rels_partname(self, partname: str) -> str:
+        directory, filename = posixpath.split(partname)
+        return posixpath.join(directory, "_rels", f"{filename}.rels")
+
+    def slide_partnames(self) -> List[str]:
+        """
+        Slide part names in presentation order
+        """
+        targets = {rel["id"]: rel["target"] for rel in self.rels("ppt/presentation.xml")}
+        presentation = self.read_xml("ppt/presentation.xml")
+        return [
+            targets[sld_id.get(f"{{{NS['r']}}}id")]
+            for sld_id in presentation.findall("p:sldIdLst/p:sldId", NS)
+        ]
+
+    def slide_fingerprints(self) -> List[Dict[str, Any]]:
+        """
+        Stable fingerprint per slide covering its XML and everything it renders from
+        (layout, master, theme, media, charts). Dependencies are identified by the CRC32
+        and size recorded in the zip directory, so media is never decompressed.
+        """
+        return list(self.iter_slide_fingerprints())
+
+    def iter_slide_fingerprints(self) -> Iterator[Dict[str, Any]]:
+        """
+        slide_fingerprints one slide at a time, in presentation order
+        """
+        presentation = self.read_xml("ppt/presentation.xml")
+        slide_size = presentation.find("p:sldSz", NS)
+        deck_context = etree.tostring(slide_size) if slide_size is not None else b""
+
+        for index, partname in enumerate(self.slide_partnames()):
+            slide_xml = self.read(partname)
+            root = etree.fromstring(slide_xml)
+
+            digest = hashlib.sha256()
+            digest.update(deck_context)
+            digest.update(slide_xml)
+            dependencies = sorted(self._render_dependencies(partname))
+            for dependency in [partname] + dependencies:
+                # Relationship parts map rIds to targets, so they count as well
+                for entry in (dependency, self._rels_partname(dependency)):
+                    info = self._entries.get(entry)
+                    if info is not None:
+                        digest.update(f"{entry}:{info.CRC}:{info.file_size}".encode("utf-8"))
+
+            # Slide number fields render differently at another position
+            if root.find(".//a:fld[@type='slidenum']", NS) is not None:
+                digest.update(f"position:{index}".encode("utf-8"))
+
+            yield {
+                "index": index,
+                "partname": partname,
+                "fingerprint": digest.hexdigest(),
+                "hidden": root.get("show") == "0",
+            }
+
+    def _render_dependencies(self, partname: str, seen: Optional[set] = None) -> List[str]:
+        """
+        All package parts reachable from a slide that can affect how it renders
+        """
+        seen = seen if seen is not None else {partname}
+        dependencies = []
+        is_master = partname.startswith("ppt/slideMasters/")
+        for rel in self.rels(partname):
+            if rel["external"] or rel["type"] in NON_RENDERING_RELTYPES:
+                continue
+            # A master lists every layout, but a slide only renders through its own
+            if is_master and rel["type"] == RT_SLIDE_LAYOUT:
+                continue
+            target = rel["target"]
+            if target in seen or not self.has_part(target):
+                continue
+            seen.add(target)
+            dependencies.append(target)
+            dependencies.extend(self._render_dependencies(target, seen))
+        return dependencies
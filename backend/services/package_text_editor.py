@@ -0,0 +1,53 @@
+from typing import Dict, List
+from pptx.oxml import parse_xml
+from pptx.opc.oxml import serialize_part_xml
+from pptx.shapes.shapetree import SlideShapes
+from services.package_reader import PackageReader
+from services.package_writer import PackageWriter
+from services.text_index import DeckTextIndex
+
+
+class XmlSlide:
+    """
+    A slide parsed from its XML part alone, with python-pptx shapes over it. Enough
+    for reading and rewriting text; anything needing the package (media, charts,
+    layouts) must go through a full Presentation.
+    """
+
+    def __init__(self, partname: str, blob: bytes):
+        self.partname = partname
+        self._element = parse_xml(blob)
+        self.shapes = SlideShapes(self._element.cSld.spTree, self)
+        self.part = None
+
+    @property
+    def blob(self) -> bytes:
+        return serialize_part_xml(self._element)
+
+
+class PackageTextEditor:
+    """
+    Text edits straight on a deck's slide XML. Only the slide parts are parsed, and
+    on save just the slides that changed are serialized again while every other
+    entry is copied raw, so media is neither loaded nor recompressed.
+    """
+
+    def __init__(self, pptx_path: str):
+        self.pptx_path = pptx_path
+        with PackageReader(pptx_path) as reader:
+            self.slides = [XmlSlide(partname, reader.read(partname)) for partname in reader.slide_partnames()]
+        self._text_index = None
+
+    def text_index(self) -> DeckTextIndex:
+        """Text index over the slides, also valid for the deck parsed by python-pptx"""
+        if self._text_index is None:
+            self._text_index = DeckTextIndex(self)
+        return self._text_index
+
+    def save(self, output_path: str, slide_indices: List[int], deterministic: bool = False) -> Dict[str, int]:
+        """
+        Write the deck with the given slides re-serialized and everything else copied
+        """
+        replacements = {self.slides[index].partname: self.slides[index].blob for index in slide_indices}
+        with PackageWriter(output_path, deterministic=deterministic) as writer:
+            return writer.copy_package(self.pptx_path, replacements)
@@ -0,0 +1,246 @@
+import io
+import os
+import re
+import struct
+import time
+import zipfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+
+# Local file header: signature, versions, flags, method, time, date, CRC, sizes, name and extra lengths
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+DATA_DESCRIPTOR_FLAG = 0x08
+
+# Zip timestamp of every entry in deterministic packages (the earliest a zip can hold)
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+FIXED_W3CDTF = b"1980-01-01T00:00:00Z"
+CORE_DATE_PATTERN = re.compile(rb"(<dcterms:(?:created|modified)\b[^>]*>)[^<]*")
+
+# Media that is already compressed; deflating it again costs time and saves nothing
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp",
+    ".mp4", ".m4v", ".mov", ".webm", ".mp3", ".m4a", ".wma", ".wmv",
+}
+
+
+class PackageWriter:
+    """
+    Writes a .pptx package entry by entry. Entries copied from another package keep
+    their compressed bytes, which are streamed across without being inflated or
+    deflated again, so only new or modified parts cost any compression time.
+
+    With workers, new and modified parts are deflated in a thread pool (zlib releases
+    the GIL while it compresses). Entries are queued and written in the order they
+    were added either way, so the archive layout does not depend on the pool.
+    Already compressed media is stored as is.
+
+    A deterministic writer gives every entry the same fixed timestamp and writes
+    presentation parts sorted by name, so equal content always yields equal bytes.
+    """
+
+    def __init__(self, output_path: str, compresslevel: Optional[int] = None, workers: int = 0,
+                 deterministic: bool = False):
+        self.output_path = output_path
+        self.deterministic = deterministic
+        self.zip = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED)
+        self.compresslevel = zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+        self.chunk_size = 1024 * 1024
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="package-deflate") if workers > 1 else None
+        self._queue = []  # (ZipInfo, compressed bytes / future, or a source file to copy from), in write order
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+            self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None:
+            self._queue = []  # source files of queued copies may already be closed
+        self.close()
+
+    def write(self, name: str, data: bytes, source_info: Optional[zipfile.ZipInfo] = None):
+        """
+        Queue a new or modified part. source_info keeps the entry's metadata
+        (timestamp, attributes) from the package it replaces.
+        """
+        info = zipfile.ZipInfo(name, self._date_time(source_info))
+        if source_info is not None:
+            info.external_attr = source_info.external_attr
+            info.create_system = source_info.create_system
+        if os.path.splitext(name)[1].lower() in STORED_EXTENSIONS:
+            info.compress_type = zipfile.ZIP_STORED
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+
+        if self._pool is not None:
+            self._queue.append((info, self._pool.submit(self._compress, info, data)))
+        else:
+            self._queue.append((info, self._compress(info, data)))
+
+    def copy_raw(self, source_file, source_info: zipfile.ZipInfo):
+        """
+        Queue an entry of another zip to be copied as stored. source_file is a binary
+        file opened on that zip, and must stay open until the writer is flushed.
+        """
+        self._queue.append((source_info, source_file))
+
+    def flush(self):
+        """
+        Write every queued entry, in order
+        """
+        queue, self._queue = self._queue, []
+        for info, payload in queue:
+            if isinstance(payload, bytes):
+                self._write_entry(info, payload)
+            elif isinstance(payload, Future):
+                self._write_entry(info, payload.result())
+            else:
+                self._write_raw(payload, info)
+
+    def _compress(self, info: zipfile.ZipInfo, data: bytes) -> bytes:
+        info.file_size = len(data)
+        info.CRC = zlib.crc32(data)
+        if info.compress_type == zipfile.ZIP_STORED:
+            compressed = data
+        else:
+            compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+            compressed = compressor.compress(data) + compressor.flush()
+        info.compress_size = len(compressed)
+        return compressed
+
+    def _write_entry(self, info: zipfile.ZipInfo, compressed: bytes):
+        target = self.zip.fp
+        info.header_offset = target.tell()
+        target.write(info.FileHeader())
+        target.write(compressed)
+        self._register(info)
+
+    def _write_raw(self, source_file, source_info: zipfile.ZipInfo):
+        """
+        Rebuild an entry's local header and stream its compressed bytes from source_file
+        """
+        source_file.seek(source_info.header_offset)
+        header = LOCAL_HEADER.unpack(source_file.read(LOCAL_HEADER.size))
+        source_file.seek(header[-2] + header[-1], 1)  # skip the local name and extra field
+
+        info = zipfile.ZipInfo(source_info.filename, self._date_time(source_info))
+        info.compress_type = source_info.compress_type
+        # Sizes and CRC go into the local header, so no data descriptor follows the data
+        info.flag_bits = source_info.flag_bits & ~DATA_DESCRIPTOR_FLAG
+        info.CRC = source_info.CRC
+        info.compress_size = source_info.compress_size
+        info.file_size = source_info.file_size
+        info.external_attr = source_info.external_attr
+        info.create_system = source_info.create_system
+
+        target = self.zip.fp
+        info.header_offset = target.tell()
+        target.write(info.FileHeader())
+        remaining = source_info.compress_size
+        while remaining:
+            chunk = source_file.read(min(self.chunk_size, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated entry in source package: {source_info.filename}")
+            target.write(chunk)
+            remaining -= len(chunk)
+        self._register(info)
+
+    def _date_time(self, source_info: Optional[zipfile.ZipInfo]):
+        if self.deterministic:
+            return FIXED_DATE_TIME
+        return source_info.date_time if source_info is not None else time.localtime()[:6]
+
+    def _register(self, info: zipfile.ZipInfo):
+        # ZipFile writes the central directory from its file list on close
+        self.zip.filelist.append(info)
+        self.zip.NameToInfo[info.filename] = info
+        self.zip.start_dir = self.zip.fp.tell()
+        self.zip._didModify = True
+
+    def copy_package(self, source_path: str, replacements: Optional[Dict[str, bytes]] = None) -> Dict[str, int]:
+        """
+        Copy every entry of a package in its original order, raw, except the parts in
+        replacements, which are written with their new content. Returns entry counts.
+        """
+        replacements = replacements or {}
+        copied = rewritten = 0
+        with zipfile.ZipFile(source_path) as source_zip, open(source_path, "rb") as source_file:
+            for info in source_zip.infolist():
+                if info.filename in replacements:
+                    self.write(info.filename, replacements[info.filename], info)
+                    rewritten += 1
+                else:
+                    self.copy_raw(source_file, info)
+                    copied += 1
+            self.flush()
+        return {"copied": copied, "rewritten": rewritten}
+
+    def write_presentation(self, prs, source_path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Save a python-pptx presentation the way prs.save() lays it out. Parts whose
+        bytes are unchanged from source_path (same size and CRC32 as the entry there)
+        are copied raw from it; only modified and new parts are compressed.
+        Returns entry counts.
+        """
+        package = prs.part.package
+        parts = list(package.iter_parts())
+        if self.deterministic:
+            parts.sort(key=lambda part: str(part.partname))
+        counts = {"copied": 0, "rewritten": 0}
+
+        source_zip = source_file = None
+        if source_path and os.path.exists(source_path):
+            source_zip = zipfile.ZipFile(source_path)
+            source_file = open(source_path, "rb")
+        try:
+            entries = {info.filename: info for info in source_zip.infolist()} if source_zip else {}
+
+            def put(name: str, blob: bytes):
+                info = entries.get(name)
+                if info is not None and info.file_size == len(blob) and info.CRC == zlib.crc32(blob):
+                    self.copy_raw(source_file, info)
+                    counts["copied"] += 1
+                else:
+                    self.write(name, blob, info)
+                    counts["rewritten"] += 1
+
+            put(CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+            put(PACKAGE_URI.rels_uri.membername, package._rels.xml)
+            for part in parts:
+                put(part.partname.membername, part.blob)
+                if part._rels:
+                    put(part.partname.rels_uri.membername, part.rels.xml)
+            self.flush()
+        finally:
+            if source_zip is not None:
+                source_zip.close()
+                source_file.close()
+        return counts
+
+
+def deterministic_package_blob(blob: bytes) -> bytes:
+    """
+    Rewrite an embedded OPC package (e.g. a chart's Excel workbook) with fixed zip
+    timestamps and fixed created/modified core properties
+    """
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(blob)) as source, zipfile.ZipFile(output, "w") as target:
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename == "docProps/core.xml":
+                data = CORE_DATE_PATTERN.sub(lambda match: match.group(1) + FIXED_W3CDTF, data)
+            entry = zipfile.ZipInfo(info.filename, FIXED_DATE_TIME)
+            entry.compress_type = info.compress_type
+            entry.external_attr = info.external_attr
+            target.writestr(entry, data)
+    return output.getvalue()
@@ -1,30 +1,89 @@
 import os
+import asyncio
+import hashlib
+import json
+import shutil
 import subprocess
 import platform
-from typing import Optional
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from lxml import etree
+
+from services.package_reader import PackageReader
+from services.artifact_store import ArtifactStore
+
+# Named PDF export profiles. image_dpi downsamples images above that resolution,
+# jpeg_quality applies to re-encoded images and pdf_a selects PDF/A-1b output.
+PDF_EXPORT_PROFILES = {
+    "default": {},
+    "screen": {"image_dpi": 150, "jpeg_quality": 70, "embed_fonts": False},
+    "print": {"image_dpi": 300, "jpeg_quality": 90, "embed_fonts": True},
+    "archive": {"lossless_images": True, "embed_fonts": True, "pdf_a": True},
+}
 
 class PDFService:
-    def __init__(self):
+    def __init__(self, max_concurrent_conversions: Optional[int] = None, artifact_store: Optional[ArtifactStore] = None):
         self.output_dir = "outputs"
         os.makedirs(self.output_dir, exist_ok=True)
+        # PDFs without an explicit output path are saved as artifacts
+        self.artifact_store = artifact_store or ArtifactStore()
+        
+        # Number of LibreOffice processes allowed to run at the same time
+        if max_concurrent_conversions is None:
+            max_concurrent_conversions = int(os.getenv("PDF_CONVERSION_CONCURRENCY", "2"))
+        self.max_concurrent_conversions = max(1, max_concurrent_conversions)
+        self.conversion_timeout = int(os.getenv("PDF_CONVERSION_TIMEOUT", "60"))
+        # Maximum number of decks handed to a single LibreOffice invocation
+        self.batch_size = max(1, int(os.getenv("PDF_BATCH_SIZE", "10")))
+        
+        # Conversion queue: each slot owns its own LibreOffice profile directory,
+        # since two soffice processes cannot share a user installation
+        self._conversion_slots = None
+        
+        # Content-addressed cache of converted PDFs with LRU eviction
+        self.cache_dir = os.path.join(self.output_dir, "pdf_cache")
+        self.cache_max_bytes = int(os.getenv("PDF_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+        self._cache_index = OrderedDict()  # cache key -> size in bytes
+        self._cache_lock = threading.Lock()
+        self._load_cache_index()
+        
+        # Per-profile conversion metrics
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
     
-    def convert_to_pdf(self, pptx_path: str, output_path: Optional[str] = None) -> str:
+    def convert_to_pdf(self, pptx_path: str, output_path: Optional[str] = None, profile: str = "default") -> str:
         """
         Convert a PowerPoint file to PDF
         """
         if not output_path:
-            # Generate PDF filename
             base_name = os.path.splitext(os.path.basename(pptx_path))[0]
-            output_path = os.path.join(self.output_dir, f"{base_name}.pdf")
+            output_path = self.artifact_store.allocate(f"{base_name}.pdf")
         
+        options = self._export_options(profile)
         try:
+            # Serve repeated conversions of the same deck from the cache
+            cache_key = self._cache_key(pptx_path, options)
+            if self._cache_lookup(cache_key, output_path):
+                self._record_cache_hit(profile)
+                return output_path
+            
+            started = time.perf_counter()
+            
             # Try LibreOffice first (cross-platform)
-            if self._convert_with_libreoffice(pptx_path, output_path):
+            if self._convert_with_libreoffice(pptx_path, output_path, options):
+                self._record_conversion(profile, time.perf_counter() - started, output_path)
+                self._cache_store(cache_key, output_path)
                 return output_path
             
             # Fallback to platform-specific methods
             if platform.system() == "Windows":
                 if self._convert_with_windows_com(pptx_path, output_path):
+                    self._record_conversion(profile, time.perf_counter() - started, output_path)
+                    self._cache_store(cache_key, output_path)
                     return output_path
             
             # If all methods fail, raise an exception
@@ -35,7 +94,543 @@ class PDFService:
             # Return the original PPTX path as fallback
             return pptx_path
     
-    def _convert_with_libreoffice(self, pptx_path: str, output_path: str) -> bool:
+    async def convert_to_pdf_async(self, pptx_path: str, output_path: Optional[str] = None, profile: str = "default") -> str:
+        """
+        Convert a PowerPoint file to PDF without blocking the event loop.
+        Conversions wait in a queue and at most max_concurrent_conversions run at once.
+        """
+        if not output_path:
+            base_name = os.path.splitext(os.path.basename(pptx_path))[0]
+            output_path = self.artifact_store.allocate(f"{base_name}.pdf")
+        
+        options = self._export_options(profile)
+        try:
+            loop = asyncio.get_running_loop()
+            
+            # Hashing a large deck is disk-bound, keep it off the event loop
+            cache_key = await loop.run_in_executor(None, self._cache_key, pptx_path, options)
+            if await loop.run_in_executor(None, self._cache_lookup, cache_key, output_path):
+                self._record_cache_hit(profile)
+                return output_path
+            
+            started = time.perf_counter()
+            
+            if await self._convert_with_libreoffice_async(pptx_path, output_path, options):
+                self._record_conversion(profile, time.perf_counter() - started, output_path)
+                await loop.run_in_executor(None, self._cache_store, cache_key, output_path)
+                return output_path
+            
+            if platform.system() == "Windows":
+                if await loop.run_in_executor(None, self._convert_with_windows_com, pptx_path, output_path):
+                    self._record_conversion(profile, time.perf_counter() - started, output_path)
+                    await loop.run_in_executor(None, self._cache_store, cache_key, output_path)
+                    return output_path
+            
+            raise Exception("No PDF conversion method available")
+            
+        except Exception as e:
+            print(f"PDF conversion failed: {e}")
+            # Return the original PPTX path as fallback
+            return pptx_path
+    
+    async def convert_to_pdf_incremental(self, pptx_path: str, output_path: Optional[str] = None, profile: str = "default") -> str:
+        """
+        Convert a PowerPoint file to PDF re-rendering only the slides that changed.
+        Every rendered slide is cached as a one-page PDF keyed by its fingerprint
+        (slide XML plus layout, master and media); slides whose fingerprint is already
+        cached are reused and the pages are spliced into the final document.
+        """
+        if not output_path:
+            base_name = os.path.splitext(os.path.basename(pptx_path))[0]
+            output_path = self.artifact_store.allocate(f"{base_name}.pdf")
+        
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            # Page splicing needs pypdf, fall back to converting the whole deck
+            return await self.convert_to_pdf_async(pptx_path, output_path, profile)
+        
+        loop = asyncio.get_running_loop()
+        options = self._export_options(profile)
+        try:
+            cache_key = await loop.run_in_executor(None, self._cache_key, pptx_path, options)
+            if await loop.run_in_executor(None, self._cache_lookup, cache_key, output_path):
+                self._record_cache_hit(profile)
+                return output_path
+            
+            started = time.perf_counter()
+            
+            fingerprints = await loop.run_in_executor(None, self._slide_fingerprints, pptx_path)
+            # Hidden slides are not exported, so they have no page
+            visible = [fp for fp in fingerprints if not fp["hidden"]]
+            stale = [fp for fp in visible if self._cache_touch(self._page_cache_key(fp, options)) is None]
+            
+            if stale and len(stale) < len(visible):
+                print(f"Re-rendering {len(stale)} of {len(visible)} slides")
+                if not await self._render_slides(pptx_path, stale, options):
+                    stale = visible
+            
+            if not visible or len(stale) == len(visible):
+                # Nothing to reuse: convert everything and seed the page cache
+                pdf_path = await self.convert_to_pdf_async(pptx_path, output_path, profile)
+                if pdf_path == output_path and visible:
+                    await loop.run_in_executor(None, self._store_pages, output_path, visible, options)
+                return pdf_path
+            
+            await loop.run_in_executor(None, self._splice_pages, visible, options, output_path)
+            self._record_conversion(profile, time.perf_counter() - started, output_path)
+            await loop.run_in_executor(None, self._cache_store, cache_key, output_path)
+            return output_path
+            
+        except Exception as e:
+            print(f"Incremental PDF conversion failed, converting whole deck: {e}")
+            return await self.convert_to_pdf_async(pptx_path, output_path, profile)
+    
+    def _slide_fingerprints(self, pptx_path: str) -> List[Dict[str, Any]]:
+        with PackageReader(pptx_path) as reader:
+            return reader.slide_fingerprints()
+    
+    def _page_cache_key(self, fingerprint: Dict[str, Any], options: Dict[str, Any]) -> str:
+        digest = hashlib.sha256(fingerprint["fingerprint"].encode("utf-8"))
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return f"page_{digest.hexdigest()}"
+    
+    async def _render_slides(self, pptx_path: str, slides: List[Dict[str, Any]], options: Dict[str, Any]) -> bool:
+        """
+        Render only the given slides in one LibreOffice run and add their pages to the cache
+        """
+        loop = asyncio.get_running_loop()
+        work_dir = tempfile.mkdtemp(prefix="pdf_slides_")
+        try:
+            subset_path = os.path.join(work_dir, os.path.basename(pptx_path))
+            render = {fp["partname"] for fp in slides}
+            await loop.run_in_executor(None, self._write_render_subset, pptx_path, subset_path, render)
+            
+            if not await self._run_libreoffice_async([subset_path], work_dir, options):
+                return False
+            
+            generated_pdf = os.path.splitext(subset_path)[0] + ".pdf"
+            if not os.path.exists(generated_pdf):
+                return False
+            return await loop.run_in_executor(None, self._store_pages, generated_pdf, slides, options)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def _write_render_subset(self, pptx_path: str, subset_path: str, render: set):
+        """
+        Copy the deck with every slide outside `render` marked hidden. Hidden slides are
+        skipped by the PDF export but still counted, so slide numbers stay correct.
+        """
+        with PackageReader(pptx_path) as reader:
+            slide_partnames = set(reader.slide_partnames())
+        
+        with zipfile.ZipFile(pptx_path) as source, zipfile.ZipFile(subset_path, "w", zipfile.ZIP_DEFLATED) as target:
+            for info in source.infolist():
+                data = source.read(info.filename)
+                if info.filename in slide_partnames and info.filename not in render:
+                    root = etree.fromstring(data)
+                    root.set("show", "0")
+                    data = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+                target.writestr(info, data)
+    
+    def _store_pages(self, pdf_path: str, slides: List[Dict[str, Any]], options: Dict[str, Any]) -> bool:
+        """
+        Split a rendered PDF into one cached page per slide; False if pages and slides do not line up
+        """
+        from pypdf import PdfReader, PdfWriter
+        
+        reader = PdfReader(pdf_path)
+        if len(reader.pages) != len(slides):
+            print(f"Rendered {len(reader.pages)} pages for {len(slides)} slides, not caching pages")
+            return False
+        
+        for page, fingerprint in zip(reader.pages, slides):
+            writer = PdfWriter()
+            writer.add_page(page)
+            fd, page_path = tempfile.mkstemp(suffix=".pdf")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    writer.write(f)
+                self._cache_store(self._page_cache_key(fingerprint, options), page_path)
+            finally:
+                os.unlink(page_path)
+        return True
+    
+    def _splice_pages(self, slides: List[Dict[str, Any]], options: Dict[str, Any], output_path: str):
+        """
+        Assemble the document from cached pages in slide order
+        """
+        from pypdf import PdfWriter
+        
+        writer = PdfWriter()
+        for fingerprint in slides:
+            page_path = self._cache_touch(self._page_cache_key(fingerprint, options))
+            if page_path is None:
+                raise Exception(f"Page for slide {fingerprint['index'] + 1} was evicted from the cache")
+            writer.append(page_path)
+        
+        temp_path = f"{output_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            writer.write(f)
+        os.replace(temp_path, output_path)
+    
+    async def convert_many(self, pptx_paths: List[str], output_dir: Optional[str] = None, profile: str = "default") -> List[Dict[str, Any]]:
+        """
+        Convert several PowerPoint files to PDF with as few LibreOffice invocations as possible.
+        Returns one result per input, in input order:
+        {"input": ..., "pdf_path": ... or None, "error": ... or None, "cached": bool}
+        """
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        options = self._export_options(profile)
+        
+        results = []
+        used_names = set()
+        for pptx_path in pptx_paths:
+            # Keep output names unique even when inputs share a basename
+            stem = os.path.splitext(os.path.basename(pptx_path))[0]
+            name = f"{stem}.pdf"
+            counter = 1
+            while name in used_names:
+                name = f"{stem}_{counter}.pdf"
+                counter += 1
+            used_names.add(name)
+            results.append({
+                "input": pptx_path,
+                "pdf_path": None,
+                "error": None,
+                "cached": False,
+                "_output_path": os.path.join(output_dir, name),
+                "_cache_key": None
+            })
+        
+        # Serve cache hits first
+        pending = []
+        for result in results:
+            try:
+                result["_cache_key"] = await loop.run_in_executor(None, self._cache_key, result["input"], options)
+                if await loop.run_in_executor(None, self._cache_lookup, result["_cache_key"], result["_output_path"]):
+                    self._record_cache_hit(profile)
+                    result["pdf_path"] = result["_output_path"]
+                    result["cached"] = True
+                else:
+                    pending.append(result)
+            except Exception as e:
+                result["error"] = str(e)
+        
+        # Convert the misses in batches, all batches share the conversion queue
+        batches = self._plan_batches(pending)
+        print(f"Converting {len(pending)} decks in {len(batches)} LibreOffice batches")
+        await asyncio.gather(*[self._convert_batch(batch, profile, options) for batch in batches])
+        
+        # Retry stragglers of multi-file batches on their own, so one bad deck cannot fail its neighbours
+        retries = [r for batch in batches if len(batch) > 1 for r in batch if r["pdf_path"] is None]
+        if retries:
+            await asyncio.gather(*[self._convert_batch([r], profile, options) for r in retries])
+        
+        for result in results:
+            if result["pdf_path"] is None and platform.system() == "Windows":
+                if await loop.run_in_executor(None, self._convert_with_windows_com, result["input"], result["_output_path"]):
+                    result["pdf_path"] = result["_output_path"]
+            
+            if result["pdf_path"]:
+                result["error"] = None
+                if not result["cached"]:
+                    await loop.run_in_executor(None, self._cache_store, result["_cache_key"], result["pdf_path"])
+            elif not result["error"]:
+                result["error"] = "No PDF conversion method available"
+            
+            del result["_output_path"]
+            del result["_cache_key"]
+        
+        return results
+    
+    def _plan_batches(self, pending: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Split conversions into batches of at most batch_size with distinct input basenames,
+        since LibreOffice names every output after its input
+        """
+        batches = []
+        for result in pending:
+            stem = os.path.splitext(os.path.basename(result["input"]))[0]
+            for batch in batches:
+                if len(batch["items"]) < self.batch_size and stem not in batch["stems"]:
+                    break
+            else:
+                batch = {"items": [], "stems": set()}
+                batches.append(batch)
+            batch["items"].append(result)
+            batch["stems"].add(stem)
+        return [batch["items"] for batch in batches]
+    
+    async def _convert_batch(self, batch: List[Dict[str, Any]], profile: str, options: Dict[str, Any]):
+        """
+        Convert one batch with a single LibreOffice invocation and map outputs back to inputs
+        """
+        batch_dir = tempfile.mkdtemp(prefix="pdf_batch_")
+        try:
+            input_paths = [r["input"] for r in batch]
+            started = time.perf_counter()
+            succeeded = await self._run_libreoffice_async(
+                input_paths, batch_dir, options, timeout=self.conversion_timeout * len(input_paths)
+            )
+            # Attribute the shared run time evenly to the decks in the batch
+            seconds_per_deck = (time.perf_counter() - started) / len(input_paths)
+            
+            for result in batch:
+                generated_pdf = os.path.join(batch_dir,
+                    os.path.splitext(os.path.basename(result["input"]))[0] + ".pdf")
+                if os.path.exists(generated_pdf):
+                    shutil.move(generated_pdf, result["_output_path"])
+                    result["pdf_path"] = result["_output_path"]
+                    self._record_conversion(profile, seconds_per_deck, result["pdf_path"])
+                else:
+                    result["error"] = "LibreOffice did not produce a PDF" if succeeded else "LibreOffice conversion failed"
+        except Exception as e:
+            for result in batch:
+                if result["pdf_path"] is None:
+                    result["error"] = str(e)
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+    
+    def _export_options(self, profile: str = "default") -> Dict[str, Any]:
+        """
+        Options that influence the converted output and therefore the cache key
+        """
+        if profile not in PDF_EXPORT_PROFILES:
+            raise ValueError(f"Unknown PDF export profile: {profile}")
+        return {"filter": "pdf", "profile": profile, "settings": PDF_EXPORT_PROFILES[profile]}
+    
+    def _libreoffice_filter(self, options: Optional[Dict[str, Any]]) -> str:
+        """
+        Translate export options into a LibreOffice --convert-to argument
+        """
+        settings = (options or {}).get("settings") or {}
+        if not settings:
+            return "pdf"
+        
+        filter_data = {}
+        if "image_dpi" in settings:
+            filter_data["ReduceImageResolution"] = {"type": "boolean", "value": "true"}
+            filter_data["MaxImageResolution"] = {"type": "long", "value": str(settings["image_dpi"])}
+        if "jpeg_quality" in settings:
+            filter_data["UseLosslessCompression"] = {"type": "boolean", "value": "false"}
+            filter_data["Quality"] = {"type": "long", "value": str(settings["jpeg_quality"])}
+        if settings.get("lossless_images"):
+            filter_data["ReduceImageResolution"] = {"type": "boolean", "value": "false"}
+            filter_data["UseLosslessCompression"] = {"type": "boolean", "value": "true"}
+        if "embed_fonts" in settings:
+            filter_data["EmbedStandardFonts"] = {"type": "boolean", "value": "true" if settings["embed_fonts"] else "false"}
+        if settings.get("pdf_a"):
+            # 1 = PDF/A-1b
+            filter_data["SelectPdfVersion"] = {"type": "long", "value": "1"}
+        
+        return f"pdf:impress_pdf_Export:{json.dumps(filter_data, sort_keys=True)}"
+    
+    def _record_conversion(self, profile: str, seconds: float, pdf_path: str):
+        try:
+            size = os.path.getsize(pdf_path)
+        except OSError:
+            return
+        with self._metrics_lock:
+            metrics = self._profile_metrics(profile)
+            metrics["conversions"] += 1
+            metrics["total_seconds"] += seconds
+            metrics["total_bytes"] += size
+        print(f"PDF ({profile}): {size / 1024:.0f} KB in {seconds:.2f}s")
+    
+    def _record_cache_hit(self, profile: str):
+        with self._metrics_lock:
+            self._profile_metrics(profile)["cache_hits"] += 1
+    
+    def _profile_metrics(self, profile: str) -> Dict[str, Any]:
+        if profile not in self._metrics:
+            self._metrics[profile] = {"conversions": 0, "cache_hits": 0, "total_seconds": 0.0, "total_bytes": 0}
+        return self._metrics[profile]
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Output size and conversion time per export profile
+        """
+        with self._metrics_lock:
+            report = {}
+            for profile, metrics in self._metrics.items():
+                conversions = metrics["conversions"]
+                report[profile] = {
+                    **metrics,
+                    "avg_seconds": metrics["total_seconds"] / conversions if conversions else None,
+                    "avg_bytes": metrics["total_bytes"] // conversions if conversions else None
+                }
+            return report
+    
+    def _cache_key(self, pptx_path: str, options: Dict[str, Any]) -> str:
+        """
+        SHA-256 of the input deck plus the export options
+        """
+        digest = hashlib.sha256()
+        with open(pptx_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _cache_path(self, cache_key: str) -> str:
+        return os.path.join(self.cache_dir, f"{cache_key}.pdf")
+    
+    def _load_cache_index(self):
+        """
+        Rebuild the LRU index from the cache directory, oldest first
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pdf"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        
+        for _, cache_key, size in sorted(entries):
+            self._cache_index[cache_key] = size
+    
+    def _cache_touch(self, cache_key: str) -> Optional[str]:
+        """
+        Mark a cache entry as recently used and return its path, or None on a miss
+        """
+        with self._cache_lock:
+            if cache_key not in self._cache_index:
+                return None
+            cached_path = self._cache_path(cache_key)
+            if not os.path.exists(cached_path):
+                del self._cache_index[cache_key]
+                return None
+            self._cache_index.move_to_end(cache_key)
+            # mtime records recency so LRU order survives restarts
+            os.utime(cached_path)
+            return cached_path
+    
+    def _cache_lookup(self, cache_key: str, output_path: str) -> bool:
+        """
+        Copy a cached PDF to output_path; returns False on a cache miss
+        """
+        cached_path = self._cache_touch(cache_key)
+        if cached_path is None:
+            return False
+        
+        if os.path.abspath(cached_path) != os.path.abspath(output_path):
+            shutil.copyfile(cached_path, output_path)
+        print(f"PDF cache hit: {cache_key[:12]}")
+        return True
+    
+    def _cache_store(self, cache_key: str, pdf_path: str):
+        """
+        Add a freshly converted PDF to the cache and evict least recently used entries
+        """
+        try:
+            size = os.path.getsize(pdf_path)
+            if size > self.cache_max_bytes:
+                return
+            
+            cached_path = self._cache_path(cache_key)
+            temp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+            shutil.copyfile(pdf_path, temp_path)
+            os.replace(temp_path, cached_path)
+            
+            with self._cache_lock:
+                self._cache_index[cache_key] = size
+                self._cache_index.move_to_end(cache_key)
+                self._evict_cache()
+        except Exception as e:
+            print(f"Could not cache PDF: {e}")
+    
+    def _evict_cache(self):
+        """
+        Drop least recently used PDFs until the cache fits its size budget
+        """
+        total = sum(self._cache_index.values())
+        while total > self.cache_max_bytes and self._cache_index:
+            cache_key, size = self._cache_index.popitem(last=False)
+            total -= size
+            try:
+                os.unlink(self._cache_path(cache_key))
+            except OSError:
+                pass
+    
+    def _get_conversion_slots(self) -> asyncio.Queue:
+        """
+        Lazily create the conversion queue (it must be created inside the running loop)
+        """
+        if self._conversion_slots is None:
+            self._conversion_slots = asyncio.Queue()
+            for slot in range(self.max_concurrent_conversions):
+                self._conversion_slots.put_nowait(slot)
+        return self._conversion_slots
+    
+    def _libreoffice_command(self, input_paths: List[str], output_dir: str, options: Optional[Dict[str, Any]] = None, slot: Optional[int] = None) -> List[str]:
+        """
+        Build the LibreOffice headless command line
+        """
+        cmd = ["libreoffice"]
+        if slot is not None:
+            profile_dir = os.path.join(tempfile.gettempdir(), f"ppt_lo_profile_{slot}")
+            cmd.append(f"-env:UserInstallation=file://{os.path.abspath(profile_dir)}")
+        cmd += [
+            "--headless",
+            "--convert-to", self._libreoffice_filter(options),
+            "--outdir", output_dir,
+        ]
+        cmd += input_paths
+        return cmd
+    
+    async def _run_libreoffice_async(self, input_paths: List[str], output_dir: str, options: Optional[Dict[str, Any]] = None, timeout: Optional[int] = None) -> bool:
+        """
+        Run one LibreOffice invocation once a conversion slot is free
+        """
+        timeout = timeout or self.conversion_timeout
+        slots = self._get_conversion_slots()
+        slot = await slots.get()
+        try:
+            cmd = self._libreoffice_command(input_paths, output_dir, options, slot)
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                await asyncio.wait_for(process.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                print(f"LibreOffice timed out after {timeout}s")
+                return False
+            return process.returncode == 0
+        finally:
+            slots.put_nowait(slot)
+    
+    async def _convert_with_libreoffice_async(self, pptx_path: str, output_path: str, options: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Convert using LibreOffice headless mode through the conversion queue
+        """
+        try:
+            output_dir = os.path.dirname(output_path) or "."
+            
+            if not await self._run_libreoffice_async([pptx_path], output_dir, options):
+                return False
+            
+            # LibreOffice creates PDF with same name as input file
+            generated_pdf = os.path.join(output_dir,
+                os.path.splitext(os.path.basename(pptx_path))[0] + ".pdf")
+            
+            # Rename to desired output path if different
+            if generated_pdf != output_path and os.path.exists(generated_pdf):
+                os.replace(generated_pdf, output_path)
+            
+            return os.path.exists(output_path)
+            
+        except (FileNotFoundError, Exception):
+            return False
+    
+    def _convert_with_libreoffice(self, pptx_path: str, output_path: str, options: Optional[Dict[str, Any]] = None) -> bool:
         """
         Convert using LibreOffice headless mode
         """
@@ -44,16 +639,10 @@ class PDFService:
             output_dir = os.path.dirname(output_path)
             
             # LibreOffice command
-            cmd = [
-                "libreoffice",
-                "--headless",
-                "--convert-to", "pdf",
-                "--outdir", output_dir,
-                pptx_path
-            ]
+            cmd = self._libreoffice_command([pptx_path], output_dir, options)
             
             # Run conversion
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.conversion_timeout)
             
             if result.returncode == 0:
                 # LibreOffice creates PDF with same name as input file
@@ -5,19 +5,126 @@ from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.enum.chart import XL_CHART_TYPE
 from pptx.chart.data import CategoryChartData
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+from pptx.parts.chart import ChartPart
+from pptx.parts.embeddedpackage import EmbeddedXlsxPart
+from pptx.parts.image import Image, ImagePart
 import os
+import json
+import copy
 import uuid
-from typing import Dict, Any, List, Optional
+import weakref
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import tempfile
 import shutil
+from lxml import etree
+from services.slide_xml_extractor import SlideXmlExtractor
+from services.slide_model import ChartRecord, FontInfo, ShapeRecord, SlideRecord, deep_sizeof
+from services.artifact_store import ArtifactStore
+from services.text_index import DeckTextIndex, ShapeText, TextMatch
+from services.edit_plan import EditPlan, EditPlanError, PlannedEdit
+from services.package_text_editor import PackageTextEditor
+from services.package_writer import PackageWriter, deterministic_package_blob
+
+# Core-properties timestamp of deterministic output
+DETERMINISTIC_TIMESTAMP = datetime(1980, 1, 1)
+# Attributes holding relationship IDs (r:id, r:embed, r:link, ...) start with this
+RELATIONSHIP_ATTRIBUTE_PREFIX = qn("r:id")[:-2]
 
 class PPTService:
-    def __init__(self):
+    def __init__(self, artifact_store: Optional[ArtifactStore] = None):
         self.output_dir = "outputs"
         os.makedirs(self.output_dir, exist_ok=True)
+        # Generated and edited decks are saved as artifacts unless an output_dir is given
+        self.artifact_store = artifact_store or ArtifactStore()
+
+        # Fuzzy find matches below this confidence are not applied, and go back to the model
+        self.fuzzy_match_threshold = float(os.getenv("FUZZY_MATCH_THRESHOLD", "0.8"))
         self.template_assets = {}  # Store extracted template assets
 
+        # Saves copy unchanged parts raw from the file a presentation was loaded from
+        self.incremental_save = os.getenv("PPT_INCREMENTAL_SAVE", "true").lower() not in ("0", "false", "no")
+        self._presentation_sources = weakref.WeakKeyDictionary()  # presentation part -> file it matches
+        # Threads deflating new and modified parts on save (0 or 1 compresses serially)
+        self.save_workers = int(os.getenv("PPT_SAVE_WORKERS", str(min(4, os.cpu_count() or 1))))
+        # Byte-identical output for identical input: fixed timestamps and part order
+        self.deterministic_output = os.getenv("PPT_DETERMINISTIC_OUTPUT", "false").lower() in ("1", "true", "yes")
+
+        # Extraction results keyed by file content hash, least recently used first
+        self.extraction_cache_size = int(os.getenv("EXTRACTION_CACHE_SIZE", "32"))
+        self._extraction_cache = OrderedDict()
+        self._extraction_lock = threading.Lock()
+
+        # Per-slide models and AI context keyed by slide fingerprint, so a re-uploaded
+        # deck only re-parses the slides that changed
+        self.slide_cache_size = int(os.getenv("SLIDE_CACHE_SIZE", "5000"))
+        self._slide_cache = OrderedDict()
+        self._slide_context_cache = OrderedDict()
+
+        # Rendered slides keyed by template, slide content and logo settings, so re-rendering
+        # an edited structure only rebuilds the slides that changed (0 disables)
+        self.render_cache_size = int(os.getenv("RENDER_CACHE_SIZE", "500"))
+        self._render_cache = OrderedDict()
+        self._render_lock = threading.Lock()
+        self._render_stats = {"hits": 0, "misses": 0}
+
+    def _load_presentation(self, source):
+        """
+        Accept either a path to a .pptx file or an already parsed presentation
+        """
+        if isinstance(source, (str, os.PathLike)):
+            return self._open_presentation(source)
+        return source
+
+    def _open_presentation(self, pptx_path: str):
+        """
+        Parse a .pptx file, remembering it as the source for incremental saves
+        """
+        prs = Presentation(pptx_path)
+        self._presentation_sources[prs.part] = pptx_path
+        return prs
+
+    def save_presentation(self, prs, output_path: str, source_path: Optional[str] = None,
+                          deterministic: bool = False) -> str:
+        """
+        Save a presentation. With incremental saves, every part that did not change
+        since the presentation's source file (source_path, or the file it was loaded
+        from) is copied from it still compressed, so untouched media, layouts and
+        masters are never deflated again. The remaining parts are deflated across
+        save_workers threads. A deterministic save fixes every timestamp in the
+        package and orders parts by name, so the same content gives the same bytes.
+        """
+        source_path = (source_path or self._presentation_sources.get(prs.part)) if self.incremental_save else None
+        if deterministic:
+            self._fix_timestamps(prs)
+        if not source_path and self.save_workers <= 1 and not deterministic:
+            prs.save(output_path)
+        else:
+            with PackageWriter(output_path, workers=self.save_workers, deterministic=deterministic) as writer:
+                counts = writer.write_presentation(prs, source_path)
+            print(f"💾 Saved package: {counts['copied']} parts copied, {counts['rewritten']} written")
+        # The saved file now matches the presentation, later saves can copy from it
+        self._presentation_sources[prs.part] = output_path
+        return output_path
+
+    def _fix_timestamps(self, prs):
+        """
+        Replace the timestamps python-pptx and chart workbooks take from the clock
+        """
+        core_properties = prs.core_properties
+        core_properties.modified = DETERMINISTIC_TIMESTAMP
+        if core_properties.created is None:
+            core_properties.created = DETERMINISTIC_TIMESTAMP
+        for part in prs.part.package.iter_parts():
+            if str(part.partname).startswith("/ppt/embeddings/") and str(part.partname).endswith(".xlsx"):
+                part.blob = deterministic_package_blob(part.blob)
+
     def analyze_template(self, template_path: str):
         """
         Comprehensive template analysis to extract all design elements
@@ -180,9 +287,12 @@ class PPTService:
             traceback.print_exc()
             return {}
 
-    def create_presentation_with_full_template(self, slide_data: Dict[str, Any], template_path: str = None, logo_path: str = None, logo_position: str = "top-right", logo_size: str = "medium", output_dir: str = None) -> str:
+    def create_presentation_with_full_template(self, slide_data: Dict[str, Any], template_path: str = None, logo_path: str = None, logo_position: str = "top-right", logo_size: str = "medium", output_dir: str = None,
+                                               deterministic: Optional[bool] = None) -> str:
         """
-        Create presentation with comprehensive template inheritance
+        Create presentation with comprehensive template inheritance.
+        deterministic (default: PPT_DETERMINISTIC_OUTPUT) renders the same input to
+        the same bytes.
         """
         print("🚀 Creating presentation with full template inheritance...")
         
@@ -196,7 +306,7 @@ class PPTService:
             if is_original_template:
                 print("🔄 Using original presentation as template for editing...")
                 # Use the original presentation directly and replace content
-                prs = Presentation(template_path)
+                prs = self._open_presentation(template_path)
                 template_slide_count = len(prs.slides)
                 need_slide_cleanup = True
                 
@@ -206,7 +316,7 @@ class PPTService:
             else:
                 # Create a clean presentation but preserve template structure
                 print("📋 Creating clean presentation with template structure...")
-                template_prs = Presentation(template_path)
+                template_prs = self._open_presentation(template_path)
                 
                 # Create new presentation with template structure
                 prs = Presentation()
@@ -261,12 +371,19 @@ class PPTService:
                     traceback.print_exc()
         else:
             print("📄 Creating new slides...")
+            render_context = self._render_context(template_path, is_original_template, logo_path, logo_position, logo_size)
             
             # Create new AI-generated slides
             for i, slide_info in enumerate(slide_data["slides"]):
                 print(f"📄 Creating slide {i+1}: {slide_info.get('title', 'Untitled')}")
                 
                 try:
+                    # Slides rendered before with the same content, template and logo are replayed
+                    render_key = self._render_key(render_context, slide_info)
+                    fragment = self._cached_render(render_key)
+                    if fragment is not None and self._replay_rendered_slide(prs, fragment):
+                        continue
+
                     if slide_info["layout"] == "title":
                         slide = self._create_title_slide_with_template(prs, slide_info, template_assets)
                     elif slide_info["layout"] == "bullets":
@@ -288,6 +405,8 @@ class PPTService:
                     # Add uploaded logo if provided
                     if logo_path and os.path.exists(logo_path):
                         self._add_logo_to_slide(slide, logo_path, logo_position, logo_size)
+
+                    self._cache_render(render_key, prs, slide)
                         
                 except Exception as e:
                     print(f"❌ Error creating slide {i+1}: {e}")
@@ -322,8 +441,13 @@ class PPTService:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{deck_title}_{timestamp}.pptx"
         
-        output_path = os.path.join(output_dir or self.output_dir, filename)
-        prs.save(output_path)
+        if output_dir:
+            # Decks sharing an output_dir (e.g. a bulk batch) can have the same title and second
+            filename = f"{deck_title}_{timestamp}_{uuid.uuid4().hex[:8]}.pptx"
+            output_path = os.path.join(output_dir, filename)
+        else:
+            output_path = self.artifact_store.allocate(filename)
+        self.save_presentation(prs, output_path, deterministic=self._deterministic(deterministic))
         
         print(f"💾 Presentation saved: {output_path}")
         return output_path
@@ -770,19 +894,38 @@ class PPTService:
         # For now, using default styling
         pass
     
-    def edit_presentation(self, pptx_path: str, updates: Dict[str, Any]) -> str:
+    def edit_presentation(self, pptx_path, updates: Dict[str, Any], text_index: Optional[DeckTextIndex] = None,
+                          atomic: bool = True, source_path: Optional[str] = None,
+                          deterministic: Optional[bool] = None) -> str:
         """
-        Edit an existing PowerPoint presentation using AI-generated instructions
+        Edit an existing PowerPoint presentation using AI-generated instructions.
+        pptx_path may also be a parsed presentation (e.g. from a deck session), which is edited in place.
+        Pass the deck's text_index to reuse it; it is kept up to date with the edits.
+        With atomic, the edits are applied all or nothing: if any edit is invalid or
+        fails, the deck is left unchanged and EditPlanError reports every edit's outcome.
+        source_path is the file a parsed presentation matches, for an incremental save.
+        deterministic (default: PPT_DETERMINISTIC_OUTPUT) gives the same bytes for the
+        same deck and edits.
         """
         print(f"🎯 Editing presentation: {pptx_path}")
         print(f"📝 Updates: {updates}")
         
+        # Plain find/replace on a deck file is applied to the slide XML without loading the deck
+        if isinstance(pptx_path, (str, os.PathLike)) and "edits" in updates:
+            editor = PackageTextEditor(pptx_path)
+            output_path = self.edit_package_text(editor, updates["edits"], atomic, deterministic)
+            if output_path is not None:
+                return output_path
+            text_index = text_index or editor.text_index()
+        
         # Load existing presentation
-        prs = Presentation(pptx_path)
+        prs = self._load_presentation(pptx_path)
         
         # Apply updates based on edit instructions
         if "edits" in updates:
-            self._apply_edit_instructions(prs, updates["edits"])
+            plan = self.apply_edit_plan(prs, updates["edits"], text_index, atomic)
+            if atomic and not plan.succeeded:
+                raise EditPlanError("Edits were not applied because some of them could not be", plan.outcomes())
         else:
             # Legacy format support
             self._apply_legacy_updates(prs, updates)
@@ -790,325 +933,585 @@ class PPTService:
         # Save edited presentation
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"edited_presentation_{timestamp}.pptx"
-        output_path = os.path.join(self.output_dir, filename)
-        prs.save(output_path)
+        output_path = self.artifact_store.allocate(filename)
+        self.save_presentation(prs, output_path, source_path, self._deterministic(deterministic))
         
         print(f"✅ Saved edited presentation: {output_path}")
         return output_path
     
-    def _apply_edit_instructions(self, prs: Presentation, edit_instructions: List[Dict[str, Any]]):
+    def edit_package_text(self, editor: PackageTextEditor, edit_instructions: List[Dict[str, Any]],
+                          atomic: bool = True, deterministic: Optional[bool] = None) -> Optional[str]:
         """
-        Apply AI-generated edit instructions to presentation
+        Fast path for edits that only replace text: the plan is applied to the slide
+        XML and only the changed slide parts are rewritten, every other zip entry is
+        copied as is. Returns None, without changing anything, when some edit needs
+        the full object model.
         """
-        for edit in edit_instructions:
+        text_index = editor.text_index()
+        plan = self.compile_edit_plan(editor, edit_instructions, text_index)
+        if not all(edit.is_text_replacement for edit in plan.pending):
+            return None
+        if atomic and not all(edit.status == "pending" for edit in plan.edits):
+            plan.settle("skipped")
+            raise EditPlanError("Edits were not applied because some of them could not be", plan.outcomes())
+        
+        slide_edits = plan.by_slide()
+        for slide_index, edits in slide_edits.items():
+            self._replace_text_batch(editor.slides[slide_index], slide_index, edits, text_index)
+        if atomic and not plan.succeeded:
+            plan.settle("rolled_back", ("applied",))
+            raise EditPlanError("Edits were not applied because some of them could not be", plan.outcomes())
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = self.artifact_store.allocate(f"edited_presentation_{timestamp}.pptx")
+        counts = editor.save(output_path, list(slide_edits), self._deterministic(deterministic))
+        print(f"⚡ Saved edited presentation from slide XML: {output_path} "
+              f"({counts['rewritten']} parts rewritten, {counts['copied']} copied)")
+        return output_path
+
+    def _deterministic(self, deterministic: Optional[bool]) -> bool:
+        return self.deterministic_output if deterministic is None else deterministic
+
+    def build_text_index(self, prs) -> DeckTextIndex:
+        """
+        Inverted index over a parsed deck's text, for find/replace and search
+        """
+        return DeckTextIndex(self._load_presentation(prs))
+
+    def compile_edit_plan(self, prs, edit_instructions: List[Dict[str, Any]],
+                          text_index: Optional[DeckTextIndex] = None) -> EditPlan:
+        """
+        Validate and normalize edit instructions and group them by slide. Find/replace
+        edits whose text is on another slide are moved to that slide.
+        """
+        prs = self._load_presentation(prs)
+        text_index = text_index or DeckTextIndex(prs)
+        plan = EditPlan(edit_instructions, len(prs.slides))
+        for edit in plan.pending:
+            if edit.is_text_replacement:
+                edit.slide_index = self._target_slide(text_index, edit.slide_index, edit.changes["find"])
+        return plan
+
+    def apply_edit_plan(self, prs, edit_instructions: List[Dict[str, Any]],
+                        text_index: Optional[DeckTextIndex] = None, atomic: bool = True) -> EditPlan:
+        """
+        Compile edit instructions and apply them in one pass per slide. Returns the
+        plan with every edit's outcome. An atomic plan is not started when any edit
+        is invalid, and the slides it touched are restored when any edit fails.
+        """
+        prs = self._load_presentation(prs)
+        text_index = text_index or DeckTextIndex(prs)
+        plan = self.compile_edit_plan(prs, edit_instructions, text_index)
+        if atomic and not all(edit.status == "pending" for edit in plan.edits):
+            plan.settle("skipped")
+            print(f"⚠️ Edit plan rejected: {[edit.detail for edit in plan.edits if edit.status == 'invalid']}")
+            return plan
+        
+        snapshots = {}
+        for slide_index, edits in plan.by_slide().items():
+            slide = prs.slides[slide_index]
+            if atomic:
+                snapshots[slide_index] = self._snapshot_slide(slide)
+            self._apply_slide_edits(slide, slide_index, edits, text_index)
+            if atomic and any(edit.status != "applied" for edit in edits):
+                break
+        
+        if atomic and not all(edit.status in ("applied", "pending") for edit in plan.edits):
+            for slide_index, snapshot in snapshots.items():
+                self._restore_slide(prs.slides[slide_index], snapshot)
+                text_index.reindex_slide(slide_index, prs.slides[slide_index])
+            plan.settle("skipped")
+            plan.settle("rolled_back", ("applied",))
+            print(f"↩️ Rolled back {len(snapshots)} slides, the edit plan did not apply in full")
+        return plan
+
+    def _apply_slide_edits(self, slide, slide_index: int, edits: List[PlannedEdit], text_index: DeckTextIndex):
+        """
+        Apply one slide's edits in instruction order. Consecutive find/replace edits
+        are batched into a single pass over the slide's text.
+        """
+        batch = []
+        for edit in edits:
+            if edit.is_text_replacement:
+                batch.append(edit)
+                continue
+            if batch:
+                self._replace_text_batch(slide, slide_index, batch, text_index)
+                batch = []
+            
+            print(f"🔧 Applying {edit.action} to {edit.target_element} on slide {slide_index + 1}")
             try:
-                slide_index = edit.get("slide_index", 1) - 1  # Convert to 0-based index
-                
-                if slide_index < 0 or slide_index >= len(prs.slides):
-                    print(f"⚠️ Invalid slide index: {slide_index + 1}")
-                    continue
-                
-                slide = prs.slides[slide_index]
-                action = edit.get("action", "")
-                target_element = edit.get("target_element", "")
-                changes = edit.get("changes", {})
-                
-                print(f"🔧 Applying {action} to {target_element} on slide {slide_index + 1}")
-                
-                if action == "modify_content":
-                    self._modify_slide_content(slide, target_element, changes)
-                elif action == "add_content":
-                    self._add_slide_content(slide, target_element, changes)
-                elif action == "replace_content":
-                    self._replace_slide_content(slide, target_element, changes)
-                elif action == "delete_content":
-                    self._delete_slide_content(slide, target_element, changes)
-                elif action == "change_layout":
-                    self._change_slide_layout(slide, changes)
-                
+                if edit.action == "modify_content":
+                    applied = self._modify_slide_content(slide, edit.target_element, edit.changes, slide_index, text_index)
+                elif edit.action == "add_content":
+                    applied = self._add_slide_content(slide, edit.target_element, edit.changes)
+                elif edit.action == "replace_content":
+                    applied = self._replace_slide_content(slide, edit.target_element, edit.changes)
+                elif edit.action == "delete_content":
+                    applied = self._delete_slide_content(slide, edit.target_element, edit.changes)
+                else:
+                    raise ValueError(f"Unsupported action: {edit.action}")
+                if applied:
+                    edit.status = "applied"
+                else:
+                    edit.status = "not_found"
+                    edit.detail = f"No {edit.target_element} to apply {edit.action} to on slide {slide_index + 1}"
+                    print(f"   ⚠️ {edit.detail}")
             except Exception as e:
                 print(f"❌ Error applying edit: {e}")
+                edit.status = "failed"
+                edit.detail = str(e)
+            text_index.reindex_slide(slide_index, slide)
+        
+        if batch:
+            self._replace_text_batch(slide, slide_index, batch, text_index)
+
+    def _replace_text_batch(self, slide, slide_index: int, edits: List[PlannedEdit], text_index: DeckTextIndex):
+        """
+        Apply find/replace edits of one slide together: every find is resolved against
+        the slide's text as it was before the batch, each shape's spans are rewritten
+        in one go and the slide is re-indexed once. An edit whose spans overlap those
+        of an earlier edit in the batch is a conflict.
+        """
+        spans_by_shape = defaultdict(list)  # shape_index -> [(match, replacement, edit)]
+        for edit in edits:
+            find_text, replace_text = edit.changes["find"], edit.changes["replace"]
+            print(f"🔧 Applying modify_content to {edit.target_element} on slide {slide_index + 1}: '{find_text}' → '{replace_text}'")
+            resolved = self._resolve_replacement(slide_index, text_index, find_text,
+                                                 self._text_shape_filter(edit.target_element))
+            if resolved is None:
+                edit.status = "not_found"
+                edit.detail = f"'{find_text}' not found on slide {slide_index + 1}"
+                print(f"   ⚠️ {edit.detail}")
                 continue
+            
+            shape_index, matches = resolved
+            taken = spans_by_shape[shape_index]
+            if any(match.start < other.end and other.start < match.end for match in matches for other, _, _ in taken):
+                edit.status = "conflict"
+                edit.detail = f"'{find_text}' overlaps text changed by an earlier edit"
+                print(f"   ⚠️ {edit.detail}")
+                continue
+            taken.extend((match, replace_text, edit) for match in matches)
+        
+        for shape_index, spans in spans_by_shape.items():
+            batch_edits = list({id(edit): edit for _, _, edit in spans}.values())
+            try:
+                entry = text_index.shape_text(slide_index, shape_index)
+                self._replace_spans(slide.shapes[shape_index], entry, [(match, replacement) for match, replacement, _ in spans])
+                for edit in batch_edits:
+                    edit.status = "applied"
+            except Exception as e:
+                print(f"❌ Error applying edit: {e}")
+                for edit in batch_edits:
+                    edit.status = "failed"
+                    edit.detail = str(e)
+        
+        text_index.reindex_slide(slide_index, slide)
+        print(f"   ✅ Applied {sum(edit.status == 'applied' for edit in edits)}/{len(edits)} text replacements in one pass")
+
+    def _snapshot_slide(self, slide):
+        """
+        Copy of a slide's XML and its relationship IDs, to restore it if a plan fails
+        """
+        return copy.deepcopy(slide._element), set(slide.part.rels.keys())
+
+    def _restore_slide(self, slide, snapshot):
+        element, rIds = snapshot
+        # Shape collections hold on to the live spTree, so it is refilled rather than replaced
+        tree = slide._element.cSld.spTree
+        saved_tree = element.cSld.spTree
+        for child in list(tree):
+            tree.remove(child)
+        for child in list(saved_tree):
+            tree.append(child)
+        saved_tree.getparent().replace(saved_tree, tree)
+        for child in list(slide._element):
+            slide._element.remove(child)
+        for child in list(element):
+            slide._element.append(child)
+        # Drop relationships added by the rolled back edits, e.g. to new charts
+        for rId in set(slide.part.rels.keys()) - rIds:
+            slide.part.rels.pop(rId)
     
-    def _modify_slide_content(self, slide, target_element: str, changes: Dict[str, Any]):
-        """Modify existing content on a slide"""
-        if target_element == "title":
-            # Find and modify title
-            title_found = False
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    # Check if this looks like a title (short text, likely in title placeholder)
-                    if len(shape.text.strip()) < 200 and not "\n" in shape.text:
-                        if "find" in changes and "replace" in changes:
-                            if changes["find"].lower() in shape.text.lower():
-                                shape.text = shape.text.replace(changes["find"], changes["replace"])
-                                print(f"   ✅ Modified title: '{changes['find']}' → '{changes['replace']}'")
-                                title_found = True
-                                break
-                        elif "new_content" in changes:
-                            shape.text = changes["new_content"]
-                            print(f"   ✅ Set title to: '{changes['new_content']}'")
-                            title_found = True
-                            break
+    def _target_slide(self, text_index: DeckTextIndex, slide_index: int, find_text: str) -> int:
+        """
+        The slide a find/replace edit should apply to: the requested slide when the
+        text is on it, otherwise the only slide that mentions it, otherwise the slide
+        of a confident fuzzy match
+        """
+        if text_index.find(find_text, slide_index):
+            return slide_index
+        mentioned = text_index.slides_mentioning(find_text)
+        if len(mentioned) == 1:
+            print(f"   🎯 '{find_text}' is not on slide {slide_index + 1}, found it on slide {mentioned[0]}")
+            return mentioned[0] - 1
+        if mentioned:
+            return slide_index
+        
+        match = text_index.locate(find_text, slide_index)
+        if match is not None and match.confidence >= self.fuzzy_match_threshold:
+            return slide_index
+        match = text_index.locate(find_text)
+        if match is not None and match.confidence >= self.fuzzy_match_threshold:
+            print(f"   🎯 '{find_text}' is closest to '{match.text}' on slide {match.slide_index + 1}")
+            return match.slide_index
+        return slide_index
+    
+    def resolve_edit_targets(self, text_index: DeckTextIndex, edit_instructions: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Locate the find text of every modify_content edit in the deck. Confident
+        matches are written back into the edit as the deck's exact text and slide;
+        the rest are returned with their closest text, for another pass by the model.
+        Edits whose slide_index is not a number are returned with slide_index None.
+        """
+        unresolved = []
+        for edit in edit_instructions.get("edits", []):
+            if not isinstance(edit, dict):
+                continue
+            changes = edit.get("changes") or {}
+            if edit.get("action") != "modify_content" or not isinstance(changes, dict):
+                continue
+            if not isinstance(changes.get("find"), str) or not changes["find"].strip():
+                continue
+            
+            try:
+                requested_index = int(edit.get("slide_index", 1)) - 1
+            except (TypeError, ValueError):
+                match = text_index.locate(changes["find"])
+                unresolved.append({
+                    "slide_index": None,
+                    "find": changes["find"],
+                    "closest_text": match.text if match is not None else None,
+                    "confidence": round(match.confidence, 3) if match is not None else 0.0
+                })
+                continue
             
-            if not title_found:
-                print(f"   ⚠️ Title not found for modification")
+            slide_index = self._target_slide(text_index, requested_index, changes["find"])
+            match = text_index.locate(changes["find"], slide_index) or text_index.locate(changes["find"])
+            if match is not None and match.confidence >= self.fuzzy_match_threshold:
+                if match.text != changes["find"] or match.slide_index != slide_index:
+                    print(f"   🔎 Resolved '{changes['find']}' to '{match.text}' on slide {match.slide_index + 1} ({match.confidence:.2f})")
+                changes["find"] = match.text
+                edit["slide_index"] = match.slide_index + 1
+                edit["match_confidence"] = round(match.confidence, 3)
+            else:
+                unresolved.append({
+                    "slide_index": slide_index + 1,
+                    "find": changes["find"],
+                    "closest_text": match.text if match is not None else None,
+                    "confidence": round(match.confidence, 3) if match is not None else 0.0
+                })
+        return unresolved
+    
+    def _modify_slide_content(self, slide, target_element: str, changes: Dict[str, Any],
+                              slide_index: int = 0, text_index: Optional[DeckTextIndex] = None) -> bool:
+        """Modify existing content on a slide, returns whether anything changed"""
+        if text_index is None:
+            text_index = DeckTextIndex()
+            text_index.reindex_slide(slide_index, slide)
+        shape_filter = self._text_shape_filter(target_element)
+        entries = [entry for entry in text_index.slide_shapes(slide_index) if shape_filter is None or shape_filter(entry)]
+        
+        if target_element == "title":
+            if "find" in changes and "replace" in changes:
+                if self._replace_indexed_text(slide, slide_index, text_index, changes["find"], changes["replace"], shape_filter):
+                    print(f"   ✅ Modified title: '{changes['find']}' → '{changes['replace']}'")
+                    return True
+            elif "new_content" in changes and entries:
+                slide.shapes[entries[0].shape_index].text = changes["new_content"]
+                print(f"   ✅ Set title to: '{changes['new_content']}'")
+                return True
+            print(f"   ⚠️ Title not found for modification")
+            return False
         
         elif target_element == "text":
             # Modify any text content with find/replace
-            text_modified = False
             find_text = changes.get("find", "")
             replace_text = changes.get("replace", "")
             
-            print(f"   🔍 Looking for text: '{find_text}' to replace with: '{replace_text}'")
-            
-            for shape_idx, shape in enumerate(slide.shapes):
-                if hasattr(shape, "text") and shape.text.strip():
-                    original_text = shape.text
-                    print(f"   📄 Shape {shape_idx + 1} text: '{original_text[:100]}{'...' if len(original_text) > 100 else ''}'")
-                    
-                    if "find" in changes and "replace" in changes:
-                        find_text = changes["find"]
-                        replace_text = changes["replace"]
-                        
-                        # Try exact match first
-                        if find_text in original_text:
-                            new_text = original_text.replace(find_text, replace_text)
-                            shape.text = new_text
-                            print(f"   ✅ Exact match - Modified text: '{find_text}' → '{replace_text}'")
-                            text_modified = True
-                            break
-                        
-                        # Try case-insensitive search
-                        elif find_text.lower() in original_text.lower():
-                            # Find the actual case in the original text
-                            start_idx = original_text.lower().find(find_text.lower())
-                            if start_idx != -1:
-                                # Replace while preserving surrounding text
-                                actual_text = original_text[start_idx:start_idx + len(find_text)]
-                                new_text = original_text.replace(actual_text, replace_text)
-                                shape.text = new_text
-                                print(f"   ✅ Case-insensitive match - Modified text: '{actual_text}' → '{replace_text}'")
-                                text_modified = True
-                                break
-                        
-                        # Try partial word match
-                        else:
-                            words_to_find = find_text.lower().split()
-                            text_words = original_text.lower().split()
-                            
-                            # Check if all words from find_text exist in the shape text
-                            if all(word in text_words for word in words_to_find):
-                                # Try to find a reasonable replacement
-                                for word in words_to_find:
-                                    if word in original_text.lower():
-                                        # Find the actual case version
-                                        word_start = original_text.lower().find(word)
-                                        actual_word = original_text[word_start:word_start + len(word)]
-                                        if word == words_to_find[-1]:  # Replace the last/main word
-                                            new_text = original_text.replace(actual_word, replace_text)
-                                            shape.text = new_text
-                                            print(f"   ✅ Partial match - Modified text: '{actual_word}' → '{replace_text}'")
-                                            text_modified = True
-                                            break
-                            
-                            if text_modified:
-                                break
-                    
-                    elif "new_content" in changes:
-                        shape.text = changes["new_content"]
-                        print(f"   ✅ Set text to: '{changes['new_content']}'")
-                        text_modified = True
-                        break
+            if "find" in changes and "replace" in changes:
+                print(f"   🔍 Looking for text: '{find_text}' to replace with: '{replace_text}'")
+                text_modified = self._replace_indexed_text(slide, slide_index, text_index, find_text, replace_text)
+            elif "new_content" in changes:
+                if entries:
+                    slide.shapes[entries[0].shape_index].text = changes["new_content"]
+                    print(f"   ✅ Set text to: '{changes['new_content']}'")
+                text_modified = bool(entries)
+            else:
+                text_modified = False
             
             if not text_modified:
                 print(f"   ⚠️ Text '{find_text}' not found for modification")
                 print(f"   💡 Available text in slide:")
-                for shape_idx, shape in enumerate(slide.shapes):
-                    if hasattr(shape, "text") and shape.text.strip():
-                        print(f"      Shape {shape_idx + 1}: '{shape.text[:50]}{'...' if len(shape.text) > 50 else ''}'")
+                for entry in text_index.slide_shapes(slide_index):
+                    print(f"      Shape {entry.shape_index + 1}: '{entry.text[:50]}{'...' if len(entry.text) > 50 else ''}'")
+            return text_modified
         
         elif target_element == "bullets":
             # Find text box with bullets and modify
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and ("•" in shape.text or len(shape.text.split('\n')) > 1):
-                    if "find" in changes and "replace" in changes:
-                        if changes["find"].lower() in shape.text.lower():
-                            shape.text = shape.text.replace(changes["find"], changes["replace"])
-                            print(f"   ✅ Modified bullets: '{changes['find']}' → '{changes['replace']}'")
-                            break
-                    elif "new_content" in changes:
-                        shape.text = changes["new_content"]
-                        print(f"   ✅ Set bullets to: '{changes['new_content']}'")
-                        break
-                    elif "add_bullet" in changes:
-                        shape.text += f"\n• {changes['add_bullet']}"
-                        print(f"   ✅ Added bullet: '{changes['add_bullet']}'")
-                        break
+            if "find" in changes and "replace" in changes:
+                if self._replace_indexed_text(slide, slide_index, text_index, changes["find"], changes["replace"], shape_filter):
+                    print(f"   ✅ Modified bullets: '{changes['find']}' → '{changes['replace']}'")
+                    return True
+            elif entries and "new_content" in changes:
+                slide.shapes[entries[0].shape_index].text = changes["new_content"]
+                print(f"   ✅ Set bullets to: '{changes['new_content']}'")
+                return True
+            elif entries and "add_bullet" in changes:
+                shape = slide.shapes[entries[0].shape_index]
+                shape.text += f"\n• {changes['add_bullet']}"
+                print(f"   ✅ Added bullet: '{changes['add_bullet']}'")
+                return True
+        return False
+    
+    def _text_shape_filter(self, target_element: str):
+        """Which indexed shapes a text edit of target_element may change, None for any"""
+        if target_element == "title":
+            # Titles look like short, single-line text (likely in the title placeholder)
+            return lambda entry: len(entry.text.strip()) < 200 and "\n" not in entry.text
+        if target_element == "bullets":
+            return lambda entry: "•" in entry.text or len(entry.text.split('\n')) > 1
+        return None
     
-    def _add_slide_content(self, slide, target_element: str, changes: Dict[str, Any]):
-        """Add new content to a slide"""
+    def _replace_indexed_text(self, slide, slide_index: int, text_index: DeckTextIndex, find_text: str,
+                              replace_text: str, shape_filter=None) -> bool:
+        """
+        Replace every occurrence of find_text in the first matching shape of a slide,
+        located through the text index. Shapes with an exact-case occurrence win.
+        """
+        resolved = self._resolve_replacement(slide_index, text_index, find_text, shape_filter)
+        if resolved is None:
+            return False
+        shape_index, matches = resolved
+        entry = text_index.shape_text(slide_index, shape_index)
+        self._replace_spans(slide.shapes[shape_index], entry, [(match, replace_text) for match in matches])
+        return True
+    
+    def _resolve_replacement(self, slide_index: int, text_index: DeckTextIndex, find_text: str,
+                             shape_filter=None) -> Optional[tuple]:
+        """
+        The shape a find/replace edit applies to and the spans to replace in it: all
+        occurrences in the first shape with one, preferring exact-case occurrences,
+        or else a single fuzzy match of sufficient confidence. None if not found.
+        """
+        matches = [match for match in text_index.find(find_text, slide_index)
+                   if shape_filter is None or shape_filter(text_index.shape_text(slide_index, match.shape_index))]
+        if not matches:
+            # The find text may differ slightly from the deck; accept only a confident match
+            match = text_index.locate(find_text, slide_index)
+            if match is None or match.confidence < self.fuzzy_match_threshold:
+                return None
+            if shape_filter is not None and not shape_filter(text_index.shape_text(slide_index, match.shape_index)):
+                return None
+            print(f"   ✅ Fuzzy match ({match.confidence:.2f}): '{match.text}'")
+            return match.shape_index, [match]
+        
+        exact = [match for match in matches if match.exact]
+        shape_index = (exact or matches)[0].shape_index
+        shape_matches = [match for match in matches if match.shape_index == shape_index]
+        
+        kind = "Exact" if exact else "Case-insensitive"
+        print(f"   ✅ {kind} match: '{shape_matches[0].text}'")
+        return shape_index, shape_matches
+    
+    def _replace_spans(self, shape, entry: ShapeText, replacements: List[tuple]):
+        """
+        Replace character spans of a shape's text inside its runs, so the formatting
+        of the surrounding text is kept. replacements holds (TextMatch, new text)
+        pairs that do not overlap. Spans across paragraphs, line breaks or fields
+        fall back to rewriting the shape's text.
+        """
+        paragraphs = shape.text_frame.paragraphs
+        spans = []
+        for match, replacement in replacements:
+            segments = entry.segments_in(match.start, match.end)
+            if (not segments or any(segment.run_index is None for segment in segments)
+                    or len({segment.paragraph_index for segment in segments}) > 1):
+                spans = None
+                break
+            spans.append((match, replacement, segments))
+        
+        if spans is None:
+            text = entry.text
+            for match, replacement in sorted(replacements, key=lambda pair: pair[0].start, reverse=True):
+                text = text[:match.start] + replacement + text[match.end:]
+            shape.text = text
+            return
+        
+        # Work from the end, so earlier run indices stay valid
+        for match, replacement, segments in sorted(spans, key=lambda span: span[0].start, reverse=True):
+            runs = paragraphs[segments[0].paragraph_index].runs
+            first, last = segments[0], segments[-1]
+            first_run, last_run = runs[first.run_index], runs[last.run_index]
+            prefix = first_run.text[:match.start - first.start]
+            suffix = last_run.text[match.end - last.start:]
+            if first is last:
+                first_run.text = prefix + replacement + suffix
+                continue
+            first_run.text = prefix + replacement
+            for segment in segments[1:-1]:
+                run_element = runs[segment.run_index]._r
+                run_element.getparent().remove(run_element)
+            if suffix:
+                last_run.text = suffix
+            else:
+                last_run._r.getparent().remove(last_run._r)
+    
+    def _add_slide_content(self, slide, target_element: str, changes: Dict[str, Any]) -> bool:
+        """Add new content to a slide, returns whether anything was added. Errors propagate to the edit plan."""
         if target_element == "chart":
-            self._add_chart_to_slide(slide, changes)
+            return self._add_chart_to_slide(slide, changes)
         elif target_element == "table":
-            self._add_table_to_slide(slide, changes)
+            return self._add_table_to_slide(slide, changes)
         elif target_element == "bullets":
-            self._add_bullets_to_slide(slide, changes)
+            return self._add_bullets_to_slide(slide, changes)
         elif target_element == "text":
-            self._add_text_to_slide(slide, changes)
+            return self._add_text_to_slide(slide, changes)
+        return False
     
-    def _add_chart_to_slide(self, slide, changes: Dict[str, Any]):
+    def _add_chart_to_slide(self, slide, changes: Dict[str, Any]) -> bool:
         """Add a chart to the slide"""
-        try:
-            chart_type = changes.get("chart_type", "pie")
-            chart_data = changes.get("chart_data", {})
-            
-            if not chart_data:
-                # Default chart data
-                chart_data = {
-                    "categories": ["Category A", "Category B", "Category C"],
-                    "values": [30, 45, 25]
-                }
-            
-            # Position for chart (right side of slide)
-            left = Inches(5)
-            top = Inches(1.5)
-            width = Inches(4)
-            height = Inches(3)
-            
-            # Create chart data
-            chart_data_obj = CategoryChartData()
-            categories = chart_data.get("categories", ["A", "B", "C"])
-            values = chart_data.get("values", [30, 45, 25])
-            
-            chart_data_obj.categories = categories
-            chart_data_obj.add_series('Series 1', values)
-            
-            # Add chart to slide
-            if chart_type.lower() == "pie":
-                chart = slide.shapes.add_chart(
-                    XL_CHART_TYPE.PIE, left, top, width, height, chart_data_obj
-                ).chart
-            elif chart_type.lower() == "bar":
-                chart = slide.shapes.add_chart(
-                    XL_CHART_TYPE.COLUMN_CLUSTERED, left, top, width, height, chart_data_obj
-                ).chart
-            else:
-                chart = slide.shapes.add_chart(
-                    XL_CHART_TYPE.PIE, left, top, width, height, chart_data_obj
-                ).chart
-            
-            print(f"✅ Added {chart_type} chart to slide")
-            
-        except Exception as e:
-            print(f"❌ Error adding chart: {e}")
+        chart_type = changes.get("chart_type", "pie")
+        chart_data = changes.get("chart_data", {})
+        
+        if not chart_data:
+            # Default chart data
+            chart_data = {
+                "categories": ["Category A", "Category B", "Category C"],
+                "values": [30, 45, 25]
+            }
+        
+        # Position for chart (right side of slide)
+        left = Inches(5)
+        top = Inches(1.5)
+        width = Inches(4)
+        height = Inches(3)
+        
+        # Create chart data
+        chart_data_obj = CategoryChartData()
+        categories = chart_data.get("categories", ["A", "B", "C"])
+        values = chart_data.get("values", [30, 45, 25])
+        
+        chart_data_obj.categories = categories
+        chart_data_obj.add_series('Series 1', values)
+        
+        # Add chart to slide
+        if chart_type.lower() == "pie":
+            chart = slide.shapes.add_chart(
+                XL_CHART_TYPE.PIE, left, top, width, height, chart_data_obj
+            ).chart
+        elif chart_type.lower() == "bar":
+            chart = slide.shapes.add_chart(
+                XL_CHART_TYPE.COLUMN_CLUSTERED, left, top, width, height, chart_data_obj
+            ).chart
+        else:
+            chart = slide.shapes.add_chart(
+                XL_CHART_TYPE.PIE, left, top, width, height, chart_data_obj
+            ).chart
+        
+        print(f"✅ Added {chart_type} chart to slide")
+        return True
     
-    def _add_table_to_slide(self, slide, changes: Dict[str, Any]):
+    def _add_table_to_slide(self, slide, changes: Dict[str, Any]) -> bool:
         """Add a table to the slide"""
-        try:
-            table_data = changes.get("table_data", {})
-            headers = table_data.get("headers", ["Column 1", "Column 2"])
-            rows = table_data.get("rows", [["Data 1", "Data 2"], ["Data 3", "Data 4"]])
-            
-            # Position for table
-            left = Inches(1)
-            top = Inches(2)
-            width = Inches(8)
-            height = Inches(3)
-            
-            # Create table
-            rows_count = len(rows) + 1  # +1 for header
-            cols_count = len(headers)
-            
-            table_shape = slide.shapes.add_table(rows_count, cols_count, left, top, width, height)
-            table = table_shape.table
-            
-            # Add headers
-            for i, header in enumerate(headers):
-                table.cell(0, i).text = header
-            
-            # Add data rows
-            for row_idx, row_data in enumerate(rows):
-                for col_idx, cell_data in enumerate(row_data):
-                    if col_idx < cols_count:
-                        table.cell(row_idx + 1, col_idx).text = str(cell_data)
-            
-            print(f"✅ Added table with {rows_count} rows and {cols_count} columns")
-            
-        except Exception as e:
-            print(f"❌ Error adding table: {e}")
+        table_data = changes.get("table_data", {})
+        headers = table_data.get("headers", ["Column 1", "Column 2"])
+        rows = table_data.get("rows", [["Data 1", "Data 2"], ["Data 3", "Data 4"]])
+        
+        # Position for table
+        left = Inches(1)
+        top = Inches(2)
+        width = Inches(8)
+        height = Inches(3)
+        
+        # Create table
+        rows_count = len(rows) + 1  # +1 for header
+        cols_count = len(headers)
+        
+        table_shape = slide.shapes.add_table(rows_count, cols_count, left, top, width, height)
+        table = table_shape.table
+        
+        # Add headers
+        for i, header in enumerate(headers):
+            table.cell(0, i).text = header
+        
+        # Add data rows
+        for row_idx, row_data in enumerate(rows):
+            for col_idx, cell_data in enumerate(row_data):
+                if col_idx < cols_count:
+                    table.cell(row_idx + 1, col_idx).text = str(cell_data)
+        
+        print(f"✅ Added table with {rows_count} rows and {cols_count} columns")
+        return True
     
-    def _add_bullets_to_slide(self, slide, changes: Dict[str, Any]):
+    def _add_bullets_to_slide(self, slide, changes: Dict[str, Any]) -> bool:
         """Add bullet points to the slide"""
-        try:
-            bullets = changes.get("bullets", [])
-            new_content = changes.get("new_content", "")
-            
-            if new_content:
-                bullets = [new_content]
-            
-            # Find existing text box or create new one
-            text_shape = None
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and ("•" in shape.text or len(shape.text.split('\n')) > 1):
-                    text_shape = shape
-                    break
-            
-            if text_shape:
-                # Add to existing bullets
-                for bullet in bullets:
-                    text_shape.text += f"\n• {bullet}"
-            else:
-                # Create new text box
-                left = Inches(1)
-                top = Inches(2)
-                width = Inches(8)
-                height = Inches(4)
-                
-                text_shape = slide.shapes.add_textbox(left, top, width, height)
-                text_frame = text_shape.text_frame
-                text_frame.clear()
-                
-                for i, bullet in enumerate(bullets):
-                    if i == 0:
-                        p = text_frame.paragraphs[0]
-                    else:
-                        p = text_frame.add_paragraph()
-                    p.text = f"• {bullet}"
-            
-            print(f"✅ Added {len(bullets)} bullet points")
-            
-        except Exception as e:
-            print(f"❌ Error adding bullets: {e}")
-    
-    def _add_text_to_slide(self, slide, changes: Dict[str, Any]):
-        """Add text content to the slide"""
-        try:
-            new_text = changes.get("new_content", "New text content")
-            
-            # Position for new text
+        bullets = changes.get("bullets", [])
+        new_content = changes.get("new_content", "")
+        
+        if new_content:
+            bullets = [new_content]
+        if not bullets:
+            return False
+        
+        # Find existing text box or create new one
+        text_shape = None
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and ("•" in shape.text or len(shape.text.split('\n')) > 1):
+                text_shape = shape
+                break
+        
+        if text_shape:
+            # Add to existing bullets
+            for bullet in bullets:
+                text_shape.text += f"\n• {bullet}"
+        else:
+            # Create new text box
             left = Inches(1)
-            top = Inches(4)
+            top = Inches(2)
             width = Inches(8)
-            height = Inches(2)
+            height = Inches(4)
             
             text_shape = slide.shapes.add_textbox(left, top, width, height)
-            text_shape.text = new_text
-            
-            print(f"✅ Added text content")
+            text_frame = text_shape.text_frame
+            text_frame.clear()
             
-        except Exception as e:
-            print(f"❌ Error adding text: {e}")
+            for i, bullet in enumerate(bullets):
+                if i == 0:
+                    p = text_frame.paragraphs[0]
+                else:
+                    p = text_frame.add_paragraph()
+                p.text = f"• {bullet}"
+        
+        print(f"✅ Added {len(bullets)} bullet points")
+        return True
     
-    def _replace_slide_content(self, slide, target_element: str, changes: Dict[str, Any]):
-        """Replace existing content on a slide"""
+    def _add_text_to_slide(self, slide, changes: Dict[str, Any]) -> bool:
+        """Add text content to the slide"""
+        new_text = changes.get("new_content", "New text content")
+        
+        # Position for new text
+        left = Inches(1)
+        top = Inches(4)
+        width = Inches(8)
+        height = Inches(2)
+        
+        text_shape = slide.shapes.add_textbox(left, top, width, height)
+        text_shape.text = new_text
+        
+        print(f"✅ Added text content")
+        return True
+    
+    def _replace_slide_content(self, slide, target_element: str, changes: Dict[str, Any]) -> bool:
+        """Replace existing content on a slide, returns whether the new content was added"""
         # First delete the target element
         self._delete_slide_content(slide, target_element, changes)
         # Then add new content
-        self._add_slide_content(slide, target_element, changes)
+        return self._add_slide_content(slide, target_element, changes)
     
-    def _delete_slide_content(self, slide, target_element: str, changes: Dict[str, Any]):
-        """Delete content from a slide"""
+    def _delete_slide_content(self, slide, target_element: str, changes: Dict[str, Any]) -> bool:
+        """Delete content from a slide, returns whether anything was removed"""
         shapes_to_remove = []
         
         for shape in slide.shapes:
@@ -1133,13 +1536,7 @@ class PPTService:
             slide.shapes.element.remove(shape.element)
         
         print(f"✅ Removed {len(shapes_to_remove)} {target_element} elements")
-    
-    def _change_slide_layout(self, slide, changes: Dict[str, Any]):
-        """Change the layout of a slide"""
-        # This is complex and would require layout matching
-        # For now, just log the request
-        layout_name = changes.get("new_layout", "unknown")
-        print(f"📝 Layout change requested to: {layout_name}")
+        return bool(shapes_to_remove)
     
     def _apply_legacy_updates(self, prs: Presentation, updates: Dict[str, Any]):
         """Apply legacy update format for backwards compatibility"""
@@ -1166,228 +1563,29 @@ class PPTService:
             slide_data, template_path, logo_path, logo_position, logo_size, output_dir
         )
 
-    def extract_slide_data_from_ppt(self, ppt_path: str) -> Dict[str, Any]:
+    def open_edit_pipeline(self, pptx_path: str) -> "EditPipeline":
+        """
+        Open a presentation once for an extract -> AI -> edit round trip
+        """
+        return EditPipeline(self, pptx_path)
+
+    def extract_slide_data_from_ppt(self, ppt_path: str, presentation=None) -> Dict[str, Any]:
         """
-        Extract slide data from an existing PowerPoint file for editing
+        Extract slide data from an existing PowerPoint file for editing.
+        Pass `presentation` to extract from an already parsed copy of ppt_path.
         """
         print(f"🔍 Extracting slide data from: {ppt_path}")
         
         try:
-            prs = Presentation(ppt_path)
+            model = self._get_slide_model(presentation if presentation is not None else ppt_path, ppt_path)
             
             # Extract presentation metadata and SAVE TEMPLATE INFO
             slide_data = {
-                "meta": {
-                    "deck_title": "Extracted Presentation",
-                    "original_file": os.path.basename(ppt_path),
-                    "total_slides": len(prs.slides),
-                    "extracted_on": datetime.now().isoformat(),
-                    "original_template_path": ppt_path,  # Store original file path
-                    "has_template": True  # Flag to indicate this needs template preservation
-                },
-                "slides": []
+                "meta": self._extraction_meta(ppt_path, len(model)),
+                "slides": [self._slide_info_from_model(slide_idx, slide_model)
+                           for slide_idx, slide_model in enumerate(model)]
             }
             
-            print(f"📊 Found {len(prs.slides)} slides to extract")
-            
-            for slide_idx, slide in enumerate(prs.slides):
-                print(f"📄 Extracting slide {slide_idx + 1}...")
-                
-                slide_info = {
-                    "title": "Untitled Slide",
-                    "layout": "bullets",  # Default layout
-                    "bullets": [],
-                    "subtitle": "",
-                    "columns": [],
-                    "rows": [],
-                    "categories": [],
-                    "series": {},
-                    "text_boxes": [],  # All other text content
-                    "images": [],      # Image information
-                    "shapes": []       # Other shapes
-                }
-                
-                # Extract title
-                try:
-                    if hasattr(slide.shapes, 'title') and slide.shapes.title:
-                        slide_info["title"] = slide.shapes.title.text or f"Slide {slide_idx + 1}"
-                        print(f"   📋 Title: {slide_info['title']}")
-                except:
-                    slide_info["title"] = f"Slide {slide_idx + 1}"
-                
-                # Analyze slide content
-                has_table = False
-                has_chart = False
-                text_content = []
-                shape_count = 0
-                
-                print(f"   🔍 Analyzing {len(slide.shapes)} shapes on slide...")
-                
-                for shape in slide.shapes:
-                    shape_count += 1
-                    try:
-                        print(f"      Shape {shape_count}: Type={shape.shape_type}")
-                        
-                        # Check for tables
-                        if hasattr(shape, 'table'):
-                            has_table = True
-                            table = shape.table
-                            num_rows = len(table.rows)
-                            num_cols = len(table.columns)
-                            print(f"   📊 Found table with {num_rows} rows, {num_cols} columns")
-                            
-                            # Extract table data
-                            slide_info["layout"] = "table"
-                            
-                            # Extract headers (first row)
-                            if num_rows > 0:
-                                slide_info["columns"] = []
-                                for col_idx in range(num_cols):
-                                    try:
-                                        header_text = table.cell(0, col_idx).text.strip()
-                                        slide_info["columns"].append(header_text or f"Column {col_idx + 1}")
-                                    except:
-                                        slide_info["columns"].append(f"Column {col_idx + 1}")
-                            
-                            # Extract data rows
-                            slide_info["rows"] = []
-                            for row_idx in range(1, num_rows):  # Skip header row
-                                row_data = []
-                                for col_idx in range(num_cols):
-                                    try:
-                                        cell_text = table.cell(row_idx, col_idx).text.strip()
-                                        row_data.append(cell_text)
-                                    except:
-                                        row_data.append("")
-                                slide_info["rows"].append(row_data)
-                        
-                        # Check for charts
-                        elif hasattr(shape, 'chart'):
-                            has_chart = True
-                            print(f"   📈 Found chart")
-                            slide_info["layout"] = "chart.column"  # Default chart type
-                            
-                            # Try to extract chart data (basic extraction)
-                            slide_info["categories"] = ["Category 1", "Category 2", "Category 3"]
-                            slide_info["series"] = {"Series 1": [10, 20, 30]}
-                        
-                        # Check for images
-                        elif hasattr(shape, 'image'):
-                            print(f"   🖼️ Found image")
-                            slide_info["images"].append({
-                                "name": f"Image {len(slide_info['images']) + 1}",
-                                "left": shape.left,
-                                "top": shape.top,
-                                "width": shape.width,
-                                "height": shape.height
-                            })
-                        
-                        # Extract ALL text content from ANY shape with text
-                        if hasattr(shape, 'text_frame') and shape.text_frame:
-                            text = shape.text_frame.text.strip()
-                            if text:
-                                print(f"   📝 Text found: '{text[:100]}{'...' if len(text) > 100 else ''}'")
-                                
-                                # Check if this is the title shape
-                                try:
-                                    if hasattr(slide.shapes, 'title') and slide.shapes.title == shape:
-                                        slide_info["title"] = text
-                                        print(f"   📋 Identified as title: {text}")
-                                        continue
-                                except:
-                                    pass
-                                
-                                # Check if it's a placeholder and what type
-                                is_placeholder = False
-                                placeholder_type = None
-                                try:
-                                    if hasattr(shape, 'placeholder_format'):
-                                        is_placeholder = True
-                                        placeholder_type = shape.placeholder_format.type
-                                        print(f"   🏷️ Placeholder type: {placeholder_type}")
-                                        
-                                        if placeholder_type == 1:  # Title placeholder
-                                            slide_info["title"] = text
-                                            print(f"   📋 Title placeholder: {text}")
-                                            continue
-                                        elif placeholder_type == 3:  # Subtitle placeholder
-                                            slide_info["subtitle"] = text
-                                            print(f"   📝 Subtitle placeholder: {text}")
-                                            continue
-                                        elif placeholder_type == 2:  # Content placeholder
-                                            # This might be bullet points or other content
-                                            if '\n' in text:
-                                                bullets = [line.strip() for line in text.split('\n') if line.strip()]
-                                                text_content.extend(bullets)
-                                                print(f"   🔸 Content placeholder (bullets): {len(bullets)} items")
-                                            else:
-                                                text_content.append(text)
-                                                print(f"   🔸 Content placeholder (single): {text}")
-                                            continue
-                                except:
-                                    pass
-                                
-                                # For non-placeholder text or unknown placeholders, store as text box
-                                text_box_info = {
-                                    "text": text,
-                                    "left": shape.left,
-                                    "top": shape.top,
-                                    "width": shape.width,
-                                    "height": shape.height,
-                                    "is_placeholder": is_placeholder,
-                                    "placeholder_type": placeholder_type,
-                                    "shape_id": f"textbox_{len(slide_info['text_boxes'])}"
-                                }
-                                
-                                # Try to extract formatting information
-                                try:
-                                    if shape.text_frame.paragraphs:
-                                        first_para = shape.text_frame.paragraphs[0]
-                                        if first_para.runs:
-                                            first_run = first_para.runs[0]
-                                            text_box_info["font_name"] = getattr(first_run.font, 'name', None)
-                                            text_box_info["font_size"] = getattr(first_run.font.size, 'pt', None) if first_run.font.size else None
-                                            text_box_info["bold"] = getattr(first_run.font, 'bold', None)
-                                            text_box_info["italic"] = getattr(first_run.font, 'italic', None)
-                                except:
-                                    pass
-                                
-                                slide_info["text_boxes"].append(text_box_info)
-                                print(f"   📄 Added text box: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-                        
-                        # Store other shape information
-                        else:
-                            shape_info = {
-                                "type": str(shape.shape_type),
-                                "left": shape.left,
-                                "top": shape.top,
-                                "width": shape.width,
-                                "height": shape.height,
-                                "shape_id": f"shape_{len(slide_info['shapes'])}"
-                            }
-                            slide_info["shapes"].append(shape_info)
-                            print(f"   🔷 Added shape: {shape.shape_type}")
-                    
-                    except Exception as e:
-                        print(f"   ❌ Error processing shape {shape_count}: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        continue
-                
-                # Set layout based on content found
-                if has_table:
-                    slide_info["layout"] = "table"
-                elif has_chart:
-                    slide_info["layout"] = "chart.column"
-                elif slide_idx == 0:  # First slide is often a title slide
-                    slide_info["layout"] = "title"
-                else:
-                    slide_info["layout"] = "bullets"
-                    slide_info["bullets"] = text_content if text_content else ["Bullet point content"]
-                
-                print(f"   ✅ Layout determined: {slide_info['layout']}")
-                slide_data["slides"].append(slide_info)
-            
             print(f"✅ Successfully extracted {len(slide_data['slides'])} slides")
             return slide_data
             
@@ -1397,6 +1595,403 @@ class PPTService:
             traceback.print_exc()
             raise Exception(f"Failed to extract slide data: {str(e)}")
 
+    def _slide_info_from_model(self, slide_idx: int, slide_model: SlideRecord) -> Dict[str, Any]:
+        """
+        Build the editable slide structure for one slide of the canonical model
+        """
+        slide_info = {
+            "title": "Untitled Slide",
+            "layout": "bullets",  # Default layout
+            "bullets": [],
+            "subtitle": "",
+            "columns": [],
+            "rows": [],
+            "categories": [],
+            "series": {},
+            "text_boxes": [],  # All other text content
+            "images": [],      # Image information
+            "shapes": []       # Other shapes
+        }
+
+        if slide_model.title is not None:
+            slide_info["title"] = slide_model.title or f"Slide {slide_idx + 1}"
+
+        has_table = False
+        has_chart = False
+        chart_layout = "chart.column"
+        text_content = []
+
+        for shape in slide_model.shapes:
+            if shape.kind == "table" and shape.table is not None:
+                has_table = True
+                table = shape.table
+                if table:
+                    slide_info["columns"] = [header or f"Column {col_idx + 1}"
+                                             for col_idx, header in enumerate(table[0])]
+                slide_info["rows"] = [list(row) for row in table[1:]]  # Skip header row
+
+            elif shape.kind == "chart":
+                has_chart = True
+                chart = shape.chart
+                if chart is not None and chart.series:
+                    chart_layout = f"chart.{chart.chart_type}"
+                    slide_info["categories"] = list(chart.categories)
+                    slide_info["series"] = self._chart_series(chart)
+                else:
+                    # Chart data could not be read, fall back to sample data
+                    slide_info["categories"] = ["Category 1", "Category 2", "Category 3"]
+                    slide_info["series"] = {"Series 1": [10, 20, 30]}
+
+            elif shape.kind == "image":
+                slide_info["images"].append({
+                    "name": f"Image {len(slide_info['images']) + 1}",
+                    "left": shape.left,
+                    "top": shape.top,
+                    "width": shape.width,
+                    "height": shape.height
+                })
+
+            # Extract ALL text content from ANY shape with text
+            if shape.text is not None:
+                text = shape.text.strip()
+                if not text:
+                    continue
+
+                if shape.is_title_shape:
+                    slide_info["title"] = text
+                    continue
+
+                placeholder_type = shape.placeholder_type
+                if placeholder_type == 1:  # Title placeholder
+                    slide_info["title"] = text
+                    continue
+                elif placeholder_type == 3:  # Subtitle placeholder
+                    slide_info["subtitle"] = text
+                    continue
+                elif placeholder_type == 2:  # Content placeholder
+                    # This might be bullet points or other content
+                    if '\n' in text:
+                        text_content.extend(line.strip() for line in text.split('\n') if line.strip())
+                    else:
+                        text_content.append(text)
+                    continue
+
+                # For non-placeholder text or unknown placeholders, store as text box
+                text_box_info = {
+                    "text": text,
+                    "left": shape.left,
+                    "top": shape.top,
+                    "width": shape.width,
+                    "height": shape.height,
+                    "is_placeholder": shape.is_placeholder,
+                    "placeholder_type": placeholder_type,
+                    "shape_id": f"textbox_{len(slide_info['text_boxes'])}"
+                }
+                if shape.font is not None:
+                    text_box_info.update(shape.font.to_dict())
+                slide_info["text_boxes"].append(text_box_info)
+
+            # Store other shape information
+            else:
+                slide_info["shapes"].append({
+                    "type": shape.shape_type,
+                    "left": shape.left,
+                    "top": shape.top,
+                    "width": shape.width,
+                    "height": shape.height,
+                    "shape_id": f"shape_{len(slide_info['shapes'])}"
+                })
+
+        # Set layout based on content found
+        if has_table:
+            slide_info["layout"] = "table"
+        elif has_chart:
+            slide_info["layout"] = chart_layout
+        elif slide_idx == 0:  # First slide is often a title slide
+            slide_info["layout"] = "title"
+        else:
+            slide_info["layout"] = "bullets"
+            slide_info["bullets"] = text_content if text_content else ["Bullet point content"]
+
+        print(f"   📄 Slide {slide_idx + 1}: {slide_info['layout']} '{slide_info['title'][:50]}'")
+        return slide_info
+
+    def _chart_series(self, chart: ChartRecord) -> Dict[str, List[Optional[float]]]:
+        """
+        Series of a chart model as name -> values, with None for gaps
+        """
+        series = {}
+        for name, values in chart.series_values():
+            key = name
+            suffix = 2
+            while key in series:
+                key = f"{name} ({suffix})"
+                suffix += 1
+            series[key] = values
+        return series
+
+    def _get_slide_model(self, source, ppt_path: Optional[str] = None) -> List[SlideRecord]:
+        """
+        Canonical per-slide model of a deck. Built in one pass over the shapes and
+        cached by the SHA-256 of the file, so repeated extractions of the same
+        upload skip parsing entirely. Callers must treat the result as read-only.
+        """
+        path = source if isinstance(source, (str, os.PathLike)) else ppt_path
+        content_hash = None
+        if path and os.path.isfile(path):
+            content_hash = self._file_hash(path)
+            model = self._cached_slide_model(content_hash, path)
+            if model is not None:
+                return model
+
+        if isinstance(source, (str, os.PathLike)):
+            model = self._extract_changed_slides(source)
+        else:
+            model = self._build_slide_model(source)
+
+        if content_hash is not None:
+            self._cache_slide_model(content_hash, model)
+        return model
+
+    def _extract_changed_slides(self, ppt_path: str) -> List[SlideRecord]:
+        """
+        Slide models for a deck on disk. Slides whose fingerprint was extracted before,
+        from this upload or any other, are reused; only the rest are parsed. Only slide,
+        layout and master XML is read; media parts are never decompressed.
+        """
+        with SlideXmlExtractor(ppt_path) as extractor:
+            fingerprints = [fp["fingerprint"] for fp in extractor.slide_fingerprints()]
+            model = [self._cached_slide(fingerprint) for fingerprint in fingerprints]
+            missing = [slide_idx for slide_idx, slide_model in enumerate(model) if slide_model is None]
+
+            extracted = [extractor.slide_model(slide_idx) for slide_idx in missing]
+
+        for slide_idx, slide_model in zip(missing, extracted):
+            slide_model.fingerprint = fingerprints[slide_idx]
+            model[slide_idx] = slide_model
+            self._cache_slide(slide_model)
+
+        if missing and len(missing) < len(model):
+            print(f"♻️ Reused {len(model) - len(missing)} unchanged slides, extracted {len(missing)}")
+        return model
+
+    def slide_fingerprints(self, ppt_path: str) -> List[Dict[str, Any]]:
+        """
+        Stable fingerprint per slide from its XML and relationships, the same one the
+        PDF page cache renders previews by
+        """
+        with SlideXmlExtractor(ppt_path) as extractor:
+            return extractor.slide_fingerprints()
+
+    def extraction_cache_stats(self) -> Dict[str, Any]:
+        with self._extraction_lock:
+            models = list(self._extraction_cache.values())
+            slides = list(self._slide_cache.values())
+            contexts = list(self._slide_context_cache.values())
+        return {
+            "entries": len(models),
+            "max_entries": self.extraction_cache_size,
+            "slide_entries": len(slides),
+            "slide_context_entries": len(contexts),
+            "max_slide_entries": self.slide_cache_size,
+            # Decks share their slide records with the slide cache, so count them once
+            "memory_bytes": deep_sizeof([models, slides, contexts])
+        }
+
+    def _cached_slide_model(self, content_hash: str, path: str) -> Optional[List[SlideRecord]]:
+        with self._extraction_lock:
+            model = self._extraction_cache.get(content_hash)
+            if model is not None:
+                self._extraction_cache.move_to_end(content_hash)
+                print(f"♻️ Extraction cache hit for {os.path.basename(path)}")
+            return model
+
+    def _cache_slide_model(self, content_hash: str, model: List[SlideRecord]):
+        with self._extraction_lock:
+            self._extraction_cache[content_hash] = model
+            while len(self._extraction_cache) > self.extraction_cache_size:
+                self._extraction_cache.popitem(last=False)
+
+    def _cached_slide(self, fingerprint: str) -> Optional[SlideRecord]:
+        with self._extraction_lock:
+            slide_model = self._slide_cache.get(fingerprint)
+            if slide_model is not None:
+                self._slide_cache.move_to_end(fingerprint)
+            return slide_model
+
+    def _cache_slide(self, slide_model: SlideRecord):
+        with self._extraction_lock:
+            self._slide_cache[slide_model.fingerprint] = slide_model
+            while len(self._slide_cache) > self.slide_cache_size:
+                self._slide_cache.popitem(last=False)
+
+    def stream_slide_data(self, ppt_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Extract slide data one slide at a time. Yields a meta event followed by a
+        slide event per slide, in the same shape as extract_slide_data_from_ppt.
+        Slides are read straight from the package XML, so the first slides are
+        available before the rest of the deck has been parsed.
+        """
+        print(f"🔍 Streaming slide data from: {ppt_path}")
+        content_hash = self._file_hash(ppt_path)
+        cached = self._cached_slide_model(content_hash, ppt_path)
+
+        with SlideXmlExtractor(ppt_path) as extractor:
+            yield {"type": "meta", "meta": self._extraction_meta(ppt_path, extractor.slide_count)}
+
+            model = []
+            fingerprints = extractor.reader.iter_slide_fingerprints() if cached is None else None
+            for slide_idx in range(extractor.slide_count):
+                if cached is not None:
+                    slide_model = cached[slide_idx]
+                else:
+                    # Unchanged slides of a re-upload come straight from the slide cache
+                    fingerprint = next(fingerprints)["fingerprint"]
+                    slide_model = self._cached_slide(fingerprint)
+                    if slide_model is None:
+                        slide_model = extractor.slide_model(slide_idx)
+                        slide_model.fingerprint = fingerprint
+                        self._cache_slide(slide_model)
+                model.append(slide_model)
+                yield {
+                    "type": "slide",
+                    "index": slide_idx,
+                    "slide": self._slide_info_from_model(slide_idx, slide_model)
+                }
+
+        if cached is None:
+            self._cache_slide_model(content_hash, model)
+        print(f"✅ Streamed {len(model)} slides")
+
+    def _extraction_meta(self, ppt_path: str, total_slides: int) -> Dict[str, Any]:
+        return {
+            "deck_title": "Extracted Presentation",
+            "original_file": os.path.basename(ppt_path),
+            "total_slides": total_slides,
+            "extracted_on": datetime.now().isoformat(),
+            "original_template_path": ppt_path,  # Store original file path
+            "has_template": True  # Flag to indicate this needs template preservation
+        }
+
+    def _file_hash(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _build_slide_model(self, prs) -> List[SlideRecord]:
+        """
+        Walk every shape once and record everything either extractor needs
+        """
+        slide_layouts = list(prs.slide_layouts)
+        model = []
+        for slide_idx, slide in enumerate(prs.slides):
+            try:
+                title_shape = slide.shapes.title
+            except Exception:
+                title_shape = None
+
+            try:
+                layout_index = slide_layouts.index(slide.slide_layout)
+            except ValueError:
+                layout_index = 0
+
+            shapes = []
+            for shape_idx, shape in enumerate(slide.shapes):
+                try:
+                    shapes.append(self._shape_model(shape_idx, shape, title_shape))
+                except Exception as e:
+                    print(f"   ❌ Error processing shape {shape_idx + 1} on slide {slide_idx + 1}: {e}")
+
+            model.append(SlideRecord(
+                title=self._shape_text(title_shape) if title_shape is not None else None,
+                layout_index=layout_index,
+                shapes=shapes
+            ))
+        print(f"📊 Built slide model for {len(model)} slides")
+        return model
+
+    def _shape_model(self, shape_idx: int, shape, title_shape) -> ShapeRecord:
+        try:
+            shape_type = str(shape.shape_type)
+        except Exception:
+            shape_type = "None"
+
+        kind = None
+        if getattr(shape, "has_table", False):
+            kind = "table"
+        elif getattr(shape, "has_chart", False):
+            kind = "chart"
+        elif hasattr(type(shape), "image"):
+            kind = "image"
+
+        placeholder_type = None
+        placeholder_idx = None
+        if shape.is_placeholder:
+            try:
+                placeholder_type = shape.placeholder_format.type
+                placeholder_idx = shape.placeholder_format.idx
+            except Exception:
+                pass
+
+        shape_model = ShapeRecord(
+            index=shape_idx,
+            name=str(shape.name),
+            shape_type=shape_type,
+            kind=kind,
+            text=self._shape_text(shape),
+            is_title_shape=title_shape is not None and title_shape._element is shape._element,
+            is_placeholder=shape.is_placeholder,
+            placeholder_type=placeholder_type,
+            placeholder_idx=placeholder_idx,
+            left=shape.left,
+            top=shape.top,
+            width=shape.width,
+            height=shape.height
+        )
+
+        if shape_model.text:
+            shape_model.font = self._first_run_font(shape)
+
+        if kind == "chart":
+            shape_model.chart = SlideXmlExtractor.read_chart(shape.chart_part._element)
+
+        if kind == "table":
+            try:
+                shape_model.table = tuple(tuple(cell.text.strip() for cell in row.cells)
+                                          for row in shape.table.rows)
+            except Exception as e:
+                shape_model.table_error = str(e)
+
+        return shape_model
+
+    def _shape_text(self, shape) -> Optional[str]:
+        """
+        Text of a shape, or None if it cannot hold text. Reads the XML directly,
+        because touching text_frame on a shape without one adds an empty text body.
+        """
+        if not hasattr(type(shape), "text_frame"):
+            return None
+        if getattr(shape._element, "txBody", None) is None:
+            return ""
+        return shape.text_frame.text
+
+    def _first_run_font(self, shape) -> Optional[FontInfo]:
+        try:
+            paragraphs = shape.text_frame.paragraphs
+            if paragraphs and paragraphs[0].runs:
+                font = paragraphs[0].runs[0].font
+                return FontInfo(
+                    font_name=font.name,
+                    font_size=font.size.pt if font.size else None,
+                    bold=font.bold,
+                    italic=font.italic
+                )
+        except Exception:
+            pass
+        return None
+
     def _update_existing_slide_content(self, slide, slide_info):
         """
         Update existing slide content while preserving template formatting
@@ -1648,7 +2243,28 @@ class PPTService:
         if hasattr(slide.shapes, 'title') and slide.shapes.title:
             slide.shapes.title.text = slide_info["title"]
         
-        # Add chart placeholder text for now
+        # Add the chart from its data, falling back to a text summary
+        try:
+            chart_data = CategoryChartData()
+            chart_data.categories = slide_info["categories"]
+            for series_name, values in slide_info["series"].items():
+                chart_data.add_series(series_name, values)
+
+            chart_type_map = {
+                "column": XL_CHART_TYPE.COLUMN_CLUSTERED,
+                "bar": XL_CHART_TYPE.BAR_CLUSTERED,
+                "line": XL_CHART_TYPE.LINE,
+                "pie": XL_CHART_TYPE.PIE
+            }
+            chart_type = slide_info["layout"].partition(".")[2]
+            slide.shapes.add_chart(
+                chart_type_map.get(chart_type, XL_CHART_TYPE.COLUMN_CLUSTERED),
+                Inches(1), Inches(2), Inches(8), Inches(4), chart_data
+            )
+            return slide
+        except Exception as e:
+            print(f"   ⚠️ Could not add chart, adding summary text instead: {e}")
+
         text_box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(8), Inches(4))
         text_frame = text_box.text_frame
         text_frame.text = f"Chart: {slide_info['title']}\nCategories: {', '.join(slide_info.get('categories', []))}\nData available for chart generation"
@@ -1729,79 +2345,215 @@ class PPTService:
                 import traceback
                 traceback.print_exc()
 
+    def _render_context(self, template_path: Optional[str], is_original_template: bool, logo_path: Optional[str],
+                        logo_position: str, logo_size: str) -> Optional[tuple]:
+        """
+        What every rendered slide depends on besides its own content: the template's
+        content hash, whether slides are added to the original deck, and the logo
+        settings. None when the render cache is disabled.
+        """
+        if self.render_cache_size <= 0:
+            return None
+        template_hash = self._file_hash(template_path) if template_path and os.path.exists(template_path) else None
+        logo_hash = self._file_hash(logo_path) if logo_path and os.path.exists(logo_path) else None
+        return (template_hash, bool(template_hash and is_original_template),
+                logo_hash, logo_position if logo_hash else None, logo_size if logo_hash else None)
+
+    def _render_key(self, render_context: Optional[tuple], slide_info: Dict[str, Any]) -> Optional[str]:
+        if render_context is None:
+            return None
+        normalized = json.dumps([render_context, slide_info], sort_keys=True, default=str)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _cached_render(self, render_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if render_key is None:
+            return None
+        with self._render_lock:
+            fragment = self._render_cache.get(render_key)
+            if fragment is not None:
+                self._render_cache.move_to_end(render_key)
+                self._render_stats["hits"] += 1
+            else:
+                self._render_stats["misses"] += 1
+            return fragment
+
+    def _cache_render(self, render_key: Optional[str], prs, slide):
+        if render_key is None:
+            return
+        fragment = self._slide_fragment(prs, slide)
+        if fragment is None:
+            return
+        with self._render_lock:
+            self._render_cache[render_key] = fragment
+            while len(self._render_cache) > self.render_cache_size:
+                self._render_cache.popitem(last=False)
+
+    def _slide_fragment(self, prs, slide) -> Optional[Dict[str, Any]]:
+        """
+        A rendered slide detached from its presentation: its layout, its XML and the
+        images and charts it relates to. None for slides relating to anything else.
+        """
+        try:
+            layout_index = list(prs.slide_layouts).index(slide.slide_layout)
+        except ValueError:
+            return None
+
+        related = []
+        for rId, rel in slide.part.rels.items():
+            if rel.is_external:
+                return None
+            if rel.reltype == RT.SLIDE_LAYOUT:
+                continue
+            if rel.reltype == RT.IMAGE:
+                related.append((rId, "image", (rel.target_part.blob, rel.target_part.desc)))
+            elif rel.reltype == RT.CHART:
+                chart_part = rel.target_part
+                if any(chart_rel.is_external or chart_rel.reltype != RT.PACKAGE
+                       for chart_rel in chart_part.rels.values()):
+                    return None
+                xlsx_part = chart_part.chart_workbook.xlsx_part
+                related.append((rId, "chart", (chart_part.blob, xlsx_part.blob if xlsx_part is not None else None)))
+            else:
+                return None
+        return {"layout_index": layout_index, "xml": slide.part.blob, "related": related}
+
+    def _replay_rendered_slide(self, prs, fragment: Dict[str, Any]) -> bool:
+        """
+        Add a cached slide fragment as a new slide: images and charts are added to the
+        package again and the slide's relationship IDs are remapped to them
+        """
+        slide = prs.slides.add_slide(prs.slide_layouts[fragment["layout_index"]])
+        try:
+            package = slide.part.package
+            rIds = {}
+            for rId, kind, payload in fragment["related"]:
+                if kind == "image":
+                    # Keep the file name, later pictures of the same image are described by it
+                    image = Image.from_blob(*payload)
+                    image_part = next((part for part in package.iter_parts()
+                                       if isinstance(part, ImagePart) and part.sha1 == image.sha1), None)
+                    rIds[rId] = slide.part.relate_to(image_part or ImagePart.new(package, image), RT.IMAGE)
+                else:
+                    chart_blob, xlsx_blob = payload
+                    chart_part = ChartPart.load(package.next_partname(ChartPart.partname_template),
+                                                CT.DML_CHART, package, chart_blob)
+                    if xlsx_blob is not None:
+                        chart_part.chart_workbook.xlsx_part = EmbeddedXlsxPart.new(xlsx_blob, package)
+                    rIds[rId] = slide.part.relate_to(chart_part, RT.CHART)
+
+            element = parse_xml(fragment["xml"])
+            for node in element.iter(etree.Element):
+                for name, value in node.items():
+                    if name.startswith(RELATIONSHIP_ATTRIBUTE_PREFIX) and value in rIds:
+                        node.set(name, rIds[value])
+            self._restore_slide(slide, (element, set(slide.part.rels.keys())))
+            print("♻️ Reused rendered slide")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not reuse rendered slide, rendering it again: {e}")
+            sldId = prs.slides._sldIdLst[-1]
+            prs.slides._sldIdLst.remove(sldId)
+            prs.part.drop_rel(sldId.rId)
+            return False
+
+    def render_cache_stats(self) -> Dict[str, Any]:
+        with self._render_lock:
+            fragments = list(self._render_cache.values())
+            stats = dict(self._render_stats)
+        return {
+            "entries": len(fragments),
+            "max_entries": self.render_cache_size,
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "memory_bytes": deep_sizeof(fragments)
+        }
+
     def extract_slide_content(self, pptx_path):
         """
         Extract content from all slides for AI analysis
         """
         try:
-            prs = Presentation(pptx_path)
+            model = self._get_slide_model(pptx_path)
             slide_data = {
                 "meta": {
-                    "total_slides": len(prs.slides),
+                    "total_slides": len(model),
                     "title": "Extracted Presentation"
                 },
                 "slides": []
             }
-            
-            for slide_idx, slide in enumerate(prs.slides):
-                slide_content = {
+
+            for slide_idx, slide_model in enumerate(model):
+                slide_data["slides"].append({
                     "slide_number": slide_idx + 1,
-                    "layout": f"layout_{slide.slide_layout.slide_layout.slide_layout.slide_index if hasattr(slide.slide_layout, 'slide_layout') else 0}",
-                    "content": []
-                }
-                
-                # Extract content from each shape
-                for shape_idx, shape in enumerate(slide.shapes):
-                    shape_info = {
-                        "shape_id": shape_idx,
-                        "type": str(shape.shape_type)
-                    }
-                    
-                    # Extract text content
-                    if hasattr(shape, 'text') and shape.text:
-                        shape_info["text"] = shape.text
-                        shape_info["type"] = "text"
-                        
-                        # Try to determine if it's a title or content
-                        if shape_idx == 0 or 'title' in str(shape.name).lower():
-                            shape_info["is_title"] = True
-                        else:
-                            shape_info["is_title"] = False
-                    
-                    # Extract table content
-                    elif shape.shape_type == MSO_SHAPE_TYPE.TABLE:
-                        shape_info["type"] = "table"
-                        try:
-                            table = shape.table
-                            table_data = []
-                            for row in table.rows:
-                                row_data = []
-                                for cell in row.cells:
-                                    row_data.append(cell.text.strip())
-                                table_data.append(row_data)
-                            shape_info["table_data"] = table_data
-                        except Exception as e:
-                            shape_info["table_data"] = f"Table extraction error: {e}"
-                    
-                    # Extract chart info
-                    elif shape.shape_type == MSO_SHAPE_TYPE.CHART:
-                        shape_info["type"] = "chart"
-                        shape_info["chart_type"] = "chart_element"
-                    
-                    # Add shape if it has content
-                    if any(key in shape_info for key in ["text", "table_data", "chart_type"]):
-                        slide_content["content"].append(shape_info)
-                
-                slide_data["slides"].append(slide_content)
-            
+                    "layout": f"layout_{slide_model.layout_index}",
+                    "content": self._slide_context(slide_model)
+                })
+
             return slide_data
-            
+
         except Exception as e:
             print(f"Error extracting slide content: {e}")
             import traceback
             traceback.print_exc()
             raise
 
+    def _slide_context(self, slide_model: SlideRecord) -> List[Dict[str, Any]]:
+        """
+        AI context items for one slide, cached by slide fingerprint. The result is
+        shared between decks and must be treated as read-only.
+        """
+        fingerprint = slide_model.fingerprint
+        if fingerprint is not None:
+            with self._extraction_lock:
+                content = self._slide_context_cache.get(fingerprint)
+                if content is not None:
+                    self._slide_context_cache.move_to_end(fingerprint)
+                    return content
+
+        content = []
+        for shape in slide_model.shapes:
+            shape_info = {
+                "shape_id": shape.index,
+                "type": shape.shape_type
+            }
+
+            # Extract text content
+            if shape.text:
+                shape_info["text"] = shape.text
+                shape_info["type"] = "text"
+                # Try to determine if it's a title or content
+                shape_info["is_title"] = shape.index == 0 or 'title' in shape.name.lower()
+
+            # Extract table content
+            elif shape.kind == "table":
+                shape_info["type"] = "table"
+                if shape.table_error:
+                    shape_info["table_data"] = f"Table extraction error: {shape.table_error}"
+                else:
+                    shape_info["table_data"] = [list(row) for row in shape.table]
+
+            # Extract chart info
+            elif shape.kind == "chart":
+                shape_info["type"] = "chart"
+                chart = shape.chart
+                if chart is not None:
+                    shape_info["chart_type"] = chart.chart_type
+                    shape_info["categories"] = list(chart.categories)
+                    shape_info["series"] = self._chart_series(chart)
+                else:
+                    shape_info["chart_type"] = "chart_element"
+
+            # Add shape if it has content
+            if any(key in shape_info for key in ["text", "table_data", "chart_type"]):
+                content.append(shape_info)
+
+        if fingerprint is not None:
+            with self._extraction_lock:
+                self._slide_context_cache[fingerprint] = content
+                while len(self._slide_context_cache) > self.slide_cache_size:
+                    self._slide_context_cache.popitem(last=False)
+        return content
+
     def preview_edits(self, pptx_path, edit_instructions, target_slide_number=None):
         """
         Generate a preview of edits without actually modifying the file
@@ -1809,7 +2561,7 @@ class PPTService:
         """
         try:
             # Load presentation
-            prs = Presentation(pptx_path)
+            prs = self._load_presentation(pptx_path)
             preview_data = {
                 "slides": [],
                 "edit_summary": [],
@@ -1967,4 +2719,54 @@ class PPTService:
             
         except Exception as e:
             print(f"Error checking slide application: {e}")
-            return True  # Default to applying the instruction 
\ No newline at end of file
+            return True  # Default to applying the instruction 
+
+
+class EditPipeline:
+    """
+    Single-parse edit round trip: the AI context is read from the package XML without
+    loading media, and the deck is parsed once, only when the edits are applied.
+    """
+
+    def __init__(self, ppt_service: PPTService, pptx_path: str):
+        self.ppt_service = ppt_service
+        self.pptx_path = pptx_path
+        self._presentation = None
+        self._slide_data = None
+        self._text_index = None
+        self._text_editor = None
+
+    @property
+    def presentation(self):
+        """The parsed deck, loaded on first use"""
+        if self._presentation is None:
+            self._presentation = Presentation(self.pptx_path)
+        return self._presentation
+
+    def text_index(self) -> DeckTextIndex:
+        """
+        Text index of the deck, kept current while edits are applied. Built from the
+        slide XML while the deck has not been parsed, which is enough for text edits.
+        """
+        if self._text_index is None:
+            if self._presentation is None:
+                self._text_editor = PackageTextEditor(self.pptx_path)
+                self._text_index = self._text_editor.text_index()
+            else:
+                self._text_index = DeckTextIndex(self._presentation)
+        return self._text_index
+
+    def slide_data(self) -> Dict[str, Any]:
+        """Slide structure used as context for the AI"""
+        if self._slide_data is None:
+            self._slide_data = self.ppt_service.extract_slide_data_from_ppt(self.pptx_path)
+        return self._slide_data
+
+    def apply(self, edit_instructions: Dict[str, Any], atomic: bool = True) -> str:
+        """Apply edits to the parsed presentation and save it"""
+        if self._text_editor is not None and "edits" in edit_instructions:
+            output_path = self.ppt_service.edit_package_text(self._text_editor, edit_instructions["edits"], atomic)
+            if output_path is not None:
+                return output_path
+        return self.ppt_service.edit_presentation(self.presentation, edit_instructions, self.text_index(), atomic,
+                                                  self.pptx_path)
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from pptx import Presentation
+
+
+class DeckSession:
+    """
+    An uploaded deck kept parsed in memory between requests
+    """
+    __slots__ = ("deck_id", "path", "filename", "presentation", "slide_content",
+                 "text_index", "memory_bytes", "created_at", "last_access", "lock")
+
+    def __init__(self, deck_id: str, path: str, filename: str, presentation, memory_bytes: int):
+        self.deck_id = deck_id
+        self.path = path
+        self.filename = filename
+        self.presentation = presentation
+        self.slide_content = None  # extract_slide_content result, filled on first use
+        self.text_index = None  # DeckTextIndex over presentation, built on first use and kept current by edits
+        self.memory_bytes = memory_bytes
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        # Held by every request that reads or edits the parsed deck, so edits never interleave
+        self.lock = asyncio.Lock()
+
+
+class SessionService:
+    """
+    Server-side deck sessions: upload once, then preview and apply edits by deck ID.
+    Sessions are evicted least recently used first when the count or memory cap is
+    exceeded, and expire after a period of inactivity.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_sessions: Optional[int] = None,
+                 max_memory_bytes: Optional[int] = None):
+        self.session_dir = os.path.join("outputs", "sessions")
+        os.makedirs(self.session_dir, exist_ok=True)
+
+        self.ttl_seconds = ttl_seconds or int(os.getenv("SESSION_TTL_SECONDS", "1800"))
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_COUNT", "50"))
+        self.max_memory_bytes = max_memory_bytes or int(os.getenv("SESSION_MAX_MEMORY_BYTES", str(1024 * 1024 * 1024)))
+
+        self._sessions = OrderedDict()  # deck_id -> DeckSession, least recently used first
+        self._lock = threading.RLock()
+
+    def create_session(self, pptx_path: str, filename: str) -> DeckSession:
+        """
+        Copy an uploaded deck into the session directory, parse it once and register
+        a session for it. The copy is the session's own, so edits saved over it never
+        touch the shared upload.
+        """
+        deck_id = uuid.uuid4().hex
+        session_path = os.path.join(self.session_dir, f"{deck_id}.pptx")
+        shutil.copyfile(pptx_path, session_path)
+
+        try:
+            presentation = Presentation(session_path)
+        except Exception:
+            os.unlink(session_path)
+            raise
+
+        session = DeckSession(deck_id, session_path, filename, presentation,
+                              self._estimate_memory(session_path))
+
+        with self._lock:
+            self._sessions[deck_id] = session
+            self._evict(keep=deck_id)
+
+        print(f"🗂️ Created deck session {deck_id} for {filename} ({len(self._sessions)} active)")
+        return session
+
+    def get_session(self, deck_id: str) -> Optional[DeckSession]:
+        """
+        Look up a live session and mark it as recently used
+        """
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(deck_id)
+            if session is None:
+                return None
+            session.last_access = time.time()
+            self._sessions.move_to_end(deck_id)
+            return session
+
+    def update_session(self, session: DeckSession, edited_path: str):
+        """
+        Point a session at its edited deck after edits were applied to its presentation
+        """
+        if os.path.abspath(edited_path) != os.path.abspath(session.path):
+            shutil.copyfile(edited_path, session.path)
+        with self._lock:
+            session.slide_content = None
+            session.memory_bytes = self._estimate_memory(session.path)
+            session.last_access = time.time()
+            self._evict(keep=session.deck_id)
+
+    def delete_session(self, deck_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(deck_id, None)
+        if session is None:
+            return False
+        self._discard(session)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active_sessions": len(self._sessions),
+                "memory_bytes": sum(s.memory_bytes for s in self._sessions.values()),
+                "max_sessions": self.max_sessions,
+                "max_memory_bytes": self.max_memory_bytes,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+    def _estimate_memory(self, pptx_path: str) -> int:
+        """
+        python-pptx holds every part uncompressed, so the uncompressed package size
+        is a good proxy for the memory a parsed deck occupies
+        """
+        try:
+            with zipfile.ZipFile(pptx_path) as package:
+                return sum(info.file_size for info in package.infolist())
+        except Exception:
+            return os.path.getsize(pptx_path)
+
+    def _expire(self):
+        # A session a request holds the lock of is in use, it expires once released
+        now = time.time()
+        expired = [deck_id for deck_id, session in self._sessions.items()
+                   if now - session.last_access > self.ttl_seconds and not session.lock.locked()]
+        for deck_id in expired:
+            print(f"⌛ Deck session {deck_id} expired")
+            self._discard(self._sessions.pop(deck_id))
+
+    def _evict(self, keep: Optional[str] = None):
+        """
+        Drop expired sessions, then least recently used ones until within the caps.
+        Sessions in use by a request (their lock is held) are never dropped.
+        """
+        self._expire()
+        total_memory = sum(s.memory_bytes for s in self._sessions.values())
+        for deck_id in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions and total_memory <= self.max_memory_bytes:
+                break
+            if deck_id == keep or self._sessions[deck_id].lock.locked():
+                continue
+            session = self._sessions.pop(deck_id)
+            total_memory -= session.memory_bytes
+            print(f"🧹 Evicted deck session {deck_id}")
+            self._discard(session)
+
+    def _discard(self, session: DeckSession):
+        session.presentation = None
+        session.slide_content = None
+        session.text_index = None
+        try:
+            os.unlink(session.path)
+        except OSError:
+            pass
@@ -0,0 +1,163 @@
+import math
+import sys
+from array import array
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from pptx.enum.shapes import PP_PLACEHOLDER
+
+
+class FontInfo:
+    """
+    Formatting of the first run of a shape's text
+    """
+    __slots__ = ("font_name", "font_size", "bold", "italic")
+
+    def __init__(self, font_name: Optional[str] = None, font_size: Optional[float] = None,
+                 bold: Optional[bool] = None, italic: Optional[bool] = None):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.bold = bold
+        self.italic = italic
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"font_name": self.font_name, "font_size": self.font_size,
+                "bold": self.bold, "italic": self.italic}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FontInfo":
+        return cls(data.get("font_name"), data.get("font_size"), data.get("bold"), data.get("italic"))
+
+
+class ChartRecord:
+    """
+    Chart type, categories and series read from a chart part. Series values are
+    double arrays with NaN marking gaps.
+    """
+    __slots__ = ("chart_type", "categories", "series")
+
+    def __init__(self, chart_type: str, categories: List[str], series: List[tuple]):
+        self.chart_type = sys.intern(chart_type)
+        self.categories = tuple(categories)
+        self.series = tuple((name, values if isinstance(values, array) else array("d", values))
+                            for name, values in series)
+
+    def series_values(self) -> List[tuple]:
+        """(name, values) pairs with None for gaps"""
+        return [(name, [None if math.isnan(value) else value for value in values])
+                for name, values in self.series]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chart_type": self.chart_type,
+            "categories": list(self.categories),
+            "series": [[name, values] for name, values in self.series_values()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChartRecord":
+        series = [(name, array("d", (math.nan if value is None else value for value in values)))
+                  for name, values in data.get("series", [])]
+        return cls(data.get("chart_type", "column"), data.get("categories", []), series)
+
+
+class ShapeRecord:
+    """
+    One shape of a slide, as recorded by a single extraction pass
+    """
+    __slots__ = ("index", "name", "shape_type", "kind", "text", "is_title_shape",
+                 "is_placeholder", "placeholder_type", "placeholder_idx",
+                 "left", "top", "width", "height", "font", "table", "table_error", "chart")
+
+    def __init__(self, index: int, name: str, shape_type: str, kind: Optional[str] = None,
+                 text: Optional[str] = None, is_title_shape: bool = False, is_placeholder: bool = False,
+                 placeholder_type=None, placeholder_idx: Optional[int] = None,
+                 left: Optional[int] = None, top: Optional[int] = None,
+                 width: Optional[int] = None, height: Optional[int] = None,
+                 font: Optional[FontInfo] = None, table: Optional[List[List[str]]] = None,
+                 table_error: Optional[str] = None, chart: Optional[ChartRecord] = None):
+        self.index = index
+        # Names and types repeat across slides, so share one copy of each
+        self.name = sys.intern(name)
+        self.shape_type = sys.intern(shape_type)
+        self.kind = kind
+        self.text = text
+        self.is_title_shape = is_title_shape
+        self.is_placeholder = is_placeholder
+        self.placeholder_type = placeholder_type
+        self.placeholder_idx = placeholder_idx
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.font = font
+        self.table = tuple(tuple(row) for row in table) if table is not None else None
+        self.table_error = table_error
+        self.chart = chart
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {slot: getattr(self, slot) for slot in self.__slots__}
+        data["font"] = self.font.to_dict() if self.font is not None else None
+        data["table"] = [list(row) for row in self.table] if self.table is not None else None
+        data["chart"] = self.chart.to_dict() if self.chart is not None else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ShapeRecord":
+        fields = {slot: data.get(slot) for slot in cls.__slots__}
+        fields["is_title_shape"] = bool(data.get("is_title_shape"))
+        fields["is_placeholder"] = bool(data.get("is_placeholder"))
+        if fields["placeholder_type"] is not None:
+            fields["placeholder_type"] = PP_PLACEHOLDER(fields["placeholder_type"])
+        if fields["font"] is not None:
+            fields["font"] = FontInfo.from_dict(fields["font"])
+        if fields["chart"] is not None:
+            fields["chart"] = ChartRecord.from_dict(fields["chart"])
+        return cls(**fields)
+
+
+class SlideRecord:
+    """
+    Everything extraction needs to know about one slide
+    """
+    __slots__ = ("title", "layout_index", "shapes", "fingerprint")
+
+    def __init__(self, title: Optional[str] = None, layout_index: int = 0,
+                 shapes: Optional[List[ShapeRecord]] = None, fingerprint: Optional[str] = None):
+        self.title = title
+        self.layout_index = layout_index
+        self.shapes = shapes if shapes is not None else []
+        # PackageReader.slide_fingerprints digest, when read from a package on disk
+        self.fingerprint = fingerprint
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "layout_index": self.layout_index,
+            "shapes": [shape.to_dict() for shape in self.shapes],
+            "fingerprint": self.fingerprint
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SlideRecord":
+        return cls(data.get("title"), data.get("layout_index", 0),
+                   [ShapeRecord.from_dict(shape) for shape in data.get("shapes", [])],
+                   data.get("fingerprint"))
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """
+    Approximate memory held by an object graph, counting shared objects once
+    """
+    seen = seen if seen is not None else set()
+    if id(obj) in seen or obj is None or isinstance(obj, (bool, Enum)):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(type(obj), "__slots__") and not isinstance(obj, (str, bytes, array)):
+        size += sum(deep_sizeof(getattr(obj, slot, None), seen) for slot in type(obj).__slots__)
+    return size
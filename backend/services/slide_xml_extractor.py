@@ -0,0 +1,417 @@
+import math
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+from lxml import etree
+from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER
+from services.package_reader import PackageReader, NS, RT_SLIDE_LAYOUT
+from services.slide_model import ChartRecord, FontInfo, ShapeRecord, SlideRecord
+
+RT_SLIDE_MASTER = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster"
+
+GRAPHIC_DATA_URI_CHART = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+GRAPHIC_DATA_URI_TABLE = "http://schemas.openxmlformats.org/drawingml/2006/table"
+GRAPHIC_DATA_URI_OLEOBJ = "http://schemas.openxmlformats.org/presentationml/2006/ole"
+
+
+def _qn(tag: str) -> str:
+    prefix, local = tag.split(":")
+    return f"{{{NS[prefix]}}}{local}"
+
+
+SP_TREE = _qn("p:spTree")
+SHAPE_TAGS = {_qn(tag) for tag in ("p:sp", "p:grpSp", "p:graphicFrame", "p:cxnSp", "p:pic", "p:contentPart")}
+
+# Layout placeholders inherit from the master placeholder of this type
+MASTER_PLACEHOLDER_TYPES = {
+    "title": "title",
+    "ctrTitle": "title",
+    "dt": "dt",
+    "ftr": "ftr",
+    "sldNum": "sldNum",
+}
+
+XSD_TRUE = ("1", "true")
+
+# Plot elements mapped to the chart layouts the generator supports (chart.<type>)
+CHART_LAYOUT_TYPES = {
+    "lineChart": "line",
+    "line3DChart": "line",
+    "areaChart": "line",
+    "area3DChart": "line",
+    "scatterChart": "line",
+    "radarChart": "line",
+    "stockChart": "line",
+    "pieChart": "pie",
+    "pie3DChart": "pie",
+    "ofPieChart": "pie",
+    "doughnutChart": "pie",
+}
+
+# Where a category or value reference keeps its cached points, most common first
+POINT_CACHES = (
+    "c:numRef/c:numCache",
+    "c:strRef/c:strCache",
+    "c:multiLvlStrRef/c:multiLvlStrCache/c:lvl",
+    "c:numLit",
+    "c:strLit",
+)
+
+
+class SlideXmlExtractor:
+    """
+    Builds the slide model (SlideRecord, as PPTService._build_slide_model does) straight
+    from the package XML. Slide parts are parsed incrementally and yielded one at a time,
+    so the first slides are available before the rest of the deck has been read.
+    """
+
+    def __init__(self, pptx_path: str):
+        self.reader = PackageReader(pptx_path)
+        self._slide_partnames = self.reader.slide_partnames()
+        self._layout_order = self._first_master_layouts()
+        self._placeholder_cache = {}  # layout/master partname -> placeholder geometry
+
+    def close(self):
+        self.reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def slide_count(self) -> int:
+        return len(self._slide_partnames)
+
+    def iter_slides(self, start: int = 0, stop: Optional[int] = None) -> Iterator[SlideRecord]:
+        for partname in self._slide_partnames[start:stop]:
+            yield self._slide_model(partname)
+
+    def slide_model(self, index: int) -> SlideRecord:
+        return self._slide_model(self._slide_partnames[index])
+
+    def slide_fingerprints(self) -> List[Dict[str, Any]]:
+        return self.reader.slide_fingerprints()
+
+    def _first_master_layouts(self) -> List[str]:
+        """
+        Layout part names of the first slide master in order, matching prs.slide_layouts
+        """
+        masters = {rel["id"]: rel["target"] for rel in self.reader.rels("ppt/presentation.xml")
+                   if rel["type"] == RT_SLIDE_MASTER}
+        master_ids = self.reader.read_xml("ppt/presentation.xml").findall("p:sldMasterIdLst/p:sldMasterId", NS)
+        if not master_ids:
+            return []
+        master = masters.get(master_ids[0].get(f"{{{NS['r']}}}id"))
+        if master is None:
+            return []
+        layouts = {rel["id"]: rel["target"] for rel in self.reader.rels(master)}
+        return [
+            layouts[layout_id.get(f"{{{NS['r']}}}id")]
+            for layout_id in self.reader.read_xml(master).findall("p:sldLayoutIdLst/p:sldLayoutId", NS)
+            if layout_id.get(f"{{{NS['r']}}}id") in layouts
+        ]
+
+    def _related(self, partname: str, reltype: str) -> Optional[str]:
+        for rel in self.reader.rels(partname):
+            if rel["type"] == reltype and not rel["external"]:
+                return rel["target"]
+        return None
+
+    def _slide_model(self, partname: str) -> SlideRecord:
+        layout = self._related(partname, RT_SLIDE_LAYOUT)
+        try:
+            layout_index = self._layout_order.index(layout)
+        except ValueError:
+            layout_index = 0
+
+        model = SlideRecord(layout_index=layout_index)
+        shape_idx = 0
+        with self.reader.open(partname) as part:
+            for _, element in etree.iterparse(part, events=("end",), tag=SHAPE_TAGS):
+                # Members of a group are part of the group, not shapes of the slide
+                parent = element.getparent()
+                if parent is None or parent.tag != SP_TREE:
+                    continue
+                try:
+                    shape = self._shape_model(shape_idx, element, partname, layout)
+                    if model.title is None and shape.is_placeholder and shape.placeholder_idx == 0:
+                        shape.is_title_shape = True
+                        model.title = shape.text
+                    model.shapes.append(shape)
+                except Exception as e:
+                    print(f"   ❌ Error processing shape {shape_idx + 1} in {partname}: {e}")
+                shape_idx += 1
+                # Processed shapes are no longer needed, keep the tree small
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+        return model
+
+    def _shape_model(self, shape_idx: int, element, slide: str, layout: Optional[str]) -> ShapeRecord:
+        tag = etree.QName(element).localname
+        c_nv_pr = element.find("./*[1]/p:cNvPr", NS)
+        ph = element.find("./*[1]/p:nvPr/p:ph", NS)
+        graphic_data_uri = None
+        if tag == "graphicFrame":
+            graphic_data = element.find("a:graphic/a:graphicData", NS)
+            graphic_data_uri = graphic_data.get("uri") if graphic_data is not None else None
+
+        kind = None
+        if graphic_data_uri == GRAPHIC_DATA_URI_TABLE:
+            kind = "table"
+        elif graphic_data_uri == GRAPHIC_DATA_URI_CHART:
+            kind = "chart"
+        elif tag == "pic" and element.find("p:nvPicPr/p:nvPr/a:videoFile", NS) is None:
+            kind = "image"
+
+        placeholder_type = None
+        placeholder_idx = None
+        if ph is not None:
+            placeholder_type = PP_PLACEHOLDER.from_xml(ph.get("type", "obj"))
+            placeholder_idx = int(ph.get("idx", "0"))
+
+        geometry = self._geometry(element)
+        if ph is not None and None in geometry and layout is not None:
+            inherited = self._layout_placeholder_geometry(layout, placeholder_idx)
+            geometry = tuple(own if own is not None else base for own, base in zip(geometry, inherited))
+        left, top, width, height = geometry
+
+        text = None
+        if tag == "sp":
+            tx_body = element.find("p:txBody", NS)
+            text = self._text_body_text(tx_body) if tx_body is not None else ""
+
+        shape_model = ShapeRecord(
+            index=shape_idx,
+            name=c_nv_pr.get("name", "") if c_nv_pr is not None else "",
+            shape_type=str(self._shape_type(tag, element, ph, graphic_data_uri)),
+            kind=kind,
+            text=text,
+            is_placeholder=ph is not None,
+            placeholder_type=placeholder_type,
+            placeholder_idx=placeholder_idx,
+            left=left,
+            top=top,
+            width=width,
+            height=height,
+            font=self._first_run_font(element.find("p:txBody", NS)) if text else None
+        )
+
+        if kind == "chart":
+            shape_model.chart = self._chart(element, slide)
+
+        if kind == "table":
+            shape_model.table = tuple(
+                tuple(self._text_body_text(tc.find("a:txBody", NS)).strip() for tc in tr.findall("a:tc", NS))
+                for tr in element.findall("a:graphic/a:graphicData/a:tbl/a:tr", NS)
+            )
+
+        return shape_model
+
+    def _shape_type(self, tag: str, element, ph, graphic_data_uri: Optional[str]):
+        """
+        Same MSO_SHAPE_TYPE python-pptx reports for the shape
+        """
+        if ph is not None and tag in ("sp", "pic", "graphicFrame"):
+            return MSO_SHAPE_TYPE.PLACEHOLDER
+        if tag == "sp":
+            if element.find("p:spPr/a:custGeom", NS) is not None:
+                return MSO_SHAPE_TYPE.FREEFORM
+            is_textbox = element.find("p:nvSpPr/p:cNvSpPr", NS)
+            is_textbox = is_textbox is not None and is_textbox.get("txBox") in XSD_TRUE
+            if element.find("p:spPr/a:prstGeom", NS) is not None and not is_textbox:
+                return MSO_SHAPE_TYPE.AUTO_SHAPE
+            if is_textbox:
+                return MSO_SHAPE_TYPE.TEXT_BOX
+            return None
+        if tag == "pic":
+            return MSO_SHAPE_TYPE.PICTURE if element.find("p:nvPicPr/p:nvPr/a:videoFile", NS) is None \
+                else MSO_SHAPE_TYPE.MEDIA
+        if tag == "graphicFrame":
+            if graphic_data_uri == GRAPHIC_DATA_URI_CHART:
+                return MSO_SHAPE_TYPE.CHART
+            if graphic_data_uri == GRAPHIC_DATA_URI_TABLE:
+                return MSO_SHAPE_TYPE.TABLE
+            if graphic_data_uri == GRAPHIC_DATA_URI_OLEOBJ:
+                embedded = element.find("a:graphic/a:graphicData/p:oleObj/p:embed", NS) is not None
+                return MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT if embedded else MSO_SHAPE_TYPE.LINKED_OLE_OBJECT
+            return None
+        if tag == "grpSp":
+            return MSO_SHAPE_TYPE.GROUP
+        if tag == "cxnSp":
+            return MSO_SHAPE_TYPE.LINE
+        return None
+
+    def _geometry(self, element) -> tuple:
+        xfrm = element.find("p:spPr/a:xfrm", NS)
+        if xfrm is None:
+            xfrm = element.find("p:xfrm", NS)
+        if xfrm is None:
+            xfrm = element.find("p:grpSpPr/a:xfrm", NS)
+        off = xfrm.find("a:off", NS) if xfrm is not None else None
+        ext = xfrm.find("a:ext", NS) if xfrm is not None else None
+
+        def emu(node, attr):
+            return int(node.get(attr)) if node is not None and node.get(attr) is not None else None
+
+        return emu(off, "x"), emu(off, "y"), emu(ext, "cx"), emu(ext, "cy")
+
+    def _placeholders(self, partname: str) -> List[Dict[str, Any]]:
+        """
+        Placeholders of a layout or master with their own geometry
+        """
+        if partname not in self._placeholder_cache:
+            placeholders = []
+            sp_tree = self.reader.read_xml(partname).find("p:cSld/p:spTree", NS)
+            for element in (sp_tree if sp_tree is not None else []):
+                if element.tag not in SHAPE_TAGS:
+                    continue
+                ph = element.find("./*[1]/p:nvPr/p:ph", NS)
+                if ph is None:
+                    continue
+                placeholders.append({
+                    "idx": int(ph.get("idx", "0")),
+                    "type": ph.get("type", "obj"),
+                    "inherits": element.tag == _qn("p:sp"),
+                    "geometry": self._geometry(element)
+                })
+            self._placeholder_cache[partname] = placeholders
+        return self._placeholder_cache[partname]
+
+    def _layout_placeholder_geometry(self, layout: str, idx: int) -> tuple:
+        """
+        Geometry a slide placeholder inherits: the layout placeholder with the same idx,
+        which in turn inherits from the master placeholder of the matching type
+        """
+        for placeholder in self._placeholders(layout):
+            if placeholder["idx"] != idx:
+                continue
+            geometry = placeholder["geometry"]
+            master = self._related(layout, RT_SLIDE_MASTER)
+            if None in geometry and placeholder["inherits"] and master is not None:
+                master_type = MASTER_PLACEHOLDER_TYPES.get(placeholder["type"], "body")
+                for base in self._placeholders(master):
+                    if base["type"] == master_type:
+                        geometry = tuple(own if own is not None else inherited
+                                         for own, inherited in zip(geometry, base["geometry"]))
+                        break
+            return geometry
+        return (None, None, None, None)
+
+    def _text_body_text(self, tx_body) -> str:
+        """
+        Paragraphs joined by newlines, line breaks as vertical tabs, as python-pptx reports it
+        """
+        if tx_body is None:
+            return ""
+        paragraphs = []
+        for paragraph in tx_body.findall("a:p", NS):
+            parts = []
+            for child in paragraph:
+                localname = etree.QName(child).localname
+                if localname == "br":
+                    parts.append("\v")
+                elif localname in ("r", "fld"):
+                    t = child.find("a:t", NS)
+                    parts.append((t.text or "") if t is not None else "")
+            paragraphs.append("".join(parts))
+        return "\n".join(paragraphs)
+
+    def _first_run_font(self, tx_body) -> Optional[FontInfo]:
+        if tx_body is None:
+            return None
+        run = tx_body.find("a:p/a:r", NS)
+        first_paragraph = tx_body.find("a:p", NS)
+        if run is None or run.getparent() is not first_paragraph:
+            return None
+
+        r_pr = run.find("a:rPr", NS)
+        latin = r_pr.find("a:latin", NS) if r_pr is not None else None
+
+        def xsd_bool(attr):
+            value = r_pr.get(attr) if r_pr is not None else None
+            return None if value is None else value in XSD_TRUE
+
+        size = r_pr.get("sz") if r_pr is not None else None
+        return FontInfo(
+            font_name=latin.get("typeface") if latin is not None else None,
+            font_size=int(size) / 100 if size is not None else None,
+            bold=xsd_bool("b"),
+            italic=xsd_bool("i")
+        )
+
+    def _chart(self, graphic_frame, slide: str) -> Optional[ChartRecord]:
+        chart = graphic_frame.find("a:graphic/a:graphicData/c:chart", NS)
+        if chart is None:
+            return None
+        rel_id = chart.get(f"{{{NS['r']}}}id")
+        for rel in self.reader.rels(slide):
+            if rel["id"] == rel_id and not rel["external"] and self.reader.has_part(rel["target"]):
+                return self.read_chart(self.reader.read_xml(rel["target"]))
+        return None
+
+    @staticmethod
+    def read_chart(chart_space) -> ChartRecord:
+        """
+        Chart type, categories and series values from the data cached in a chart part
+        (c:chartSpace), so the embedded workbook is never opened. Values are kept as
+        compact double arrays with NaN marking gaps.
+        """
+        plot_area = chart_space.find("c:chart/c:plotArea", NS)
+        plots = [child for child in (plot_area if plot_area is not None else [])
+                 if etree.QName(child).localname.endswith("Chart")]
+
+        chart_type = "column"
+        if plots:
+            plot_type = etree.QName(plots[0]).localname
+            if plot_type in ("barChart", "bar3DChart"):
+                bar_dir = plots[0].find("c:barDir", NS)
+                chart_type = "bar" if bar_dir is not None and bar_dir.get("val") == "bar" else "column"
+            else:
+                chart_type = CHART_LAYOUT_TYPES.get(plot_type, "column")
+
+        categories = None
+        series = []
+        for plot in plots:
+            for ser in plot.findall("c:ser", NS):
+                if categories is None:
+                    points = SlideXmlExtractor._cached_points(ser, ("c:cat", "c:xVal"))
+                    if points is not None:
+                        categories = ["" if point is None else point for point in points]
+
+                values = array("d")
+                for point in SlideXmlExtractor._cached_points(ser, ("c:val", "c:yVal")) or []:
+                    try:
+                        values.append(float(point))
+                    except (TypeError, ValueError):
+                        values.append(math.nan)
+
+                name = ser.find("c:tx/c:strRef/c:strCache/c:pt/c:v", NS)
+                if name is None:
+                    name = ser.find("c:tx/c:v", NS)
+                series.append((name.text if name is not None and name.text else f"Series {len(series) + 1}", values))
+
+        return ChartRecord(chart_type, categories or [], series)
+
+    @staticmethod
+    def _cached_points(ser, containers) -> Optional[List[Optional[str]]]:
+        """
+        Point values of the first container present, by index, None for missing points
+        """
+        for container_tag in containers:
+            container = ser.find(container_tag, NS)
+            if container is None:
+                continue
+            for cache_tag in POINT_CACHES:
+                cache = container.find(cache_tag, NS)
+                if cache is None:
+                    continue
+                points = {}
+                for pt in cache.findall("c:pt", NS):
+                    value = pt.find("c:v", NS)
+                    points[int(pt.get("idx", "0"))] = value.text if value is not None else None
+                count = cache.find("c:ptCount", NS)
+                size = int(count.get("val")) if count is not None else max(points, default=-1) + 1
+                return [points.get(idx) for idx in range(size)]
+        return None
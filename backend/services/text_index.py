@@ -0,0 +1,295 @@
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_token(token: str) -> str:
+    return unicodedata.normalize("NFKC", token).casefold()
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Normalized word tokens of a text with their character spans in it
+    """
+    return [(normalize_token(match.group()), match.start(), match.end())
+            for match in TOKEN_PATTERN.finditer(text or "")]
+
+
+class TextSegment:
+    """
+    A stretch of a shape's text: one run, or a line break or field (run_index None)
+    """
+    __slots__ = ("paragraph_index", "run_index", "start", "end")
+
+    def __init__(self, paragraph_index: int, run_index: Optional[int], start: int, end: int):
+        self.paragraph_index = paragraph_index
+        self.run_index = run_index
+        self.start = start
+        self.end = end
+
+
+class ShapeText:
+    """
+    Text of one shape as shape.text returns it, with its tokens and run segments
+    """
+    __slots__ = ("slide_index", "shape_index", "name", "text", "folded", "tokens", "segments")
+
+    def __init__(self, slide_index: int, shape_index: int, name: str, text: str,
+                 segments: List[TextSegment]):
+        self.slide_index = slide_index
+        self.shape_index = shape_index
+        self.name = name
+        self.text = text
+        self.folded = None  # casefolded text, built on the first substring lookup
+        self.tokens = tokenize(text)
+        self.segments = segments
+
+    def segments_in(self, start: int, end: int) -> List[TextSegment]:
+        return [segment for segment in self.segments if segment.start < end and segment.end > start]
+
+
+class TextMatch:
+    """
+    One occurrence of a phrase: a character span of a shape's text
+    """
+    __slots__ = ("slide_index", "shape_index", "start", "end", "text", "exact", "confidence")
+
+    def __init__(self, slide_index: int, shape_index: int, start: int, end: int, text: str, exact: bool,
+                 confidence: float = 1.0):
+        self.slide_index = slide_index
+        self.shape_index = shape_index
+        self.start = start
+        self.end = end
+        self.text = text
+        self.exact = exact
+        self.confidence = confidence
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "slide_number": self.slide_index + 1,
+            "shape_id": self.shape_index,
+            "start": self.start,
+            "end": self.end,
+            "text": self.text,
+            "confidence": round(self.confidence, 3)
+        }
+
+
+class DeckTextIndex:
+    """
+    Positional inverted index over the text of a parsed deck: every normalized token
+    maps to the shapes and token positions it occurs at, and each shape keeps the
+    paragraph/run segments of its text. Phrases resolve by intersecting postings
+    instead of scanning shapes, and edits re-index only the slide they touched.
+    """
+
+    def __init__(self, prs=None):
+        self._shapes = {}  # (slide_index, shape_index) -> ShapeText
+        self._slides = defaultdict(list)  # slide_index -> shape keys in shape order
+        self._postings = defaultdict(list)  # token -> [(shape key, token position)]
+        self._trigrams = None  # trigram -> tokens containing it, built on the first fuzzy lookup
+        if prs is not None:
+            for slide_index, slide in enumerate(prs.slides):
+                self._add_slide(slide_index, slide)
+
+    def reindex_slide(self, slide_index: int, slide):
+        """
+        Rebuild the entries of one slide after its shapes or text changed
+        """
+        stale = set(self._slides.pop(slide_index, []))
+        if stale:
+            for token in {token for key in stale for token, _, _ in self._shapes[key].tokens}:
+                postings = [posting for posting in self._postings[token] if posting[0] not in stale]
+                if postings:
+                    self._postings[token] = postings
+                else:
+                    del self._postings[token]
+            for key in stale:
+                del self._shapes[key]
+        self._trigrams = None
+        self._add_slide(slide_index, slide)
+
+    def shape_text(self, slide_index: int, shape_index: int) -> Optional[ShapeText]:
+        return self._shapes.get((slide_index, shape_index))
+
+    def slide_shapes(self, slide_index: int) -> List[ShapeText]:
+        return [self._shapes[key] for key in self._slides.get(slide_index, [])]
+
+    def find(self, phrase: str, slide_index: Optional[int] = None) -> List[TextMatch]:
+        """
+        Occurrences of a phrase, in slide and shape order. Words match regardless of
+        case, spacing and punctuation between them; a phrase that is part of a word
+        (e.g. "Benefit" in "Benefits") falls back to a case-insensitive substring
+        match over the indexed text. Exact-case occurrences are flagged.
+        """
+        matches = self._find_tokens(phrase, slide_index)
+        if not matches:
+            matches = self._find_substring(phrase, slide_index)
+        return sorted(matches, key=lambda m: (m.slide_index, m.shape_index, m.start))
+
+    def locate(self, phrase: str, slide_index: Optional[int] = None) -> Optional[TextMatch]:
+        """
+        Best single occurrence of a phrase with a confidence score in 0..1, for find
+        strings that may differ from the deck in punctuation, casing, spacing or a
+        few characters. Exact-case occurrences score 1.0 and normalized word matches
+        0.95. Otherwise every window of about the phrase's length in each candidate
+        shape is scored by similarity of its normalized words. Candidates are the
+        shapes of slide_index, or those sharing a word with the phrase.
+        """
+        matches = self.find(phrase, slide_index)
+        if matches:
+            best = next((match for match in matches if match.exact), matches[0])
+            best.confidence = 1.0 if best.exact else 0.95
+            return best
+
+        query = [token for token, _, _ in tokenize(phrase)]
+        if not query:
+            return None
+        query_text = " ".join(query)
+
+        if slide_index is not None:
+            candidates = list(self._slides.get(slide_index, []))
+        else:
+            # Shapes containing a query word, or a word that shares most of its trigrams
+            candidates = {key for token in query for similar in self._similar_tokens(token)
+                          for key, _ in self._postings.get(similar, ())}
+
+        best = None
+        for key in candidates:
+            shape = self._shapes[key]
+            tokens = shape.tokens
+            for length in {max(1, len(query) - 1), len(query), len(query) + 1}:
+                for first in range(0, max(1, len(tokens) - length + 1)):
+                    window = tokens[first:first + length]
+                    if not window:
+                        continue
+                    matcher = SequenceMatcher(None, query_text, " ".join(token for token, _, _ in window),
+                                              autojunk=False)
+                    # quick_ratio is an upper bound, skip windows that cannot win
+                    if best is not None and matcher.quick_ratio() <= best.confidence:
+                        continue
+                    score = matcher.ratio()
+                    if best is None or score > best.confidence:
+                        start, end = window[0][1], window[-1][2]
+                        best = TextMatch(key[0], key[1], start, end, shape.text[start:end], False, score)
+        return best
+
+    def _similar_tokens(self, token: str) -> List[str]:
+        if token in self._postings:
+            return [token]
+        if self._trigrams is None:
+            self._trigrams = defaultdict(set)
+            for indexed in self._postings:
+                for trigram in self._token_trigrams(indexed):
+                    self._trigrams[trigram].add(indexed)
+
+        trigrams = self._token_trigrams(token)
+        shared = defaultdict(int)
+        for trigram in trigrams:
+            for indexed in self._trigrams.get(trigram, ()):
+                shared[indexed] += 1
+        # Dice coefficient over trigram sets
+        return [indexed for indexed, count in shared.items()
+                if 2 * count / (len(trigrams) + len(self._token_trigrams(indexed))) >= 0.5]
+
+    def _token_trigrams(self, token: str) -> set:
+        padded = f" {token} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def slides_mentioning(self, phrase: str) -> List[int]:
+        """
+        1-based numbers of the slides a phrase occurs on
+        """
+        return sorted({match.slide_index + 1 for match in self.find(phrase)})
+
+    def _find_tokens(self, phrase: str, slide_index: Optional[int]) -> List[TextMatch]:
+        query = [token for token, _, _ in tokenize(phrase)]
+        if not query:
+            return []
+
+        # Walk the rarest token's postings and check the rest of the phrase around it
+        anchor = min(range(len(query)), key=lambda i: len(self._postings.get(query[i], ())))
+        matches = []
+        for key, position in self._postings.get(query[anchor], ()):
+            if slide_index is not None and key[0] != slide_index:
+                continue
+            first = position - anchor
+            shape = self._shapes[key]
+            if first < 0 or first + len(query) > len(shape.tokens):
+                continue
+            if all(shape.tokens[first + i][0] == token for i, token in enumerate(query)):
+                start = shape.tokens[first][1]
+                end = shape.tokens[first + len(query) - 1][2]
+                text = shape.text[start:end]
+                matches.append(TextMatch(key[0], key[1], start, end, text, text == phrase))
+        return matches
+
+    def _find_substring(self, phrase: str, slide_index: Optional[int]) -> List[TextMatch]:
+        needle = (phrase or "").casefold()
+        if not needle.strip():
+            return []
+        keys = self._slides.get(slide_index, []) if slide_index is not None else list(self._shapes)
+        matches = []
+        for key in keys:
+            shape = self._shapes[key]
+            if shape.folded is None:
+                shape.folded = shape.text.casefold()
+            # Casefolding can change lengths (e.g. "ß"), spans are only valid when it does not
+            if len(shape.folded) != len(shape.text):
+                continue
+            start = shape.folded.find(needle)
+            while start != -1:
+                end = start + len(needle)
+                text = shape.text[start:end]
+                matches.append(TextMatch(key[0], key[1], start, end, text, text == phrase))
+                start = shape.folded.find(needle, end)
+        return matches
+
+    def _add_slide(self, slide_index: int, slide):
+        keys = []
+        for shape_index, shape in enumerate(slide.shapes):
+            if not getattr(shape, "has_text_frame", False):
+                continue
+            text, segments = self._read_text_frame(shape.text_frame)
+            if not text.strip():
+                continue
+            key = (slide_index, shape_index)
+            entry = ShapeText(slide_index, shape_index, shape.name, text, segments)
+            self._shapes[key] = entry
+            keys.append(key)
+            for position, (token, _, _) in enumerate(entry.tokens):
+                self._postings[token].append((key, position))
+        self._slides[slide_index] = keys
+
+    def _read_text_frame(self, text_frame) -> Tuple[str, List[TextSegment]]:
+        """
+        Text exactly as shape.text builds it (paragraphs joined by newlines, line
+        breaks as vertical tabs) together with the span of every run
+        """
+        parts = []
+        segments = []
+        offset = 0
+        for paragraph_index, paragraph in enumerate(text_frame.paragraphs):
+            if paragraph_index:
+                parts.append("\n")
+                offset += 1
+            run_index = 0
+            for child in paragraph._p.content_children:
+                tag = child.tag.rsplit("}", 1)[-1]
+                if tag == "r":
+                    text = child.text
+                    segments.append(TextSegment(paragraph_index, run_index, offset, offset + len(text)))
+                    run_index += 1
+                elif tag == "br":
+                    text = "\v"
+                    segments.append(TextSegment(paragraph_index, None, offset, offset + 1))
+                else:
+                    text = child.text
+                    segments.append(TextSegment(paragraph_index, None, offset, offset + len(text)))
+                parts.append(text)
+                offset += len(text)
+        return "".join(parts), segments
@@ -0,0 +1,178 @@
+import os
+import re
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import aiofiles
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size cap"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+        self.max_bytes = max_bytes
+
+
+class UploadStore:
+    """
+    Content-addressed store for uploaded decks, templates and logos. Uploads are
+    hashed while they are written, and each distinct blob is kept once under its
+    SHA-256, so clients can skip re-uploading a file the server already has.
+    Stored blobs are shared between requests and must never be modified in place.
+    A blob handed out within the last eviction_grace_seconds is never evicted, so
+    requests still working on it do not lose the file.
+    """
+
+    def __init__(self, store_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.store_dir = store_dir or os.path.join("outputs", "uploads")
+        self.max_bytes = max_bytes or int(os.getenv("UPLOAD_STORE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+        # Largest single upload accepted; anything bigger is rejected mid-stream
+        self.max_upload_bytes = int(os.getenv("UPLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+        self.chunk_size = 1024 * 1024
+        # Blobs used more recently than this stay even when the store is over its budget
+        self.eviction_grace_seconds = int(os.getenv("UPLOAD_EVICTION_GRACE_SECONDS", "900"))
+
+        self._index = OrderedDict()  # sha256 -> (file name, size), least recently used first
+        self._used_at = {}  # sha256 -> time the blob was last stored or handed out
+        self._lock = threading.Lock()
+        self._load_index()
+
+    async def save(self, upload) -> Dict[str, Any]:
+        """
+        Write an UploadFile into the store chunk by chunk, hashing as it goes.
+        Reads and writes are async, so only one chunk is in memory at a time and
+        the event loop is never blocked on disk. Returns the blob's hash, path and
+        size; an existing copy is reused. Raises UploadTooLargeError past the cap.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        part_path = os.path.join(self.store_dir, f".{uuid.uuid4().hex}.part")
+        try:
+            async with aiofiles.open(part_path, "wb") as part:
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_upload_bytes:
+                        raise UploadTooLargeError(self.max_upload_bytes)
+                    digest.update(chunk)
+                    await part.write(chunk)
+            return self._commit(part_path, digest.hexdigest(), self._suffix(upload.filename), size)
+        finally:
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+
+    def path(self, content_hash: str) -> Optional[str]:
+        """
+        Path of a stored blob, marking it as recently used, or None if it is unknown
+        """
+        content_hash = (content_hash or "").lower()
+        if not SHA256_PATTERN.match(content_hash):
+            return None
+        with self._lock:
+            entry = self._index.get(content_hash)
+            if entry is None:
+                return None
+            blob_path = os.path.join(self.store_dir, entry[0])
+            if not os.path.exists(blob_path):
+                del self._index[content_hash]
+                self._used_at.pop(content_hash, None)
+                return None
+            self._index.move_to_end(content_hash)
+            self._used_at[content_hash] = time.time()
+            # mtime records recency so LRU order survives restarts
+            os.utime(blob_path)
+            return blob_path
+
+    def describe(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        blob_path = self.path(content_hash)
+        if blob_path is None:
+            return None
+        return {"hash": content_hash.lower(), "path": blob_path, "size": os.path.getsize(blob_path)}
+
+    def contains(self, path: str) -> bool:
+        """
+        True when path points at a blob inside the store
+        """
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.store_dir)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": sum(size for _, size in self._index.values()),
+                "max_bytes": self.max_bytes,
+                "max_upload_bytes": self.max_upload_bytes
+            }
+
+    def _commit(self, part_path: str, content_hash: str, suffix: str, size: int) -> Dict[str, Any]:
+        """
+        Move a fully written upload into place, unless the same bytes are already stored
+        """
+        existing = self.path(content_hash)
+        if existing is not None:
+            print(f"♻️ Upload already stored: {content_hash[:12]}")
+            return {"hash": content_hash, "path": existing, "size": size, "deduplicated": True}
+
+        blob_name = f"{content_hash}{suffix}"
+        blob_path = os.path.join(self.store_dir, blob_name)
+        os.replace(part_path, blob_path)
+        with self._lock:
+            self._index[content_hash] = (blob_name, size)
+            self._index.move_to_end(content_hash)
+            self._used_at[content_hash] = time.time()
+            self._evict(keep=content_hash)
+        print(f"📥 Stored upload {content_hash[:12]} ({size} bytes)")
+        return {"hash": content_hash, "path": blob_path, "size": size, "deduplicated": False}
+
+    def _suffix(self, filename: Optional[str]) -> str:
+        extension = os.path.splitext(filename or "")[1].lower()
+        return extension if re.match(r"^\.[a-z0-9]{1,8}$", extension) else ""
+
+    def _load_index(self):
+        """
+        Rebuild the LRU index from the store directory, oldest first
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.store_dir):
+            content_hash = os.path.splitext(name)[0]
+            if not SHA256_PATTERN.match(content_hash):
+                continue
+            stat = os.stat(os.path.join(self.store_dir, name))
+            entries.append((stat.st_mtime, content_hash, name, stat.st_size))
+
+        for mtime, content_hash, name, size in sorted(entries):
+            self._index[content_hash] = (name, size)
+            self._used_at[content_hash] = mtime
+
+    def _evict(self, keep: Optional[str] = None):
+        """
+        Drop least recently used blobs until the store fits its size budget. Blobs
+        used within the grace period may be in use by a request and are kept, even
+        if that leaves the store over budget until they age out.
+        """
+        total = sum(size for _, size in self._index.values())
+        cutoff = time.time() - self.eviction_grace_seconds
+        for content_hash in list(self._index):
+            if total <= self.max_bytes:
+                break
+            if content_hash == keep:
+                continue
+            if self._used_at.get(content_hash, 0) > cutoff:
+                # Least recently used first, so every blob after this one is newer still
+                break
+            self._used_at.pop(content_hash, None)
+            name, size = self._index.pop(content_hash)
+            total -= size
+            try:
+                os.unlink(os.path.join(self.store_dir, name))
+            except OSError:
+                pass
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react'
+import React, { useState, useEffect, useRef } from 'react'
 import axios from 'axios'
 import './AdvancedEditor.css'
 
@@ -6,6 +6,16 @@ const AdvancedEditor = ({ slideData, onSave, onClose }) => {
   const [editedData, setEditedData] = useState(slideData)
   const [selectedSlide, setSelectedSlide] = useState(0)
   const [isPreviewMode, setIsPreviewMode] = useState(false)
+  const receivedSlides = useRef(slideData.slides.length)
+
+  // Slides of a streamed extraction keep arriving after the editor opens;
+  // append them without discarding edits made to the slides already shown
+  useEffect(() => {
+    const newSlides = slideData.slides.slice(receivedSlides.current)
+    if (newSlides.length === 0) return
+    receivedSlides.current = slideData.slides.length
+    setEditedData(prev => ({ ...prev, meta: slideData.meta, slides: [...prev.slides, ...newSlides] }))
+  }, [slideData])
 
   const chartTypes = [
     { value: 'chart.column', label: 'Column Chart' },
@@ -35,6 +35,8 @@ const PromptForm = () => {
   const [isGeneratingPreview, setIsGeneratingPreview] = useState(false)
   const [isApplyingEdits, setIsApplyingEdits] = useState(false)
   const [currentEditInstructions, setCurrentEditInstructions] = useState(null)
+  // Server-side session for the uploaded edit file, so it is uploaded and parsed once
+  const [editDeckId, setEditDeckId] = useState(null)
 
   const examplePrompts = [
     "Create a Q2 business review presentation for a SaaS company with revenue charts and key metrics",
@@ -211,22 +213,60 @@ const PromptForm = () => {
     try {
       const formData = new FormData()
       formData.append('ppt_file', file)
+      formData.append('stream', 'true')
 
-      const response = await axios.post(`${API_BASE_URL}/extract-from-ppt`, formData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-        timeout: 60000
+      // Slides arrive as NDJSON lines, so the editor can open on the first ones
+      const response = await fetch(`${API_BASE_URL}/extract-from-ppt`, {
+        method: 'POST',
+        body: formData
       })
+      if (!response.ok || !response.body) {
+        throw new Error(`Extraction failed with status ${response.status}`)
+      }
 
-      if (response.data.success) {
-        setCurrentSlideData(response.data.slide_data)
-        setUploadedPPTFile(file)
-        setShowEditor(true)
-        setStatus(`✅ Successfully loaded ${response.data.slide_data.slides.length} slides for editing!`)
-      } else {
-        throw new Error(response.data.message || 'Failed to extract slide data')
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      let slideData = null
+      let done = false
+
+      while (!done) {
+        const chunk = await reader.read()
+        done = chunk.done
+        buffer += decoder.decode(chunk.value || new Uint8Array(), { stream: !done })
+
+        const lines = buffer.split('\n')
+        buffer = lines.pop()
+        let receivedSlides = false
+
+        for (const line of lines) {
+          if (!line.trim()) continue
+          const event = JSON.parse(line)
+          if (event.type === 'meta') {
+            slideData = { meta: event.meta, slides: [] }
+          } else if (event.type === 'slide') {
+            slideData.slides.push(event.slide)
+            receivedSlides = true
+          } else if (event.type === 'error') {
+            throw new Error(event.detail)
+          }
+        }
+
+        if (receivedSlides) {
+          setCurrentSlideData({ ...slideData, slides: [...slideData.slides] })
+          setUploadedPPTFile(file)
+          setShowEditor(true)
+          setStatus(`🔍 Loaded ${slideData.slides.length} of ${slideData.meta.total_slides} slides...`)
+        }
+      }
+
+      if (!slideData) {
+        throw new Error('Failed to extract slide data')
       }
+      setCurrentSlideData({ ...slideData, slides: [...slideData.slides] })
+      setUploadedPPTFile(file)
+      setShowEditor(true)
+      setStatus(`✅ Successfully loaded ${slideData.slides.length} slides for editing!`)
     } catch (error) {
       console.error('PPT upload error:', error)
       setStatus('❌ Failed to extract slide data from PowerPoint file. Please try again.')
@@ -258,7 +298,11 @@ const PromptForm = () => {
 
     try {
       const formData = new FormData()
-      formData.append('file', uploadedEditFile)
+      if (editDeckId) {
+        formData.append('deck_id', editDeckId)
+      } else {
+        formData.append('file', uploadedEditFile)
+      }
       formData.append('edit_prompt', editPrompt.trim())
       formData.append('output_format', outputFormat)
       
@@ -273,6 +317,7 @@ const PromptForm = () => {
         timeout: 120000 // 2 minute timeout
       })
 
+      setEditDeckId(response.data.deck_id)
       setPreviewData(response.data.preview_data)
       setCurrentEditInstructions(response.data.edit_instructions)
       setShowPreview(true)
@@ -281,7 +326,11 @@ const PromptForm = () => {
     } catch (error) {
       console.error('Preview error:', error)
       
-      if (error.response?.status === 500) {
+      if (error.response?.status === 404 && editDeckId) {
+        // Session expired on the server, the next attempt uploads the file again
+        setEditDeckId(null)
+        setStatus('❌ Your upload session expired. Please try again.')
+      } else if (error.response?.status === 500) {
         setStatus('❌ Server error during preview generation. Please check your prompt and try again.')
       } else if (error.code === 'ECONNABORTED') {
         setStatus('❌ Request timeout. The preview took too long. Please try a simpler edit.')
@@ -304,7 +353,11 @@ const PromptForm = () => {
 
     try {
       const formData = new FormData()
-      formData.append('file', uploadedEditFile)
+      if (editDeckId) {
+        formData.append('deck_id', editDeckId)
+      } else {
+        formData.append('file', uploadedEditFile)
+      }
       formData.append('edit_instructions', JSON.stringify(currentEditInstructions))
       formData.append('output_format', outputFormat)
       
@@ -345,6 +398,8 @@ const PromptForm = () => {
       setShowPreview(false)
       setPreviewData(null)
       setCurrentEditInstructions(null)
+      // The session now holds the edited deck; later edits start from the local file again
+      setEditDeckId(null)
       
     } catch (error) {
       console.error('Apply edits error:', error)
@@ -541,6 +596,7 @@ const PromptForm = () => {
                 const file = e.target.files[0]
                 if (file) {
                   setUploadedEditFile(file)
+                  setEditDeckId(null)
                   setStatus(`📁 Loaded: ${file.name}`)
                 }
               }}
@@ -552,7 +608,10 @@ const PromptForm = () => {
                 <span className="file-icon">📄</span>
                 <span className="file-name">{uploadedEditFile.name}</span>
                 <button 
-                  onClick={() => setUploadedEditFile(null)}
+                  onClick={() => {
+                    setUploadedEditFile(null)
+                    setEditDeckId(null)
+                  }}
                   className="remove-file"
                   disabled={isEditing}
                 >
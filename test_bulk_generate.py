@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test that /bulk keeps every row's deck when rows share a title
+"""
+
+import asyncio
+import io
+import os
+import sys
+import zipfile
+
+# Add backend to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+os.environ.setdefault("LITELLM_API_KEY", "test")
+os.environ.setdefault("LITELLM_BASE_URL", "http://localhost")
+
+SLIDE_DATA = {
+    "meta": {"deck_title": "Quarterly Review"},
+    "slides": [
+        {"title": "Quarterly Review", "subtitle": "Same title on every row", "layout": "title"},
+        {"title": "Highlights", "bullets": ["Revenue up", "Costs down"], "layout": "bullets"}
+    ]
+}
+
+
+def test_bulk_same_title_rows(tmp_path, monkeypatch):
+    """Two rows generating decks with the same title, in the same second, give two files"""
+    monkeypatch.chdir(tmp_path)  # the app writes uploads and artifacts under ./outputs
+
+    import httpx
+    import main
+
+    async def generate_slide_structure(prompt):
+        return SLIDE_DATA
+
+    monkeypatch.setattr(main.ai_service, "generate_slide_structure", generate_slide_structure)
+
+    async def post_bulk():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            csv_file = io.BytesIO(b"prompt\nQuarterly review for team A\nQuarterly review for team B\n")
+            return await client.post("/bulk", files={"file": ("rows.csv", csv_file, "text/csv")})
+
+    stored_before = main.upload_store.stats()["entries"]
+    response = asyncio.run(post_bulk())
+    assert response.status_code == 200, response.text
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        names = archive.namelist()
+    print(f"📦 Bulk ZIP entries: {names}")
+    assert len(names) == 2
+    assert len(set(names)) == 2
+    assert all(name.startswith("Quarterly_Review_") for name in names)
+    # The one-off CSV is read from the request, not kept in the upload store
+    assert main.upload_store.stats()["entries"] == stored_before
+
+
+if __name__ == "__main__":
+    import pytest
+
+    print("🚀 Testing bulk generation with duplicate titles")
+    sys.exit(pytest.main(["-q", __file__]))
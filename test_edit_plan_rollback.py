@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test that structural edits report failure honestly and that an all-or-nothing
+plan rolls back every edit when one of them fails
+"""
+
+import os
+import sys
+
+# Add backend to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from pptx import Presentation
+
+from services.ppt_service import PPTService
+
+
+def build_deck():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Quarterly Review"
+    slide.placeholders[1].text_frame.text = "Revenue grew"
+    return prs
+
+
+def slide_state(prs):
+    slide = prs.slides[0]
+    return [(shape.shape_type, shape.text_frame.text if shape.has_text_frame else None) for shape in slide.shapes]
+
+
+def test_failed_structural_edit_rolls_back_plan():
+    """A table that cannot be built fails the plan, and the title change before it is undone"""
+    service = PPTService()
+    prs = build_deck()
+    before = slide_state(prs)
+
+    plan = service.apply_edit_plan(prs, [
+        {"slide_index": 1, "action": "modify_content", "target_element": "title",
+         "changes": {"new_content": "Annual Review"}},
+        {"slide_index": 1, "action": "add_content", "target_element": "table",
+         "changes": {"table_data": {"headers": ["Region"], "rows": 5}}},
+    ], atomic=True)
+
+    assert [edit["status"] for edit in plan.outcomes()] == ["rolled_back", "failed"]
+    assert not plan.succeeded
+    assert slide_state(prs) == before
+
+
+def test_structural_edit_with_nothing_to_change_is_not_applied():
+    """Deleting a chart from a slide without one is not_found, and rolls the plan back"""
+    service = PPTService()
+    prs = build_deck()
+    before = slide_state(prs)
+
+    plan = service.apply_edit_plan(prs, [
+        {"slide_index": 1, "action": "add_content", "target_element": "text",
+         "changes": {"new_content": "Footnote"}},
+        {"slide_index": 1, "action": "delete_content", "target_element": "chart", "changes": {}},
+    ], atomic=True)
+
+    assert [edit["status"] for edit in plan.outcomes()] == ["rolled_back", "not_found"]
+    assert slide_state(prs) == before
+
+
+def test_change_layout_is_rejected():
+    """Layout changes are not implemented, so they are invalid instead of reported as applied"""
+    service = PPTService()
+    prs = build_deck()
+
+    plan = service.apply_edit_plan(prs, [
+        {"slide_index": 1, "action": "change_layout", "target_element": "",
+         "changes": {"new_layout": "Two Content"}},
+    ], atomic=False)
+
+    assert plan.outcomes()[0]["status"] == "invalid"
+    assert "not supported" in plan.outcomes()[0]["detail"]
+
+
+if __name__ == "__main__":
+    import pytest
+
+    print("🚀 Testing edit plan outcomes for structural edits")
+    sys.exit(pytest.main(["-q", __file__]))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test that find strings from AI edit instructions are located in the deck even when
+the model returns a malformed slide_index or find value
+"""
+
+import os
+import sys
+
+# Add backend to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from pptx import Presentation
+
+from services.ppt_service import PPTService
+
+
+def build_deck():
+    prs = Presentation()
+    for title, body in [("Overview", "Policy Term and coverage"), ("Pricing", "Premiums start at $20")]:
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = title
+        slide.placeholders[1].text_frame.text = body
+    return prs
+
+
+def find_edit(slide_index, find):
+    return {
+        "slide_index": slide_index,
+        "action": "modify_content",
+        "target_element": "text",
+        "changes": {"find": find, "replace": "replacement"}
+    }
+
+
+def test_string_and_null_slide_index():
+    """A numeric string is coerced like EditPlan does; null is reported, not raised"""
+    service = PPTService()
+    text_index = service.build_text_index(build_deck())
+    instructions = {"edits": [find_edit("2", "Premiums start"), find_edit(None, "Policy Term")]}
+
+    unresolved = service.resolve_edit_targets(text_index, instructions)
+
+    assert instructions["edits"][0]["slide_index"] == 2
+    assert instructions["edits"][0]["changes"]["find"] == "Premiums start"
+    assert unresolved == [{
+        "slide_index": None,
+        "find": "Policy Term",
+        "closest_text": "Policy Term",
+        "confidence": 1.0
+    }]
+
+
+def test_non_string_find_is_skipped():
+    """find values that are not text are left for the edit plan to reject"""
+    service = PPTService()
+    text_index = service.build_text_index(build_deck())
+    instructions = {"edits": [find_edit(1, 20), find_edit(1, ["Policy"]), find_edit("x", "   ")]}
+
+    assert service.resolve_edit_targets(text_index, instructions) == []
+    assert [edit["changes"]["find"] for edit in instructions["edits"]] == [20, ["Policy"], "   "]
+
+
+if __name__ == "__main__":
+    print("🚀 Testing edit target resolution")
+    test_string_and_null_slide_index()
+    test_non_string_find_is_skipped()
+    print("✅ Malformed slide indexes and find values are handled")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test that deck sessions in use by a request are not evicted or expired under it
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from pptx import Presentation
+
+from services.session_service import SessionService
+
+
+def build_deck(path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Session deck"
+    prs.save(path)
+    return path
+
+
+def test_locked_session_survives_eviction(tmp_path, monkeypatch):
+    """A session whose lock is held stays intact while the caps evict around it"""
+    monkeypatch.chdir(tmp_path)
+    deck = build_deck(str(tmp_path / "deck.pptx"))
+    service = SessionService(max_sessions=1)
+    held = service.create_session(deck, "held.pptx")
+
+    async def evict_while_locked():
+        async with held.lock:
+            other = service.create_session(deck, "other.pptx")
+            # Over the cap, but the held session is in use: it must stay whole
+            assert service.get_session(held.deck_id) is held
+            assert held.presentation is not None
+            assert os.path.exists(held.path)
+            return other
+
+    other = asyncio.run(evict_while_locked())
+
+    # Released, the held session is evicted by the next session over the cap
+    service.create_session(deck, "third.pptx")
+    assert service.get_session(held.deck_id) is None
+    assert held.presentation is None
+    assert not os.path.exists(held.path)
+    assert service.get_session(other.deck_id) is None
+
+
+def test_locked_session_does_not_expire(tmp_path, monkeypatch):
+    """An idle-looking session whose lock is held (e.g. waiting on the model) does not expire"""
+    monkeypatch.chdir(tmp_path)
+    deck = build_deck(str(tmp_path / "deck.pptx"))
+    service = SessionService(ttl_seconds=60)
+    held = service.create_session(deck, "held.pptx")
+
+    async def expire_while_locked():
+        async with held.lock:
+            held.last_access = time.time() - 120
+            service.stats()
+            service.create_session(deck, "other.pptx")
+            assert held.presentation is not None
+            assert os.path.exists(held.path)
+
+    asyncio.run(expire_while_locked())
+
+    held.last_access = time.time() - 120
+    assert service.get_session(held.deck_id) is None
+    assert held.presentation is None
+
+
+if __name__ == "__main__":
+    import pytest
+
+    print("🚀 Testing deck session eviction")
+    sys.exit(pytest.main(["-q", __file__]))
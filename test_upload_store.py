@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test that the upload store never evicts a blob a request may still be using
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+# Add backend to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from fastapi import UploadFile
+
+from services.upload_store import UploadStore
+
+
+def store_bytes(store, data, filename):
+    return asyncio.run(store.save(UploadFile(io.BytesIO(data), filename=filename)))
+
+
+def test_recently_used_blob_is_not_evicted(tmp_path):
+    """Over budget, a blob handed out within the grace period keeps its file"""
+    store = UploadStore(store_dir=str(tmp_path), max_bytes=150)
+    template = store_bytes(store, b"t" * 100, "template.pptx")
+    assert store.path(template["hash"]) == template["path"]
+
+    deck = store_bytes(store, b"d" * 100, "deck.pptx")
+    assert os.path.exists(template["path"])
+    assert os.path.exists(deck["path"])
+    assert store.stats()["bytes"] == 200
+
+
+def test_blob_past_grace_period_is_evicted(tmp_path):
+    """Once a blob ages out of the grace period, the budget applies to it again"""
+    store = UploadStore(store_dir=str(tmp_path), max_bytes=150)
+    store.eviction_grace_seconds = 0
+    template = store_bytes(store, b"t" * 100, "template.pptx")
+    deck = store_bytes(store, b"d" * 100, "deck.pptx")
+
+    assert not os.path.exists(template["path"])
+    assert store.path(template["hash"]) is None
+    assert os.path.exists(deck["path"])
+
+
+if __name__ == "__main__":
+    import pytest
+
+    print("🚀 Testing upload store eviction")
+    sys.exit(pytest.main(["-q", __file__]))